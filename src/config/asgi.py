@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+# compile templates, fill URL/validator caches etc. before the first request
+from core.warmup import warmup_on_boot  # noqa: E402 (needs the app registry)
+
+warmup_on_boot()
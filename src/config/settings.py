@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from datetime import timedelta
+from importlib.util import find_spec
 import os
 from pathlib import Path
 from urllib.parse import urlparse
@@ -88,28 +89,68 @@ if DEBUG:
 
 # ----------------------------------------------------------------------
 # Make Unfold/import-export optional in quirky environments
+# (find_spec only locates the package; importing it here would cost every process)
 # ----------------------------------------------------------------------
-try:
-    import unfold  # noqa
-except Exception:
+if find_spec("unfold") is None:
     INSTALLED_APPS = [app for app in INSTALLED_APPS if not app.startswith("unfold")]
 
-try:
-    import import_export  # noqa
-except Exception:
+if find_spec("import_export") is None:
     INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "import_export"]
 
+# ----------------------------------------------------------------------
+# Worker profile
+# - "full" (default): everything above.
+# - "public": site-only workers and cron commands. No admin, Unfold, import-export
+#   or django_extensions, so they're never imported. /admin/ is not routed; send it
+#   to full workers at the proxy. Run migrate/collectstatic with the full profile.
+# Compare the two with: python src/manage.py startup_report --compare
+# ----------------------------------------------------------------------
+WORKER_PROFILE = os.getenv("WORKER_PROFILE", "full")
+ADMIN_ONLY_APPS = ("unfold", "django.contrib.admin", "import_export", "django_extensions")
+
+if WORKER_PROFILE == "public":
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if not app.startswith(ADMIN_ONLY_APPS)]
+
 
 # Use our custom user model (added below)
 AUTH_USER_MODEL = "users.User"
 
+# ModelBackend + cross-request permission cache (users/permissions.py). Group and
+# per-user permission sets live in this cache alias. It needs a shared backend
+# (Redis/Memcached) so every worker sees the invalidations; on the default LocMem
+# cache the backend does plain ModelBackend queries.
+AUTHENTICATION_BACKENDS = ["users.backends.CachedPermissionBackend"]
+AUTH_PERMISSION_CACHE_ALIAS = os.getenv("AUTH_PERMISSION_CACHE_ALIAS", "default")
+AUTH_PERMISSION_CACHE_TIMEOUT = int(os.getenv("AUTH_PERMISSION_CACHE_TIMEOUT", "3600"))
+# request.user from a cached snapshot (users/user_cache.py) instead of a users_user
+# SELECT per request; dropped on user save/delete and group changes. Only takes
+# effect when AUTH_PERMISSION_CACHE_ALIAS is a shared cache (not LocMem).
+AUTH_USER_CACHE = os.getenv("AUTH_USER_CACHE", "1").lower() in {"1", "true", "yes", "on"}
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv("AUTH_USER_CACHE_TIMEOUT", "300"))
+
+# Write-behind last_login (users/last_login.py): logins are buffered and written with
+# one bulk UPDATE every LAST_LOGIN_FLUSH_INTERVAL seconds instead of one UPDATE each.
+# Needs a shared CACHES["default"]; on LocMem logins are written immediately.
+LAST_LOGIN_WRITE_BEHIND = os.getenv("LAST_LOGIN_WRITE_BEHIND", "0").lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+LAST_LOGIN_FLUSH_INTERVAL = float(os.getenv("LAST_LOGIN_FLUSH_INTERVAL", "5"))
+
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.compression.CompressionMiddleware",  # brotli/gzip; before anything touching the body
+    "core.assets.PreloadLinkMiddleware",  # Link: rel=preload (103 Early Hints-ready)
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "users.middleware.RoleCapabilitiesMiddleware",  # lazy request.roles
+    "core.profiling.ProfilerMiddleware",  # staff-only, signed ?_profile= trigger
+    "core.component_timing.ComponentTimingMiddleware",  # off unless COMPONENT_TIMING
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -128,35 +169,39 @@ TEMPLATES = [
         ],
         "APP_DIRS": False,  # <- use loaders explicitly
         "OPTIONS": {
+            # Cached in every environment (runserver's autoreloader clears it on
+            # template edits). core's loader is cotton's plus compile-time inlining
+            # of static components (core/template_loaders.py); cotton's own entry
+            # stays listed so its auto-setup keeps this configuration.
             "loaders": [
-                "django_cotton.cotton_loader.Loader",  # <- must be first
-                "django.template.loaders.filesystem.Loader",
-                "django.template.loaders.app_directories.Loader",
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "core.template_loaders.Loader",  # <- must be first
+                        "django_cotton.cotton_loader.Loader",
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                )
             ],
             "context_processors": [
-                # Django defaults
-                "django.template.context_processors.request",
-                "django.contrib.auth.context_processors.auth",
-                "django.contrib.messages.context_processors.messages",
-                # Project custom
-                "core.context_processors.site_meta",
-                "core.context.core_settings",
+                # One merged processor: request, user/perms, messages, site meta and
+                # core settings (the settings part is built once, not per render).
+                "core.context_processors.site",
             ],
         },
     },
 ]
 
+# The admin checks look for Django's own request/auth/messages processors by path;
+# core.context_processors.site provides the same variables.
+SILENCED_SYSTEM_CHECKS = ["admin.E402", "admin.E404", "admin.W411"]
 
-# Only in production
-# Wrap loaders with Django’s cached loader in prod to speed up template lookups:
-# "loaders": [(
-#     "django.template.loaders.cached.Loader",
-#     [
-#         "django_cotton.cotton_loader.Loader",
-#         "django.template.loaders.filesystem.Loader",
-#         "django.template.loaders.app_directories.Loader",
-#     ],
-# )],
+
+# Compile-time inlining of cotton components used with literal attributes only.
+# The allowlist is core.template_loaders.DEFAULT_STATIC_COMPONENTS; set
+# COTTON_STATIC_COMPONENTS here only to replace it.
+COTTON_INLINE_STATIC = os.getenv("COTTON_INLINE_STATIC", "1").lower() in {"1", "true", "yes", "on"}
 
 WSGI_APPLICATION = "config.wsgi.application"
 
@@ -212,6 +257,17 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / "staticfiles"  # for collectstatic in prod
 
+# Inline core/css/critical.css (`manage.py build_critical_css`, run after `npm run
+# tw:build`) and load output.css without blocking render. Off under DEBUG, where
+# tw:watch keeps changing output.css.
+CRITICAL_CSS = os.getenv("CRITICAL_CSS", str(not DEBUG)).lower() in {"1", "true", "yes", "on"}
+# Sent as `Link: rel=preload` headers on site pages (core.assets.PreloadLinkMiddleware)
+ASSET_PRELOADS = [
+    ("core/css/output.css", "style"),
+    ("core/js/lib/alpine-3.14.1.min.js", "script"),
+    ("core/js/main.js", "script"),
+]
+
 try:
     if SITE_ORIGIN:
         _host = urlparse(SITE_ORIGIN).netloc.split(":")[0]
@@ -237,6 +293,17 @@ SITE_DOMAIN = os.getenv("SITE_DOMAIN", "")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "no-reply@example.com")
 SERVER_EMAIL = os.getenv("SERVER_EMAIL", DEFAULT_FROM_EMAIL)  # for error emails, optional
 PASSWORD_RESET_TIMEOUT = int(timedelta(hours=24).total_seconds())
+# Queue "forgot password" emails instead of sending them in the request
+# (users/reset_queue.py); `manage.py send_queued_emails --loop` delivers them.
+# Off by default: turn it on only where that dispatcher is deployed, otherwise
+# queued reset emails are never sent.
+PASSWORD_RESET_QUEUE = os.getenv("PASSWORD_RESET_QUEUE", "0").lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+PASSWORD_RESET_QUEUE_INTERVAL = float(os.getenv("PASSWORD_RESET_QUEUE_INTERVAL", "5"))
 
 TEACHER_ADMIN_FULL_PERMS = True
 
@@ -270,6 +337,97 @@ USERS_ROLE_REDIRECTS = {
 
 LOGOUT_REDIRECT_URL = None
 
+# --- Health probes (/healthz, /readyz) ----------------------------------------
+# How long each /readyz dependency check result is reused per process.
+HEALTH_CHECK_CACHE_SECONDS = int(os.getenv("HEALTH_CHECK_CACHE_SECONDS", "5"))
+
+# --- Admin changelist counts ---------------------------------------------------
+# Above this many rows (planner estimate, PostgreSQL only) the User changelist shows
+# an estimated total instead of running COUNT(*) for searches / non-bucket filters.
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv("ADMIN_ESTIMATED_COUNT_THRESHOLD", "10000"))
+
+# --- Logging (core/logs.py) ---------------------------------------------------
+# Loggers enqueue records (StructuredQueueHandler); a QueueListener thread started in
+# CoreConfig.ready writes JSON lines to rotating files, so request threads never block
+# on log I/O. Levels per module via env; chatty loggers are sampled (keep 1 in N
+# below WARNING).
+LOG_DIR = Path(os.getenv("LOG_DIR", BASE_DIR.parent / "logs"))  # created by the listener
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_SAMPLE_RATES = {
+    "users.seed.rows": int(os.getenv("LOG_SAMPLE_SEED_ROWS", "100")),  # per-row imports
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "core.logs.JsonFormatter"},
+    },
+    "filters": {
+        "sample": {"()": "core.logs.SampleFilter", "rates": LOG_SAMPLE_RATES},
+    },
+    "handlers": {
+        "file": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": LOG_DIR / "app.jsonl",
+            "delay": True,
+            "maxBytes": int(os.getenv("LOG_FILE_MAX_BYTES", str(20 * 1024 * 1024))),
+            "backupCount": int(os.getenv("LOG_FILE_BACKUPS", "5")),
+            "encoding": "utf-8",
+            "formatter": "json",
+        },
+        "errors": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": LOG_DIR / "errors.jsonl",
+            "delay": True,
+            "maxBytes": 5 * 1024 * 1024,
+            "backupCount": 5,
+            "encoding": "utf-8",
+            "formatter": "json",
+            "level": "ERROR",
+        },
+        "queue": {
+            "class": "core.logs.StructuredQueueHandler",
+            "handlers": ["file", "errors"],
+            "respect_handler_level": True,
+            "filters": ["sample"],
+        },
+    },
+    "root": {"handlers": ["queue"], "level": LOG_LEVEL},
+    "loggers": {
+        "django": {"level": os.getenv("LOG_LEVEL_DJANGO", LOG_LEVEL)},
+        "django.db.backends": {"level": os.getenv("LOG_LEVEL_DB", "WARNING")},
+        "core": {"level": os.getenv("LOG_LEVEL_CORE", LOG_LEVEL)},
+        "users": {"level": os.getenv("LOG_LEVEL_USERS", LOG_LEVEL)},
+    },
+}
+
+# --- Response compression (core/compression.py) -------------------------------
+# Brotli needs `brotli` or `brotlicffi` installed; gzip is always available.
+COMPRESS_MIN_LENGTH = int(os.getenv("COMPRESS_MIN_LENGTH", "200"))
+COMPRESS_BROTLI_QUALITY = int(
+    os.getenv("COMPRESS_BROTLI_QUALITY", "5")
+)  # 0-11; 5 suits dynamic HTML
+
+# --- Worker warmup (core/warmup.py) -------------------------------------------
+# config/wsgi.py / asgi.py compile templates, reverse URLs, load password validators,
+# touch the DB and prime caches before serving. Off by default under DEBUG.
+WARMUP_ON_BOOT = os.getenv("WARMUP_ON_BOOT", str(not DEBUG)).lower() in {"1", "true", "yes", "on"}
+
+# --- Cotton component timing (core/component_timing.py) -----------------------
+# Per-request render time per <c-...> component: Server-Timing header, `core.metrics`
+# DEBUG log records and an on-page panel (COMPONENT_TIMING_PANEL).
+COMPONENT_TIMING = os.getenv("COMPONENT_TIMING", str(DEBUG)).lower() in {"1", "true", "yes", "on"}
+COMPONENT_TIMING_PANEL = DEBUG
+
+# --- Request profiler (core/profiling.py) --------------------------------------
+# Staff get signed links from /admin/profiles/; results are saved under PROFILER_DIR.
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "True").lower() in {"1", "true", "yes", "on"}
+PROFILER_DIR = Path(os.getenv("PROFILER_DIR", BASE_DIR.parent / "profiles"))
+PROFILER_TOKEN_MAX_AGE = int(os.getenv("PROFILER_TOKEN_MAX_AGE", "3600"))
+PROFILER_SAMPLE_INTERVAL = float(os.getenv("PROFILER_SAMPLE_INTERVAL", "0.001"))
+PROFILER_KEEP = int(os.getenv("PROFILER_KEEP", "200"))
+
 # --- django-import-export ----------------------------------------------------
 IMPORT_EXPORT_USE_TRANSACTIONS = True
 IMPORT_EXPORT_SKIP_ADMIN_LOG = False
@@ -289,6 +447,7 @@ UNFOLD = {
     # (optional) a dropdown under the site title (top-left) with a link home:
     "SITE_DROPDOWN": [
         {"icon": "home", "title": "Back to site", "link": "/"},
+        {"icon": "speed", "title": "Request profiles", "link": "/admin/profiles/"},
         # Example to open in a new tab:
         # {
         #     "icon": "home",
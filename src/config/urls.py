@@ -1,13 +1,23 @@
 # src/config/urls.py
+from django.apps import apps
 from django.conf import settings
-from django.contrib import admin
 from django.urls import include, path
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("", include("core.urls", namespace="core")),
     path("users/", include("users.urls", namespace="users")),
 ]
 
+# absent on WORKER_PROFILE=public workers
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns = [
+        # before admin/: staff-only request profiles page (core/profiling.py)
+        path("admin/profiles/", include("core.admin_views", namespace="profiles")),
+        path("admin/", admin.site.urls),
+        *urlpatterns,
+    ]
+
 if settings.DEBUG:
     urlpatterns += [path("__reload__/", include("django_browser_reload.urls"))]
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# compile templates, fill URL/validator caches etc. before the first request
+from core.warmup import warmup_on_boot  # noqa: E402 (needs the app registry)
+
+warmup_on_boot()
@@ -0,0 +1,83 @@
+# src/core/admin_views.py
+#
+# Admin pages for saved request profiles (core/profiling.py), rendered in the
+# Unfold admin layout. Mounted at /admin/profiles/ by config/urls.py.
+
+from datetime import timedelta
+import json
+
+from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from django.urls import path
+from django.utils import timezone
+from django.utils.timesince import timeuntil
+
+from . import profiling
+
+app_name = "profiles"
+
+
+def _context(request, **extra):
+    return {**admin.site.each_context(request), **extra}
+
+
+def profiles_index(request):
+    """List saved profiles; POST a path to get a signed profiling link for it."""
+    link = None
+    if request.method == "POST":
+        target = request.POST.get("path", "").strip() or "/"
+        if not target.startswith("/"):
+            target = f"/{target}"
+        sep = "&" if "?" in target else "?"
+        token = profiling.make_token(request.user)
+        link = f"{target}{sep}{profiling.QUERY_PARAM}={token}"
+    now = timezone.now()
+    return render(
+        request,
+        "core/admin/profiles.html",
+        _context(
+            request,
+            title="Request profiles",
+            profiles=profiling.list_profiles(),
+            link=link,
+            header_name=profiling.HEADER.removeprefix("HTTP_").replace("_", "-").title(),
+            valid_for=timeuntil(now + timedelta(seconds=profiling.token_max_age()), now),
+        ),
+    )
+
+
+def profile_detail(request, profile_id):
+    meta_file = profiling.profile_file(profile_id, "json")
+    stats_file = profiling.profile_file(profile_id, "txt")
+    if meta_file is None or stats_file is None:
+        raise Http404("No such profile")
+    return render(
+        request,
+        "core/admin/profile_detail.html",
+        _context(
+            request,
+            title=f"Profile {profile_id}",
+            meta=json.loads(meta_file.read_text()),
+            stats=stats_file.read_text(),
+            profile_id=profile_id,
+        ),
+    )
+
+
+def profile_download(request, profile_id, kind):
+    file = profiling.profile_file(profile_id, kind)
+    if file is None:
+        raise Http404("No such profile file")
+    return FileResponse(file.open("rb"), as_attachment=True, filename=file.name)
+
+
+urlpatterns = [
+    path("", admin.site.admin_view(profiles_index), name="index"),
+    path("<str:profile_id>/", admin.site.admin_view(profile_detail), name="detail"),
+    path(
+        "<str:profile_id>/<str:kind>/",
+        admin.site.admin_view(profile_download),
+        name="download",
+    ),
+]
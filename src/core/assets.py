@@ -0,0 +1,102 @@
+# src/core/assets.py
+#
+# Asset URLs, the inlined critical CSS and preload hints.
+# - asset_url(): static URL + ?v=STATIC_VERSION. Pages and Link headers share it, so
+#   a preloaded URL is exactly the one the page asks for.
+# - critical_css(): contents of CRITICAL_CSS_PATH (built by `manage.py
+#   build_critical_css`), read once per process; "" when disabled or not built.
+# - PreloadLinkMiddleware: `Link: <...>; rel=preload; as=...` for ASSET_PRELOADS on
+#   pages that load the site stylesheet ({% stylesheet %} in core/partials/head.html
+#   marks the request), so admin and other non-site HTML is left alone.
+#   Proxies/CDNs that support 103 Early Hints can send these before the page is rendered.
+
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.templatetags.static import static
+
+STYLESHEET_PATH = "core/css/output.css"
+CRITICAL_CSS_PATH = "core/css/critical.css"
+
+PRELOAD_MARK = "_asset_preloads"  # request attribute set by {% stylesheet %}
+
+_critical_css: str | None = None
+_preload_header: str | None = None
+
+
+def asset_url(path: str) -> str:
+    return f"{static(path)}?v={getattr(settings, 'STATIC_VERSION', 'dev-0')}"
+
+
+def find_static(path: str) -> Path | None:
+    """Filesystem path of a static file: source dirs first, then STATIC_ROOT."""
+    found = finders.find(path)
+    if found:
+        return Path(found)
+    root = getattr(settings, "STATIC_ROOT", None)
+    if root and (Path(root) / path).is_file():
+        return Path(root) / path
+    return None
+
+
+def critical_css() -> str:
+    global _critical_css
+    if _critical_css is None:
+        _critical_css = ""
+        if getattr(settings, "CRITICAL_CSS", False):
+            path = find_static(CRITICAL_CSS_PATH)
+            if path:
+                _critical_css = path.read_text(encoding="utf-8")
+    return _critical_css
+
+
+def preload_header() -> str:
+    global _preload_header
+    if _preload_header is None:
+        _preload_header = ", ".join(
+            f"<{asset_url(path)}>; rel=preload; as={kind}"
+            for path, kind in getattr(settings, "ASSET_PRELOADS", ())
+        )
+    return _preload_header
+
+
+@receiver(setting_changed)
+def _reset_assets(setting, **kwargs):
+    global _critical_css, _preload_header
+    _critical_css = _preload_header = None
+
+
+class PreloadLinkMiddleware:
+    """Adds the ASSET_PRELOADS Link header to successful site pages. Sync and async."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._add_header(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._add_header(request, await self.get_response(request))
+
+    def _add_header(self, request, response):
+        header = preload_header()
+        if (
+            header
+            and getattr(request, PRELOAD_MARK, False)
+            and response.status_code == 200
+            and response.get("Content-Type", "").startswith("text/html")
+        ):
+            existing = response.get("Link")
+            response["Link"] = f"{existing}, {header}" if existing else header
+        return response
@@ -0,0 +1,184 @@
+# src/core/component_timing.py
+#
+# Per-request render timing for django-cotton components.
+# - install() wraps CottonComponentNode.render; the middleware calls it when
+#   COMPONENT_TIMING is on. Outside a recorded request the wrapper costs one
+#   ContextVar lookup.
+# - ComponentTimingMiddleware records each request's components: calls, total
+#   (inclusive) and self time (minus nested components) per component name. It
+#   reports them:
+#     * as a `Server-Timing` header (browser DevTools → Network → Timing),
+#     * on `request.component_timings` for other code,
+#     * as a DEBUG record on the `core.metrics` logger,
+#     * with COMPONENT_TIMING_PANEL (default: DEBUG), as a panel injected before </body>.
+# With COMPONENT_TIMING off the middleware removes itself (MiddlewareNotUsed).
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.loader import render_to_string
+
+log = logging.getLogger("core.metrics")
+
+SERVER_TIMING_LIMIT = 10  # components listed in the header (slowest by self time)
+
+_recorder: ContextVar["ComponentTimings | None"] = ContextVar("component_timings", default=None)
+
+
+@dataclass
+class ComponentStat:
+    name: str
+    calls: int = 0
+    total: float = 0.0  # seconds, including nested components
+    self_time: float = 0.0  # seconds, excluding nested components
+
+    @property
+    def total_ms(self) -> float:
+        return round(self.total * 1000, 3)
+
+    @property
+    def self_ms(self) -> float:
+        return round(self.self_time * 1000, 3)
+
+
+@dataclass
+class ComponentTimings:
+    stats: dict[str, ComponentStat] = field(default_factory=dict)
+    _children: list[float] = field(default_factory=list)  # nested time per open component
+
+    def by_self_time(self) -> list[ComponentStat]:
+        return sorted(self.stats.values(), key=lambda s: s.self_time, reverse=True)
+
+    @property
+    def self_total_ms(self) -> float:
+        """Time spent in component templates overall (sum of self times)."""
+        return round(sum(s.self_time for s in self.stats.values()) * 1000, 3)
+
+    def as_dict(self) -> dict[str, dict]:
+        return {
+            s.name: {"calls": s.calls, "total_ms": s.total_ms, "self_ms": s.self_ms}
+            for s in self.by_self_time()
+        }
+
+
+# --- Render hook --------------------------------------------------------------
+def _timed(render):
+    def timed_render(node, context):
+        timings = _recorder.get()
+        if timings is None:
+            return render(node, context)
+        timings._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            return render(node, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = timings._children.pop()
+            if timings._children:
+                timings._children[-1] += elapsed
+            stat = timings.stats.get(node.component_name)
+            if stat is None:
+                stat = timings.stats[node.component_name] = ComponentStat(node.component_name)
+            stat.calls += 1
+            stat.total += elapsed
+            stat.self_time += elapsed - nested
+
+    timed_render.__wrapped__ = render
+    return timed_render
+
+
+def install() -> None:
+    """Wrap cotton's component node (idempotent)."""
+    from django_cotton.templatetags._component import CottonComponentNode
+
+    if not hasattr(CottonComponentNode.render, "__wrapped__"):
+        CottonComponentNode.render = _timed(CottonComponentNode.render)
+
+
+def record() -> tuple[ComponentTimings, object]:
+    """Start recording in the current context; returns (timings, token for stop())."""
+    timings = ComponentTimings()
+    return timings, _recorder.set(timings)
+
+
+def stop(token) -> None:
+    _recorder.reset(token)
+
+
+# --- Reporting ----------------------------------------------------------------
+def server_timing(timings: ComponentTimings) -> str:
+    entries = [f'cotton;dur={timings.self_total_ms};desc="cotton components"']
+    for stat in timings.by_self_time()[:SERVER_TIMING_LIMIT]:
+        metric = "c-" + "".join(ch if ch.isalnum() or ch in "-_" else "-" for ch in stat.name)
+        entries.append(f'{metric};dur={stat.self_ms};desc="{stat.name} x{stat.calls}"')
+    return ", ".join(entries)
+
+
+def _inject_panel(response, timings: ComponentTimings) -> None:
+    content = response.content.decode(response.charset)
+    end = content.rfind("</body>")
+    if end == -1:
+        return
+    panel = render_to_string("core/partials/component_timing_panel.html", {"timings": timings})
+    response.content = (content[:end] + panel + content[end:]).encode(response.charset)
+    if response.has_header("Content-Length"):
+        response["Content-Length"] = str(len(response.content))
+
+
+class ComponentTimingMiddleware:
+    """Records cotton component render times per request. Sync and async capable."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "COMPONENT_TIMING", False):
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+        self.panel = getattr(settings, "COMPONENT_TIMING_PANEL", settings.DEBUG)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings, token = record()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop(token)
+        return self._report(request, response, timings)
+
+    async def __acall__(self, request):
+        timings, token = record()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop(token)
+        return self._report(request, response, timings)
+
+    def _report(self, request, response, timings):
+        request.component_timings = timings
+        if not timings.stats:
+            return response
+        response["Server-Timing"] = ", ".join(
+            filter(None, [response.get("Server-Timing"), server_timing(timings)])
+        )
+        log.debug(
+            "component timings",
+            extra={"path": request.path, "components": timings.as_dict()},
+        )
+        if (
+            self.panel
+            and not response.streaming
+            and not response.has_header("Content-Encoding")
+            and response.get("Content-Type", "").startswith("text/html")
+        ):
+            _inject_panel(response, timings)
+        return response
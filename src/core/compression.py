@@ -0,0 +1,103 @@
+# src/core/compression.py
+#
+# Response compression: brotli when the client accepts it and `brotli` (or
+# `brotlicffi`) is installed, gzip otherwise.
+# Skipped for: streaming responses (file downloads, static files under runserver),
+# responses that already have a Content-Encoding, bodies shorter than
+# COMPRESS_MIN_LENGTH, and types that don't compress (images, archives, fonts...).
+# Like Django's GZipMiddleware it adds `Vary: Accept-Encoding`, weakens strong ETags
+# (so If-None-Match still matches), and gzip adds random header bytes against BREACH.
+# Brotli has no such padding, so responses that may carry secrets (they set cookies
+# or used a CSRF token) are only ever gzipped.
+
+import re
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+_CODING = re.compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*")
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    """{coding: q} from an Accept-Encoding header; q defaults to 1."""
+    accepted = {}
+    for part in header.lower().split(","):
+        match = _CODING.fullmatch(part)
+        if match:
+            try:
+                accepted[match[1]] = float(match[2]) if match[2] else 1.0
+            except ValueError:
+                continue
+    return accepted
+
+
+def choose_encoding(header: str, *, allow_brotli: bool = True) -> str | None:
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get("*", 0)
+    if allow_brotli and brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith(("+json", "+xml"))
+
+
+def may_carry_secrets(request, response) -> bool:
+    """Sets cookies, or rendered a CSRF token (get_token() flags the request)."""
+    return bool(response.cookies) or bool(request.META.get("CSRF_COOKIE_NEEDS_UPDATE"))
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Brotli/gzip for buffered text responses. Place right after SecurityMiddleware."""
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if len(response.content) < getattr(settings, "COMPRESS_MIN_LENGTH", 200):
+            return response
+        if not is_compressible(response.get("Content-Type", "")):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        coding = choose_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            allow_brotli=not may_carry_secrets(request, response),
+        )
+        if coding == "br":
+            quality = getattr(settings, "COMPRESS_BROTLI_QUALITY", 5)
+            compressed = brotli.compress(response.content, quality=quality)
+        elif coding == "gzip":
+            compressed = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = coding
+        return response
@@ -0,0 +1,120 @@
+# src/core/conditional.py
+#
+# Conditional GET for the public pages, without rendering or hashing the body.
+# - For anonymous visitors (no session or messages cookie) the HTML depends only
+#   on the project templates and settings. So the validators come from those:
+#     ETag          = digest of STATIC_VERSION, the template-visible settings, the
+#                     inlined critical CSS and the templates' sources (same on every host)
+#     Last-Modified = newest template mtime
+#   A matching If-None-Match / If-Modified-Since gets a 304 before the view runs.
+# - Requests carrying a session or messages cookie get no validators and are always
+#   rendered: their page shows the user, flash messages and a CSRF token.
+# - The fingerprint is computed once per process, or on every request under DEBUG so
+#   template edits show up.
+#
+# Usage:
+#   @public_page
+#   async def landing_page(request): ...
+
+from datetime import datetime, UTC
+from functools import wraps
+import hashlib
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from .assets import critical_css
+from .context_processors import get_settings_context
+
+_fingerprint: tuple[str, datetime] | None = None
+
+
+def _template_files() -> list[Path]:
+    from django.template import engines
+
+    from .warmup import project_templates
+
+    files = set()
+    for backend in engines.all():
+        if hasattr(backend, "engine"):  # Django template backends
+            files.update(project_templates(backend.engine).values())
+    return sorted(files)
+
+
+def compute_fingerprint() -> tuple[str, datetime]:
+    """(ETag, Last-Modified) for the project's current templates and settings."""
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(str(getattr(settings, "STATIC_VERSION", "")).encode())
+    digest.update(repr(sorted(get_settings_context().items())).encode())
+    digest.update(critical_css().encode())  # inlined into every page
+    newest = 0.0
+    for path in _template_files():
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+        newest = max(newest, path.stat().st_mtime)
+    return f'"{digest.hexdigest()}"', datetime.fromtimestamp(int(newest), UTC)
+
+
+def get_fingerprint() -> tuple[str, datetime]:
+    global _fingerprint
+    if settings.DEBUG:
+        return compute_fingerprint()
+    if _fingerprint is None:
+        _fingerprint = compute_fingerprint()
+    return _fingerprint
+
+
+@receiver(setting_changed)
+def _reset_fingerprint(**kwargs):
+    global _fingerprint
+    _fingerprint = None
+
+
+def _is_anonymous_visit(request) -> bool:
+    # decided from cookies alone: no session load, safe in async views
+    return (
+        settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def _etag(request, *args, **kwargs):
+    return get_fingerprint()[0] if _is_anonymous_visit(request) else None
+
+
+def _last_modified(request, *args, **kwargs):
+    return get_fingerprint()[1] if _is_anonymous_visit(request) else None
+
+
+def public_page(view):
+    """
+    Wrap a public page view (sync or async) with template-derived conditional GET.
+    Responses are `private, no-cache`: browsers revalidate every time, shared caches
+    don't store them, and `Vary: Cookie` keeps signed-in pages apart.
+    """
+    conditional = condition(etag_func=_etag, last_modified_func=_last_modified)(view)
+
+    def finish(response):
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Cookie",))
+        return response
+
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            return finish(await conditional(request, *args, **kwargs))
+
+    else:
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            return finish(conditional(request, *args, **kwargs))
+
+    return wrapper
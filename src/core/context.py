@@ -1,4 +1,5 @@
 # src/core/context.py
+# Legacy processor: core.context_processors.site now provides these values.
 from django.conf import settings
 
 
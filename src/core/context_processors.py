@@ -1,7 +1,77 @@
-# src/core/context_processor.py
+# src/core/context_processors.py
 from django.conf import settings
+from django.contrib.auth.context_processors import PermWrapper
+from django.contrib.messages.api import get_messages
+from django.contrib.messages.constants import DEFAULT_LEVELS
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
+# Settings exposed to every template, with their fallbacks.
+SETTINGS_CONTEXT_DEFAULTS = {
+    # core settings
+    "ENV": "dev",
+    "DEBUG": False,
+    "STATIC_VERSION": "dev-0",
+    # site meta
+    "SITE_ORIGIN": "",
+    "SITE_NAME": "LangCen Base",
+    "SITE_DESCRIPTION": "LangCen — a clean, accessible Django 5 + Tailwind v4 starter.",
+}
 
+_settings_context: dict | None = None
+
+
+def _build_settings_context() -> dict:
+    values = {
+        name: getattr(settings, name, dflt) for name, dflt in SETTINGS_CONTEXT_DEFAULTS.items()
+    }
+    values["DEBUG_FLAG"] = bool(values.pop("DEBUG"))
+    return values
+
+
+def get_settings_context() -> dict:
+    """Settings-derived template variables, built once per process (see _reset below)."""
+    global _settings_context
+    if _settings_context is None:
+        _settings_context = _build_settings_context()
+    return _settings_context
+
+
+@receiver(setting_changed)
+def _reset_settings_context(setting, **kwargs):
+    # keeps @override_settings(SITE_NAME=...) and friends working
+    global _settings_context
+    if setting in SETTINGS_CONTEXT_DEFAULTS:
+        _settings_context = None
+
+
+def site(request):
+    """
+    Single project context processor; replaces the request, auth, messages,
+    site_meta and core_settings processors.
+
+    - Settings values come from a dict built once (no getattr() per render).
+    - `user` stays the lazy request.user, `perms` is a lazy PermWrapper and
+      `messages` is the message storage, which only loads when iterated.
+    """
+    if hasattr(request, "user"):
+        user = request.user
+    else:
+        from django.contrib.auth.models import AnonymousUser
+
+        user = AnonymousUser()
+
+    return {
+        **get_settings_context(),
+        "request": request,
+        "user": user,
+        "perms": PermWrapper(user),
+        "messages": get_messages(request),
+        "DEFAULT_MESSAGE_LEVELS": DEFAULT_LEVELS,
+    }
+
+
+# --- Legacy processors (no longer in TEMPLATES; kept for forks and bench_context) ---
 def site_meta(_request):
     return {
         "SITE_ORIGIN": getattr(settings, "SITE_ORIGIN", ""),
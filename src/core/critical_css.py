@@ -0,0 +1,214 @@
+# src/core/critical_css.py
+#
+# Build-time critical CSS extraction (used by `manage.py build_critical_css`).
+# - Candidate class names are collected the way Tailwind collects them: every
+#   whitespace/quote separated token in the above-the-fold sources (base.html,
+#   head/header/navbar partials, the partials and icons they include, and the
+#   template tags that emit classes).
+# - The built stylesheet is split into rules (at-rules nest, rule bodies are kept
+#   verbatim, so Tailwind v4's nested `&:hover{...}` blocks stay intact). A rule is
+#   kept if one of its selectors only uses known classes, or no classes at all
+#   (preflight, :root variables). @media/@supports/@layer keep their kept children.
+#   @keyframes are kept only when a kept rule names them.
+#
+# The result is a small subset of output.css; base.html inlines it and loads the
+# full stylesheet without blocking (core/templatetags/assets.py).
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import re
+
+CRITICAL_TEMPLATES = (
+    "core/base.html",
+    "core/partials/head.html",
+    "core/partials/header.html",
+    "core/partials/navbar.html",
+)
+# Python sources whose strings end up in class attributes of those templates
+CRITICAL_PY_SOURCES = ("core/templatetags/navigation.py", "core/templatetags/icons.py")
+# toggled at runtime by main.js, never spelled out in a template
+ALWAYS_TOKENS = frozenset({"dark", "is-active"})
+
+_NESTING_AT_RULES = ("@media", "@supports", "@layer", "@container", "@scope")
+_INCLUDE = re.compile(r"""{%\s*include\s+["']([^"']+)["']""")
+_ICON = re.compile(r"""{%\s*icon\s+["']([^"']+)["']""")
+_TOKEN_SPLIT = re.compile(r"""[\s"'`]+""")
+_CLASS = re.compile(r"\.(-?(?:\\[0-9a-fA-F]{1,6}\s?|\\.|[\w-])+)")
+_ESCAPE = re.compile(r"\\([0-9a-fA-F]{1,6})\s?|\\(.)")
+_ANIMATION_NAME = re.compile(r"animation(?:-name)?\s*:\s*([\w-]+)")
+
+
+@dataclass
+class Node:
+    prelude: str  # selector list or at-rule prelude ("" for statements)
+    body: str | None = None  # raw declarations (rules) / None (statements, nesting blocks)
+    children: list["Node"] = field(default_factory=list)
+    nesting: bool = False
+
+    def render(self) -> str:
+        if self.nesting:
+            return f"{self.prelude}{{{''.join(c.render() for c in self.children)}}}"
+        if self.body is None:
+            return f"{self.prelude};"
+        return f"{self.prelude}{{{self.body}}}"
+
+
+# --- Tokens -------------------------------------------------------------------
+def template_sources(engine, names=CRITICAL_TEMPLATES) -> dict[str, str]:
+    """{name: source} for `names` plus everything they include (icons too)."""
+    sources = {}
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in sources:
+            continue
+        template, _origin = engine.find_template(name)
+        sources[name] = template.source
+        pending += _INCLUDE.findall(template.source)
+        pending += [f"core/icons/{icon}.html" for icon in _ICON.findall(template.source)]
+    return sources
+
+
+def tokens_from(texts) -> set[str]:
+    tokens = set(ALWAYS_TOKENS)
+    for text in texts:
+        tokens.update(t for t in _TOKEN_SPLIT.split(text) if t)
+    return tokens
+
+
+# --- CSS ----------------------------------------------------------------------
+def _skip_string(css: str, i: int) -> int:
+    quote = css[i]
+    i += 1
+    while i < len(css) and css[i] != quote:
+        i += 2 if css[i] == "\\" else 1
+    return i + 1
+
+
+def _matching_brace(css: str, i: int) -> int:
+    """Index just past the `}` closing the block whose `{` is at css[i - 1]."""
+    depth = 1
+    while depth:
+        if i >= len(css):
+            raise ValueError("unbalanced braces in stylesheet")
+        char = css[i]
+        if char in "\"'":
+            i = _skip_string(css, i)
+            continue
+        depth += {"{": 1, "}": -1}.get(char, 0)
+        i += 1
+    return i
+
+
+def strip_comments(css: str) -> str:
+    out, i, start = [], 0, 0
+    while i < len(css):
+        if css[i] in "\"'":
+            i = _skip_string(css, i)
+        elif css.startswith("/*", i):
+            out.append(css[start:i])
+            i = start = css.index("*/", i) + 2
+        else:
+            i += 1
+    out.append(css[start:])
+    return "".join(out)
+
+
+def parse(css: str, i: int = 0) -> tuple[list[Node], int]:
+    """
+    Parse comment-free CSS until the end of input or an unmatched `}`.
+    Returns (nodes, index after the closing brace).
+    """
+    nodes, start = [], i
+    while i < len(css):
+        char = css[i]
+        if char in "\"'":
+            i = _skip_string(css, i)
+        elif char == ";":
+            if css[start:i].strip():
+                nodes.append(Node(css[start:i].strip()))
+            i = start = i + 1
+        elif char == "{":
+            prelude = css[start:i].strip()
+            if prelude.startswith(_NESTING_AT_RULES):
+                children, i = parse(css, i + 1)
+                nodes.append(Node(prelude, children=children, nesting=True))
+            else:
+                end = _matching_brace(css, i + 1)
+                nodes.append(Node(prelude, body=css[i + 1 : end - 1]))
+                i = end
+            start = i
+        elif char == "}":
+            return nodes, i + 1
+        else:
+            i += 1
+    return nodes, i
+
+
+def _unescape(name: str) -> str:
+    # CSS escapes: `\31 ` (hex code point + optional space) or `\:` (literal char)
+    return _ESCAPE.sub(lambda m: chr(int(m[1], 16)) if m[1] else m[2], name)
+
+
+def selector_classes(selector: str) -> set[str]:
+    return {_unescape(name) for name in _CLASS.findall(selector)}
+
+
+def _split_selectors(prelude: str) -> list[str]:
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(prelude[start:i])
+            start = i + 1
+    parts.append(prelude[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _filter(nodes: list[Node], tokens: set[str]) -> list[Node]:
+    kept = []
+    for node in nodes:
+        if node.nesting:
+            children = _filter(node.children, tokens)
+            if children:
+                kept.append(Node(node.prelude, children=children, nesting=True))
+        elif node.body is None or node.prelude.startswith("@"):
+            kept.append(node)  # statements, @property, @font-face, @keyframes (pruned later)
+        else:
+            selectors = [s for s in _split_selectors(node.prelude) if selector_classes(s) <= tokens]
+            if selectors:
+                kept.append(Node(",".join(selectors), body=node.body))
+    return kept
+
+
+def _prune_keyframes(nodes: list[Node], used: set[str]) -> list[Node]:
+    kept = []
+    for node in nodes:
+        if node.nesting:
+            node.children = _prune_keyframes(node.children, used)
+            if not node.children:
+                continue
+        elif node.prelude.startswith(("@keyframes", "@-webkit-keyframes")):
+            if node.prelude.split()[-1] not in used:
+                continue
+        kept.append(node)
+    return kept
+
+
+def extract(css: str, tokens: set[str]) -> str:
+    """The rules of `css` needed to style markup using only `tokens` as classes."""
+    nodes, _ = parse(strip_comments(css))
+    kept = _filter(nodes, tokens)
+    rendered = "".join(node.render() for node in kept)
+    return "".join(
+        node.render() for node in _prune_keyframes(kept, set(_ANIMATION_NAME.findall(rendered)))
+    )
+
+
+def critical_tokens(engine, base_dir: Path) -> set[str]:
+    texts = list(template_sources(engine).values())
+    texts += [(base_dir / path).read_text(encoding="utf-8") for path in CRITICAL_PY_SOURCES]
+    return tokens_from(texts)
@@ -0,0 +1,92 @@
+# src/core/health.py
+#
+# Dependency checks behind /readyz.
+# Each check result is cached per process for HEALTH_CHECK_CACHE_SECONDS, so
+# load-balancer probes hitting every node every second cost (almost) nothing.
+# Failure details (which may name hosts or credentials) are logged, never served:
+# /readyz only says "ok" or "fail" per check.
+
+import logging
+from threading import Lock
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.smtp import EmailBackend as SMTPEmailBackend
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.template.loader import get_template
+
+log = logging.getLogger("core.health")
+
+_cache: dict[str, tuple[float, bool, str]] = {}
+_lock = Lock()
+
+
+def check_database() -> str:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return "ok"
+
+
+def check_migrations() -> str:
+    executor = MigrationExecutor(connection)
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if plan:
+        raise RuntimeError(f"{len(plan)} unapplied migration(s)")
+    return "ok"
+
+
+def check_email() -> str:
+    # Instantiating validates the backend (e.g. filebased creates/validates its dir).
+    # Only SMTP is opened: opening the filebased backend would create an empty file.
+    backend = get_connection(fail_silently=False)
+    if isinstance(backend, SMTPEmailBackend):
+        backend.open()
+        backend.close()
+    return type(backend).__module__
+
+
+def check_templates() -> str:
+    get_template("core/base.html")
+    return "ok"
+
+
+CHECKS = {
+    "database": check_database,
+    "migrations": check_migrations,
+    "email": check_email,
+    "templates": check_templates,
+}
+
+
+def run_checks() -> dict[str, dict]:
+    """
+    Run every check in CHECKS, reusing results younger than HEALTH_CHECK_CACHE_SECONDS.
+    Returns {name: {"ok": bool, "detail": str}}; failures never raise.
+    """
+    ttl = getattr(settings, "HEALTH_CHECK_CACHE_SECONDS", 5)
+    now = time.monotonic()
+    results = {}
+
+    for name, check in CHECKS.items():
+        with _lock:
+            cached = _cache.get(name)
+        if cached and cached[0] > now:
+            _, ok, detail = cached
+        else:
+            try:
+                ok, detail = True, check()
+            except Exception as exc:  # a probe must report, not crash
+                ok, detail = False, f"{type(exc).__name__}: {exc}"
+                log.warning("readiness check failed", extra={"check": name, "error": detail})
+            with _lock:
+                _cache[name] = (now + ttl, ok, detail)
+        results[name] = {"ok": ok, "detail": detail}
+
+    return results
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,135 @@
+# src/core/logs.py
+#
+# Structured, non-blocking logging (wired up by settings.LOGGING).
+# - Loggers hand records to StructuredQueueHandler, which only enqueues them;
+#   a QueueListener thread (started in CoreConfig.ready) formats them as JSON
+#   lines and writes the rotating log files. Request threads never wait on disk.
+#   The files open lazily (delay=True); start_queue_listeners() creates their
+#   directory first, so importing settings touches no disk.
+# - SampleFilter keeps 1 in N sub-WARNING records from chatty loggers (e.g.
+#   per-row import logs); kept records carry `sample_rate` so counts can be scaled.
+#
+# Usage:
+#   log = logging.getLogger("users.seed.rows")
+#   log.info("created", extra={"email": email, "row": n})
+
+import atexit
+from datetime import datetime, UTC
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+from pathlib import Path
+import queue
+
+# Attributes every LogRecord has; anything else came from `extra=` and is emitted.
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, extras, exc."""
+
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class SampleFilter(logging.Filter):
+    """
+    rates: {logger name prefix: N} → keep every Nth record below WARNING from
+    loggers under that prefix. WARNING and above always pass.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        # longest prefix wins
+        self.rates = sorted((rates or {}).items(), key=lambda kv: -len(kv[0]))
+        self._counters = {prefix: itertools.count() for prefix, _ in self.rates}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        for prefix, every in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                if every <= 1:
+                    return True
+                record.sample_rate = every
+                return next(self._counters[prefix]) % every == 0
+        return True
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps records structured: the message is interpolated and the
+    traceback rendered to text (both must happen on the logging thread), but extras
+    stay as attributes for JsonFormatter on the listener side.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _queue_handlers():
+    for name in logging.getHandlerNames():
+        handler = logging.getHandlerByName(name)
+        if isinstance(handler, StructuredQueueHandler) and getattr(handler, "listener", None):
+            yield handler
+
+
+def _listeners():
+    for handler in _queue_handlers():
+        yield handler.listener
+
+
+def _fresh_queue(handler) -> None:
+    """
+    After fork(): a new queue for the handler and its listener. The parent's listener
+    thread may have held the inherited queue's mutex at fork time, and no thread in
+    the child would ever release it. Records still queued belong to the parent.
+    """
+    handler.queue = handler.listener.queue = queue.Queue()
+    handler.listener._thread = None
+
+
+def _restart_after_fork() -> None:
+    # threads don't survive fork(): pre-forked workers (gunicorn --preload) need their own
+    for handler in _queue_handlers():
+        _fresh_queue(handler)
+    start_queue_listeners()
+
+
+_fork_hook_registered = False
+
+
+def start_queue_listeners() -> None:
+    """Start the listener of every configured StructuredQueueHandler (idempotent)."""
+    global _fork_hook_registered
+    for listener in _listeners():
+        if getattr(listener, "_thread", None) is None:
+            for target in listener.handlers:
+                if isinstance(target, logging.FileHandler):
+                    Path(target.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+            listener.start()
+            atexit.register(listener.stop)
+    if not _fork_hook_registered and hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_after_fork)
+        _fork_hook_registered = True
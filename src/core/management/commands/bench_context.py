@@ -0,0 +1,101 @@
+# src/core/management/commands/bench_context.py
+#
+# Benchmark the per-render cost of the template context processors:
+#   legacy  = request + auth + messages + site_meta + core_settings (5 processors)
+#   merged  = core.context_processors.site (1 processor, settings dict cached)
+#
+# Examples:
+#   python src/manage.py bench_context
+#   python src/manage.py bench_context --template core/pages/about.html -n 2000
+
+from copy import deepcopy
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.utils.module_loading import import_string
+
+LEGACY_PROCESSORS = [
+    "django.template.context_processors.request",
+    "django.contrib.auth.context_processors.auth",
+    "django.contrib.messages.context_processors.messages",
+    "core.context_processors.site_meta",
+    "core.context.core_settings",
+]
+MERGED_PROCESSORS = ["core.context_processors.site"]
+
+
+def _backend(name: str, processors: list[str]) -> DjangoTemplates:
+    # settings.TEMPLATES as rewritten by django_cotton's auto-setup (cached loader, builtins)
+    params = deepcopy(settings.TEMPLATES[0])
+    params.pop("BACKEND")
+    params.setdefault("APP_DIRS", False)
+    params["NAME"] = f"bench-{name}"
+    params["OPTIONS"]["context_processors"] = processors
+    return DjangoTemplates(params)
+
+
+def _request(path: str = "/"):
+    from django.contrib.sessions.backends.signed_cookies import SessionStore
+
+    request = RequestFactory(SERVER_NAME=settings.ALLOWED_HOSTS[0]).get(path)
+    request.session = SessionStore()
+    request.user = AnonymousUser()
+    request._messages = default_storage(request)
+    return request
+
+
+def _best_of(fn, iterations: int, repeats: int = 5) -> float:
+    """Best average seconds per call over `repeats` runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+class Command(BaseCommand):
+    help = "Compare per-render cost of the legacy vs merged context processors."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--template", default="core/pages/index.html")
+        parser.add_argument("-n", "--iterations", type=int, default=500)
+
+    def handle(self, *args, **opts):
+        template_name = opts["template"]
+        n = opts["iterations"]
+
+        self.stdout.write(self.style.NOTICE(f"== bench_context: {template_name}, n={n} =="))
+
+        results = {}
+        for name, processors in (("legacy", LEGACY_PROCESSORS), ("merged", MERGED_PROCESSORS)):
+            funcs = [import_string(p) for p in processors]
+            template = _backend(name, processors).get_template(template_name)
+
+            def run_processors(funcs=funcs, request=_request()):
+                for func in funcs:
+                    func(request)
+
+            def render(template=template):
+                template.render({}, _request())
+
+            render()  # warm imports/caches outside the timed loop
+            results[name] = (_best_of(run_processors, n), _best_of(render, n))
+            self.stdout.write(
+                f"{name:>7}: processors {results[name][0] * 1e6:8.1f} µs   "
+                f"full render {results[name][1] * 1e6:8.1f} µs"
+            )
+
+        (lp, lr), (mp, mr) = results["legacy"], results["merged"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"saving per render: {(lp - mp) * 1e6:.1f} µs in processors "
+                f"({(1 - mp / lp) * 100:.0f}%), {(lr - mr) * 1e6:.1f} µs overall"
+            )
+        )
@@ -0,0 +1,75 @@
+# src/core/management/commands/bench_cotton_inline.py
+#
+# Benchmark compile-time inlining of static cotton components
+# (core/template_loaders.py) on a full page render:
+#   runtime = django_cotton.cotton_loader.Loader (every component rendered per request)
+#   inlined = core.template_loaders.Loader (static uses pre-rendered at compile time)
+#
+# Examples:
+#   python src/manage.py bench_cotton_inline
+#   python src/manage.py bench_cotton_inline --template core/pages/index.html -n 2000
+
+from copy import deepcopy
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.backends.django import DjangoTemplates
+
+from .bench_context import _best_of, _request
+
+COTTON_LOADER = "django_cotton.cotton_loader.Loader"
+INLINE_LOADER = "core.template_loaders.Loader"
+_COMPONENT_USE = re.compile(r"{%\s*c\s")
+
+
+def _backend(name: str, first_loader: str) -> DjangoTemplates:
+    params = deepcopy(settings.TEMPLATES[0])
+    params.pop("BACKEND")
+    params.setdefault("APP_DIRS", False)
+    params["NAME"] = f"bench-{name}"
+    loaders = [
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    ]
+    params["OPTIONS"]["loaders"] = [
+        ("django.template.loaders.cached.Loader", [first_loader, *loaders])
+    ]
+    return DjangoTemplates(params)
+
+
+class Command(BaseCommand):
+    help = "Compare page render time with and without static cotton component inlining."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--template", default="core/pages/about.html")
+        parser.add_argument("-n", "--iterations", type=int, default=500)
+
+    def handle(self, *args, **opts):
+        template_name = opts["template"]
+        n = opts["iterations"]
+
+        self.stdout.write(self.style.NOTICE(f"== bench_cotton_inline: {template_name}, n={n} =="))
+
+        results = {}
+        for name, loader in (("runtime", COTTON_LOADER), ("inlined", INLINE_LOADER)):
+            template = _backend(name, loader).get_template(template_name)
+            uses = len(_COMPONENT_USE.findall(template.template.source))
+
+            def render(template=template):
+                template.render({}, _request())
+
+            render()  # compile component templates outside the timed loop
+            results[name] = _best_of(render, n)
+            self.stdout.write(
+                f"{name:>7}: {uses:3d} component uses in page   "
+                f"full render {results[name] * 1e6:8.1f} µs"
+            )
+
+        before, after = results["runtime"], results["inlined"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"saving per render: {(before - after) * 1e6:.1f} µs "
+                f"({(1 - after / before) * 100:.0f}%)"
+            )
+        )
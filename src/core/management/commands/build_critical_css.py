@@ -0,0 +1,52 @@
+# src/core/management/commands/build_critical_css.py
+#
+# Extract the above-the-fold CSS (base.html, head/header/navbar partials) from the
+# Tailwind build into core/css/critical.css, which head.html inlines when
+# CRITICAL_CSS is on. Run after every `npm run tw:build` (or use `npm run build:css`).
+#
+# Examples:
+#   python src/manage.py build_critical_css
+#   python src/manage.py build_critical_css --css /tmp/output.css --output /tmp/critical.css
+
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+
+from core.assets import CRITICAL_CSS_PATH, find_static, STYLESHEET_PATH
+from core.critical_css import critical_tokens, extract
+
+
+class Command(BaseCommand):
+    help = "Build core/css/critical.css from the Tailwind output for above-the-fold templates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--css", help=f"Built stylesheet (default: static {STYLESHEET_PATH}).")
+        parser.add_argument("--output", help="Where to write (default: next to the stylesheet).")
+
+    def handle(self, *args, **opts):
+        source = Path(opts["css"]) if opts["css"] else find_static(STYLESHEET_PATH)
+        if source is None or not source.is_file():
+            raise CommandError(f"{STYLESHEET_PATH} not found; run `npm run tw:build` first")
+        output = (
+            Path(opts["output"])
+            if opts["output"]
+            else source.with_name(Path(CRITICAL_CSS_PATH).name)
+        )
+
+        css = source.read_text(encoding="utf-8")
+        tokens = critical_tokens(engines["django"].engine, Path(settings.BASE_DIR))
+        try:
+            critical = extract(css, tokens)
+        except ValueError as exc:
+            raise CommandError(f"{source}: {exc}") from exc
+        output.write_text(critical, encoding="utf-8")
+
+        size, full = len(critical.encode()), len(css.encode())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"wrote {output}: {size / 1024:.1f} KiB "
+                f"({size / max(full, 1) * 100:.0f}% of {full / 1024:.1f} KiB)"
+            )
+        )
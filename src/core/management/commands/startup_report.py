@@ -0,0 +1,102 @@
+# src/core/management/commands/startup_report.py
+#
+# Where does worker cold start go? Boots Django in a fresh interpreter
+# (`python -X importtime`) and breaks the time down by phase (settings, app
+# registry, URLconf, middleware), by app (config import, models, ready()) and by
+# imported package (self time). See core/startup.py.
+#
+# Examples:
+#   python src/manage.py startup_report
+#   python src/manage.py startup_report --profile public --top 25
+#   python src/manage.py startup_report --compare --repeat 5
+#   python src/manage.py startup_report --json > startup.json
+
+import json
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import run_child
+
+PROFILES = ("full", "public")
+
+
+class Command(BaseCommand):
+    help = "Break down Django startup time per phase, app and imported package."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profile",
+            choices=PROFILES,
+            help="WORKER_PROFILE for the measured process (default: this process's setting).",
+        )
+        parser.add_argument(
+            "--compare", action="store_true", help="Measure the full and public profiles."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Runs per profile; the fastest is reported."
+        )
+        parser.add_argument("--top", type=int, default=15, help="Packages to list.")
+        parser.add_argument("--json", action="store_true", help="Print raw JSON.")
+
+    def handle(self, *args, **opts):
+        if opts["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+        profiles = PROFILES if opts["compare"] else [opts["profile"] or settings.WORKER_PROFILE]
+
+        reports = {}
+        for profile in profiles:
+            try:
+                runs = [run_child({"WORKER_PROFILE": profile}) for _ in range(opts["repeat"])]
+            except RuntimeError as exc:
+                raise CommandError(str(exc)) from exc
+            report = min(runs, key=lambda r: r["phases"]["total"])
+            report["median_total"] = statistics.median(r["phases"]["total"] for r in runs)
+            reports[profile] = report
+
+        if opts["json"]:
+            self.stdout.write(json.dumps(reports, indent=2))
+            return
+        for profile, report in reports.items():
+            self._print_report(profile, report, opts["top"], opts["repeat"])
+        if opts["compare"]:
+            full, public = (reports[p]["phases"]["total"] for p in PROFILES)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"public profile saves {full - public:.0f} ms per cold start "
+                    f"({(1 - public / full) * 100:.0f}%)"
+                )
+            )
+
+    def _print_report(self, profile, report, top, repeat):
+        phases = report["phases"]
+        self.stdout.write(
+            self.style.NOTICE(
+                f"== startup_report: profile={profile}, fastest of {repeat} "
+                f"(median {report['median_total']:.0f} ms) =="
+            )
+        )
+        for name in ("settings", "apps", "urls", "middleware", "total"):
+            self.stdout.write(f"{name:>12}: {phases[name]:8.1f} ms")
+
+        self.stdout.write(self.style.NOTICE("-- apps (ms): config import / models / ready() --"))
+        for app in sorted(
+            report["apps"],
+            key=lambda a: -(a["import_ms"] + a.get("models_ms", 0) + a.get("ready_ms", 0)),
+        ):
+            self.stdout.write(
+                f"{app['name']:>32}: {app['import_ms']:7.1f} {app.get('models_ms', 0):7.1f} "
+                f"{app.get('ready_ms', 0):7.1f}"
+            )
+
+        self.stdout.write(self.style.NOTICE(f"-- top {top} packages by import self time --"))
+        packages = sorted(report["packages"].items(), key=lambda kv: -kv[1])
+        for package, ms in packages[:top]:
+            self.stdout.write(f"{package:>32}: {ms:7.1f} ms")
+
+        if report["admin_modules"]:
+            style = self.style.WARNING if profile == "public" else self.style.NOTICE
+            self.stdout.write(
+                style(f"admin-side modules loaded: {', '.join(report['admin_modules'])}")
+            )
@@ -0,0 +1,38 @@
+# src/core/management/commands/warmup.py
+#
+# Run the worker warmup steps (core/warmup.py) and print how long each took.
+# A second pass shows the warm cost, i.e. what the first request no longer pays.
+#
+# Examples:
+#   python src/manage.py warmup
+#   python src/manage.py warmup --step templates --step urls
+
+from django.core.management.base import BaseCommand
+
+from core.warmup import STEPS, warmup
+
+
+class Command(BaseCommand):
+    help = "Run the worker warmup steps and report per-step timings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--step",
+            action="append",
+            choices=list(STEPS),
+            help="Only this step (repeatable). Default: all.",
+        )
+
+    def handle(self, *args, **opts):
+        steps = opts["step"] or list(STEPS)
+        self.stdout.write(self.style.NOTICE(f"== warmup: {', '.join(steps)} =="))
+        cold = warmup(steps)
+        warm = warmup(steps)
+        for name, result in cold.items():
+            line = (
+                f"{name:>20}: {result['ms']:8.1f} ms cold, {warm[name]['ms']:7.1f} ms warm"
+                f"   {result['detail']}"
+            )
+            self.stdout.write(line if result["ok"] else self.style.ERROR(line))
+        total = sum(r["ms"] for r in cold.values())
+        self.stdout.write(self.style.SUCCESS(f"total: {total:.1f} ms"))
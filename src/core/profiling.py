@@ -0,0 +1,250 @@
+# src/core/profiling.py
+#
+# On-demand request profiling for staff.
+# - Trigger: `?_profile=<token>` or an `X-Profile: <token>` header, where the token
+#   is signed for one staff user and expires (PROFILER_TOKEN_MAX_AGE). Tokens are
+#   issued from the admin "Request profiles" page.
+# - A triggered request runs under cProfile plus a stack sampler thread; the result
+#   is saved to PROFILER_DIR as <id>.prof (pstats), <id>.txt (sorted stats),
+#   <id>.collapsed (sampled stacks, flamegraph.pl / speedscope format) and <id>.json.
+# - One profile at a time per process: cProfile hooks every thread (sys.monitoring
+#   on Python 3.12+), so a second enable() fails. A triggered request that finds
+#   the profiler busy runs unprofiled and gets `X-Profile-Skipped: busy`. For the
+#   same reason a profile's call stats include other threads' work during the
+#   request; the sampled stacks cover the request's own thread only.
+# - Untriggered requests cost one substring check on the query string and one
+#   header lookup.
+
+from collections import Counter
+import cProfile
+from datetime import datetime
+import io
+import json
+from pathlib import Path
+import pstats
+import re
+import secrets
+import sys
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+
+QUERY_PARAM = "_profile"
+HEADER = "HTTP_X_PROFILE"
+_QUERY_MARK = f"{QUERY_PARAM}="
+_SALT = "core.profiling"
+_SAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+FILE_KINDS = ("prof", "txt", "collapsed", "json")
+
+
+_busy = threading.Lock()  # held while a RequestProfile is active
+
+
+def profile_dir() -> Path:
+    return Path(getattr(settings, "PROFILER_DIR", settings.BASE_DIR.parent / "profiles"))
+
+
+# --- Tokens -------------------------------------------------------------------
+def make_token(user) -> str:
+    return signing.TimestampSigner(salt=_SALT).sign(str(user.pk))
+
+
+def token_max_age() -> int:
+    return getattr(settings, "PROFILER_TOKEN_MAX_AGE", 3600)
+
+
+def token_is_valid(token: str, user) -> bool:
+    if not token or not getattr(user, "is_staff", False) or not user.is_active:
+        return False
+    max_age = token_max_age()
+    try:
+        pk = signing.TimestampSigner(salt=_SALT).unsign(token, max_age=max_age)
+    except signing.BadSignature:
+        return False
+    return pk == str(user.pk)
+
+
+def _trigger_token(request) -> str | None:
+    token = request.META.get(HEADER)
+    if token:
+        return token
+    if _QUERY_MARK in request.META.get("QUERY_STRING", ""):
+        return request.GET.get(QUERY_PARAM)
+    return None
+
+
+# --- Sampling -----------------------------------------------------------------
+class StackSampler(threading.Thread):
+    """Samples one thread's stack every `interval` seconds into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True, name="profiler-sampler")
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(
+                    f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self) -> Counter:
+        self._done.set()
+        self.join()
+        return self.stacks
+
+
+class RequestProfile:
+    """
+    cProfile + sampler around one request; save() writes the four files.
+    `active` is False when another profile (or profiling tool) already runs.
+    """
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        interval = getattr(settings, "PROFILER_SAMPLE_INTERVAL", 0.001)
+        self.sampler = StackSampler(threading.get_ident(), interval)
+        self.started = 0.0
+        self.elapsed = 0.0
+        self.active = False
+
+    def __enter__(self):
+        if not _busy.acquire(blocking=False):
+            return self
+        try:
+            self.profiler.enable()
+        except ValueError:  # "Another profiling tool is already active"
+            _busy.release()
+            return self
+        self.active = True
+        self.started = time.perf_counter()
+        self.sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        if not self.active:
+            return False
+        self.profiler.disable()
+        _busy.release()
+        self.stacks = self.sampler.stop()
+        self.elapsed = time.perf_counter() - self.started
+        return False
+
+    def save(self, request, response, user) -> str:
+        """Write the files (blocking I/O: call through sync_to_async from async code)."""
+        match = getattr(request, "resolver_match", None)
+        view = (match.view_name if match else None) or "unresolved"
+        now = datetime.now()
+        profile_id = f"{now:%Y%m%d-%H%M%S}-{_SAFE.sub('_', view)}-{secrets.token_hex(3)}"
+        base = profile_dir()
+        base.mkdir(parents=True, exist_ok=True)
+
+        self.profiler.dump_stats(base / f"{profile_id}.prof")
+        text = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=text)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(60)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(30)
+        (base / f"{profile_id}.txt").write_text(text.getvalue(), encoding="utf-8")
+        (base / f"{profile_id}.collapsed").write_text(
+            "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common()), encoding="utf-8"
+        )
+        meta = {
+            "id": profile_id,
+            "view": view,
+            "path": request.path,
+            "method": request.method,
+            "status": response.status_code,
+            "duration_ms": round(self.elapsed * 1000, 2),
+            "samples": sum(self.stacks.values()),
+            "user": getattr(user, "email", str(user)),
+            "created": now.isoformat(timespec="seconds"),
+        }
+        (base / f"{profile_id}.json").write_text(json.dumps(meta), encoding="utf-8")
+        _prune(base)
+        return profile_id
+
+
+def _prune(base: Path) -> None:
+    keep = getattr(settings, "PROFILER_KEEP", 200)
+    metas = sorted(base.glob("*.json"), reverse=True)
+    for meta in metas[keep:]:
+        for kind in FILE_KINDS:
+            (base / f"{meta.stem}.{kind}").unlink(missing_ok=True)
+
+
+def list_profiles() -> list[dict]:
+    """Saved profiles, newest first."""
+    base = profile_dir()
+    if not base.is_dir():
+        return []
+    return [json.loads(p.read_text()) for p in sorted(base.glob("*.json"), reverse=True)]
+
+
+def profile_file(profile_id: str, kind: str) -> Path | None:
+    if kind not in FILE_KINDS or _SAFE.search(profile_id):
+        return None
+    path = profile_dir() / f"{profile_id}.{kind}"
+    return path if path.is_file() else None
+
+
+# --- Middleware ---------------------------------------------------------------
+class ProfilerMiddleware:
+    """
+    Profile a request when a staff user sends a valid profiling token.
+    Must come after AuthenticationMiddleware. Sync and async capable.
+    The response gets an `X-Profile-Id` header naming the saved profile, or
+    `X-Profile-Skipped: busy` when another request is being profiled.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "PROFILER_ENABLED", True)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _trigger_token(request) if self.enabled else None
+        if token is None or not token_is_valid(token, request.user):
+            return self.get_response(request)
+        with RequestProfile() as profile:
+            response = self.get_response(request)
+        profile_id = profile.save(request, response, request.user) if profile.active else None
+        return self._finish(response, profile_id)
+
+    async def __acall__(self, request):
+        token = _trigger_token(request) if self.enabled else None
+        # request.user (the sync lazy object) is never resolved here: it would hit the DB
+        user = await request.auser() if token is not None else None
+        if token is None or not token_is_valid(token, user):
+            return await self.get_response(request)
+        # samples the event loop thread: concurrent requests on it show up too
+        with RequestProfile() as profile:
+            response = await self.get_response(request)
+        profile_id = None
+        if profile.active:
+            profile_id = await sync_to_async(profile.save)(request, response, user)
+        return self._finish(response, profile_id)
+
+    def _finish(self, response, profile_id):
+        if profile_id:
+            response["X-Profile-Id"] = profile_id
+        else:
+            response["X-Profile-Skipped"] = "busy"
+        return response
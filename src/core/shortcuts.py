@@ -0,0 +1,15 @@
+# src/core/shortcuts.py
+from django.shortcuts import render
+
+
+async def arender(request, template_name, context=None, *, content_type=None, status=None):
+    """
+    Async counterpart of django.shortcuts.render for async views.
+
+    Resolves the user with request.auser() first and pins it on the request, so the
+    auth context processor and {{ request.user }} in templates never fall back to the
+    synchronous session/user loader (which raises SynchronousOnlyOperation in async views).
+    Rendering itself is CPU-only and stays on the event loop.
+    """
+    request.user = await request.auser()
+    return render(request, template_name, context, content_type=content_type, status=status)
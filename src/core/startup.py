@@ -0,0 +1,160 @@
+# src/core/startup.py
+#
+# Cold-start measurement for the startup_report command.
+# - measure() runs in a fresh interpreter started with `-X importtime`: it times
+#   settings import, each app's config import / models import / ready(), the URLconf
+#   and the middleware chain, and prints the result as one JSON object.
+# - parse_importtime() folds the interpreter's import log (stderr) into self-time
+#   per package, so the report can say what the phases were importing.
+#
+# Usage:
+#   report = run_child({"WORKER_PROFILE": "public"})
+#   report["phases"]["total"], report["apps"], report["packages"]
+
+from collections import Counter
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+_CHILD = "from core.startup import measure; measure()"
+_IMPORTTIME = "import time:"
+# Admin-side modules a public worker shouldn't load. (django_cotton's apps.py imports
+# the django.contrib.admin package itself, so that one isn't a useful signal.)
+ADMIN_MODULES = (
+    "unfold",
+    "import_export",
+    "tablib",
+    "openpyxl",
+    "users.admin",
+    "django_extensions",
+)
+
+
+def _ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def package_of(module: str) -> str:
+    """Reporting bucket for a module: django.contrib apps and django subpackages
+    are split out, the stdlib is one bucket, anything else is its top-level package."""
+    parts = module.split(".")
+    if parts[0] == "django":
+        return ".".join(parts[: 3 if parts[1:2] == ["contrib"] else 2])
+    if parts[0] in sys.stdlib_module_names or parts[0].startswith("_"):
+        return "(stdlib)"
+    return parts[0]
+
+
+def parse_importtime(stderr: str) -> Counter:
+    """Self time in ms per package_of() bucket from `-X importtime` output."""
+    totals = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith(_IMPORTTIME):
+            continue
+        fields = line[len(_IMPORTTIME) :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header row
+        totals[package_of(fields[2].strip())] += int(fields[0]) / 1000
+    return totals
+
+
+def _instrument_apps(apps: dict) -> None:
+    """Wrap AppConfig so populate() records per-app import, models and ready() time."""
+    from django.apps import AppConfig
+
+    create = AppConfig.create.__func__
+    import_models = AppConfig.import_models
+
+    def timed_create(cls, entry):
+        start = time.perf_counter()
+        config = create(cls, entry)
+        apps[config.label] = {"name": config.name, "import_ms": _ms(start)}
+        return config
+
+    def timed_import_models(self):
+        start = time.perf_counter()
+        import_models(self)
+        apps[self.label]["models_ms"] = _ms(start)
+
+        ready = self.ready
+
+        def timed_ready():
+            start = time.perf_counter()
+            ready()
+            apps[self.label]["ready_ms"] = _ms(start)
+
+        self.ready = timed_ready
+
+    AppConfig.create = classmethod(timed_create)
+    AppConfig.import_models = timed_import_models
+
+
+def measure() -> None:
+    """Boot Django phase by phase and print the timings as JSON (child process)."""
+    started = time.perf_counter()
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    phases, apps = {}, {}
+
+    start = time.perf_counter()
+    import django
+    from django.conf import settings
+
+    settings.INSTALLED_APPS  # noqa: B018 (imports the settings module)
+    phases["settings"] = _ms(start)
+
+    _instrument_apps(apps)
+    start = time.perf_counter()
+    django.setup()
+    phases["apps"] = _ms(start)
+
+    start = time.perf_counter()
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns  # noqa: B018 (imports every urls module)
+    phases["urls"] = _ms(start)
+
+    start = time.perf_counter()
+    from django.core.handlers.wsgi import WSGIHandler
+
+    WSGIHandler()  # loads the middleware chain
+    phases["middleware"] = _ms(start)
+    phases["total"] = _ms(started)
+
+    report = {
+        "profile": getattr(settings, "WORKER_PROFILE", "full"),
+        "phases": phases,
+        "apps": list(apps.values()),
+        "admin_modules": [name for name in ADMIN_MODULES if name in sys.modules],
+    }
+    sys.stdout.write(json.dumps(report) + "\n")
+
+
+def run_child(env: dict | None = None, *, src_dir: Path | None = None) -> dict:
+    """Run measure() in a fresh interpreter and attach the per-package import times."""
+    from django.conf import settings
+
+    src_dir = src_dir or Path(settings.BASE_DIR)
+    child_env = {**os.environ, **(env or {})}
+    child_env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(src_dir), child_env.get("PYTHONPATH")])
+    )
+    child_env.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD],
+        capture_output=True,
+        text=True,
+        env=child_env,
+        cwd=src_dir,
+        check=False,
+    )
+    if result.returncode != 0:
+        tail = "\n".join(
+            line for line in result.stderr.splitlines() if not line.startswith(_IMPORTTIME)
+        )
+        raise RuntimeError(f"startup measurement failed:\n{tail[-2000:]}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["packages"] = parse_importtime(result.stderr)
+    return report
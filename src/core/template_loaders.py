@@ -0,0 +1,97 @@
+# src/core/template_loaders.py
+#
+# Cotton loader with compile-time inlining of static component uses.
+# - After cotton compiles a template, every innermost
+#     {% c NAME attr="literal" ... %}plain text/HTML{% endc %}
+#   whose NAME is in DEFAULT_STATIC_COMPONENTS (or the COTTON_STATIC_COMPONENTS
+#   setting, which replaces it) is rendered once and replaced by its HTML. Passes
+#   repeat, so nested static components collapse bottom-up.
+# - Uses with a dynamic attribute (`:attr`, `{% attr %}`), template tags or
+#   variables in the body, or unknown components are left untouched.
+# - Only list components whose output depends on nothing but their attributes and
+#   slot: with cotton's legacy (non-isolated) context a component could otherwise
+#   read page variables that don't exist at compile time.
+# - Pages are compiled once per process by the cached loader, so this costs
+#   nothing per request. COTTON_INLINE_STATIC = False turns it off.
+#
+# settings.TEMPLATES loaders:
+#   ("django.template.loaders.cached.Loader", [
+#       "core.template_loaders.Loader",
+#       "django_cotton.cotton_loader.Loader",  # kept so cotton leaves the config alone
+#       ...
+#   ])
+
+import logging
+import re
+
+from django.conf import settings
+from django.template import Context, Template
+from django_cotton.cotton_loader import Loader as CottonLoader
+
+log = logging.getLogger(__name__)
+
+DEFAULT_STATIC_COMPONENTS = (
+    "alert",
+    "alert.description",
+    "alert.title",
+    "badge",
+    "card",
+    "card.content",
+    "card.description",
+    "card.footer",
+    "card.header",
+    "card.title",
+    "label",
+    "separator",
+)
+
+_TEMPLATE_MARKERS = ("{%", "{{", "{#")
+# innermost component use: a body without template syntax
+_STATIC_USE = re.compile(
+    r"{%\s*c\s+(?P<name>[\w.:/-]+)(?P<attrs>(?:(?!%}).)*?)%}"
+    r"(?P<body>(?:(?!{%|{{|{#).)*?)"
+    r"{%\s*endc\s*%}",
+    re.DOTALL,
+)
+# literal attributes: `key="value"`, `key='value'` or bare `key`, never `:key`
+_LITERAL_ATTRS = re.compile(r"""(?:\s+[^\s=:"'][^\s="']*(?:="[^"]*"|='[^']*')?)*\s*""")
+
+
+def static_components() -> frozenset[str]:
+    names = getattr(settings, "COTTON_STATIC_COMPONENTS", DEFAULT_STATIC_COMPONENTS)
+    return frozenset(name.replace("/", ".") for name in names)
+
+
+def inline_static_components(source: str, engine, allowed=None) -> str:
+    """`source` (compiled cotton) with static uses of `allowed` components pre-rendered."""
+    allowed = static_components() if allowed is None else allowed
+    changed = True
+
+    def replace(match):
+        nonlocal changed
+        if match["name"].replace("/", ".") not in allowed or not _LITERAL_ATTRS.fullmatch(
+            match["attrs"]
+        ):
+            return match[0]
+        try:
+            html = Template("{% load cotton %}" + match[0], engine=engine).render(Context())
+        except Exception as exc:
+            log.debug("static component not inlined", extra={"use": match[0], "error": str(exc)})
+            return match[0]
+        if any(marker in html for marker in _TEMPLATE_MARKERS):
+            return match[0]  # would be parsed again as template syntax
+        changed = True
+        return html
+
+    while changed:
+        changed = False
+        source = _STATIC_USE.sub(replace, source)
+    return source
+
+
+class Loader(CottonLoader):
+    def get_contents(self, origin):
+        contents = super().get_contents(origin)
+        if not getattr(settings, "COTTON_INLINE_STATIC", True) or "endc" not in contents:
+            return contents
+        return inline_static_components(contents, self.engine)
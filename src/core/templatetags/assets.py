@@ -0,0 +1,48 @@
+# src/core/templatetags/assets.py
+from django import template
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from core.assets import asset_url as _asset_url, critical_css, PRELOAD_MARK
+
+register = template.Library()
+
+
+@register.simple_tag
+def asset_url(path: str) -> str:
+    """
+    Usage:
+      <script src="{% asset_url 'core/js/main.js' %}"></script>
+
+    Static URL with ?v=STATIC_VERSION (the same URL the preload headers use).
+    """
+    return _asset_url(path)
+
+
+@register.simple_tag(takes_context=True)
+def stylesheet(context, path: str):
+    """
+    Usage:
+      {% stylesheet 'core/css/output.css' %}
+
+    With critical CSS built and enabled: inlines it and loads `path` without
+    blocking render (preload + onload swap, <noscript> fallback).
+    Otherwise: a plain render-blocking <link rel="stylesheet">.
+    Also marks the request for the ASSET_PRELOADS Link header (PreloadLinkMiddleware).
+    """
+    request = context.get("request")
+    if request is not None:
+        setattr(request, PRELOAD_MARK, True)
+    href = _asset_url(path)
+    css = critical_css()
+    if not css:
+        return format_html('<link rel="stylesheet" href="{}">', href)
+    return format_html(
+        '<style id="critical-css">{}</style>\n'
+        '<link rel="preload" as="style" href="{}" '
+        "onload=\"this.onload=null;this.rel='stylesheet'\">\n"
+        '<noscript><link rel="stylesheet" href="{}"></noscript>',
+        mark_safe(css.replace("</", "<\\/")),
+        href,
+        href,
+    )
@@ -0,0 +1,66 @@
+# src/core/tests/test_component_timing.py
+#
+# Purpose: cotton component renders are timed per request (calls, total, self time)
+# and reported via Server-Timing, request.component_timings and the DEBUG panel.
+
+from django.template import engines
+import pytest
+
+from core.component_timing import install, record, stop
+
+
+@pytest.mark.django_db
+def test_request_reports_component_timings(client):
+    """
+    GIVEN a page built from cotton components (login: card, button, theme toggle)
+    WHEN  it is requested
+    THEN  per-component stats land on the request and in the Server-Timing header
+    """
+    resp = client.get("/users/login/")
+
+    timings = resp.wsgi_request.component_timings
+    assert timings.stats["button"].calls >= 1
+    assert resp["Server-Timing"].startswith("cotton;dur=")
+    assert "c-button;dur=" in resp["Server-Timing"]
+
+
+def test_nested_components_split_self_and_total_time():
+    """
+    GIVEN a card containing two buttons
+    WHEN  it renders while recording
+    THEN  calls are counted and the card's self time excludes the buttons
+    """
+    install()
+    template = engines["django"].from_string(
+        "{% c card %}{% c button %}a{% endc %}{% c button %}b{% endc %}{% endc %}"
+    )
+    timings, token = record()
+    try:
+        template.render({})
+    finally:
+        stop(token)
+
+    card, button = timings.stats["card"], timings.stats["button"]
+    assert (card.calls, button.calls) == (1, 2)
+    assert card.self_time == pytest.approx(card.total - button.total, abs=1e-6)
+    assert timings.self_total_ms == pytest.approx(
+        (card.total - button.total + button.total) * 1000, abs=0.01
+    )
+
+
+@pytest.mark.django_db
+def test_panel_and_disabling(client, settings):
+    """
+    GIVEN the panel enabled (then COMPONENT_TIMING off, with reloaded middleware)
+    WHEN  a page is requested
+    THEN  the panel is injected before </body> (then nothing is recorded)
+    """
+    settings.COMPONENT_TIMING_PANEL = True
+    html = client.get("/users/login/").content.decode()
+    assert html.index('id="component-timing-panel"') < html.rindex("</body>")
+    assert "&lt;c-button&gt;" in html
+
+    settings.COMPONENT_TIMING = False
+    client.handler.load_middleware()
+    resp = client.get("/users/login/")
+    assert "Server-Timing" not in resp
@@ -0,0 +1,136 @@
+# src/core/tests/test_conditional.py
+#
+# Purpose: public pages answer repeat anonymous visits with 304 (validators derived
+# from templates + STATIC_VERSION), and responses are brotli/gzip compressed.
+
+import gzip
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory
+from django.urls import reverse
+import pytest
+
+from core import compression
+from core.compression import choose_encoding, CompressionMiddleware
+
+
+@pytest.mark.django_db
+def test_anonymous_repeat_visit_gets_304(client):
+    """
+    GIVEN an anonymous visitor who already has the landing page
+    WHEN  they revalidate with its ETag (or Last-Modified)
+    THEN  they get a 304 with the same validators and no body
+    """
+    first = client.get(reverse("core:landing"))
+    assert first.status_code == 200
+    etag, last_modified = first["ETag"], first["Last-Modified"]
+    assert "no-cache" in first["Cache-Control"] and "private" in first["Cache-Control"]
+
+    by_etag = client.get(reverse("core:landing"), HTTP_IF_NONE_MATCH=etag)
+    by_date = client.get(reverse("core:landing"), HTTP_IF_MODIFIED_SINCE=last_modified)
+
+    assert by_etag.status_code == by_date.status_code == 304
+    assert by_etag.content == b""
+    assert by_etag["ETag"] == etag
+
+
+@pytest.mark.django_db
+def test_304_skips_view_so_flash_messages_do_not_leak(client):
+    """
+    GIVEN the about page (its view adds flash messages)
+    WHEN  a revalidation is answered with 304
+    THEN  the view never ran, so no messages cookie is stored for the next page
+    """
+    etag = client.get(reverse("core:about"))["ETag"]
+
+    resp = client.get(reverse("core:about"), HTTP_IF_NONE_MATCH=etag)
+
+    assert resp.status_code == 304
+    assert "messages" not in resp.cookies
+
+
+@pytest.mark.django_db
+def test_signed_in_and_changed_deploys_are_not_revalidated(client, settings, django_user_model):
+    """
+    GIVEN a stored ETag
+    WHEN  the visitor has signed in, or STATIC_VERSION changed
+    THEN  the page is rendered again (no validators for sessions, a new ETag after deploy)
+    """
+    etag = client.get(reverse("core:landing"))["ETag"]
+
+    settings.STATIC_VERSION = "next-deploy"
+    redeployed = client.get(reverse("core:landing"), HTTP_IF_NONE_MATCH=etag)
+    assert redeployed.status_code == 200 and redeployed["ETag"] != etag
+
+    client.force_login(django_user_model.objects.create_user(email="a@ex.com", password="x"))
+    signed_in = client.get(reverse("core:landing"), HTTP_IF_NONE_MATCH=redeployed["ETag"])
+    assert signed_in.status_code == 200
+    assert "ETag" not in signed_in
+
+
+def _compress(response, accept):
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept)
+    return CompressionMiddleware(lambda r: response)(request)
+
+
+def test_compression_prefers_brotli_then_gzip(monkeypatch):
+    """
+    GIVEN a large HTML response with a strong ETag
+    WHEN  the client accepts br and gzip (or only gzip, or neither)
+    THEN  brotli is used when available, else gzip; the ETag is weakened; Vary is set
+    """
+    html = "<p>hello</p>" * 200
+    if compression.brotli is not None:
+        resp = _compress(HttpResponse(html, headers={"ETag": '"abc"'}), "gzip, deflate, br")
+        assert resp["Content-Encoding"] == "br"
+        assert compression.brotli.decompress(resp.content).decode() == html
+        assert resp["ETag"] == 'W/"abc"'
+
+    monkeypatch.setattr(compression, "brotli", None)
+    resp = _compress(HttpResponse(html), "gzip, deflate, br")
+    assert resp["Content-Encoding"] == "gzip"
+    assert gzip.decompress(resp.content).decode() == html
+    assert "Accept-Encoding" in resp["Vary"]
+
+    assert not _compress(HttpResponse(html), "identity").has_header("Content-Encoding")
+    assert choose_encoding("gzip;q=0, br;q=0") is None
+
+
+def test_responses_with_cookies_or_csrf_tokens_are_only_gzipped(monkeypatch):
+    """
+    GIVEN brotli available and a client accepting br and gzip
+    WHEN  the response sets a cookie, or the page rendered a CSRF token
+    THEN  it is gzipped (random padding against BREACH) rather than brotli-compressed
+    """
+    monkeypatch.setattr(compression, "brotli", object())  # never called below
+    html = "<p>hello</p>" * 200
+
+    with_cookie = HttpResponse(html)
+    with_cookie.set_cookie("sessionid", "secret")
+    assert _compress(with_cookie, "gzip, br")["Content-Encoding"] == "gzip"
+
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, br")
+    get_token(request)
+    resp = CompressionMiddleware(lambda r: HttpResponse(html))(request)
+    assert resp["Content-Encoding"] == "gzip"
+
+
+def test_compression_skips_small_streaming_and_binary():
+    """
+    GIVEN short, streaming, already-encoded and image responses
+    WHEN  they pass through the middleware
+    THEN  none of them is compressed
+    """
+    big = b"x" * 5000
+    responses = [
+        HttpResponse("tiny"),
+        StreamingHttpResponse(iter([big])),
+        HttpResponse(big, headers={"Content-Encoding": "gzip"}),
+        HttpResponse(big, content_type="image/png"),
+    ]
+    for response in responses:
+        encoding = response.get("Content-Encoding")
+        result = _compress(response, "gzip, br")
+        assert result is response
+        assert result.get("Content-Encoding") == encoding
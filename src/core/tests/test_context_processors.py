@@ -0,0 +1,43 @@
+# src/core/tests/test_context_processors.py
+#
+# Purpose: the merged `site` processor exposes the same variables as the five
+# processors it replaces, and its cached settings follow @override_settings.
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.test import override_settings, RequestFactory
+
+from core.context_processors import site
+
+
+def _request():
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    return request
+
+
+def test_site_provides_request_auth_messages_and_settings():
+    request = _request()
+    ctx = site(request)
+
+    assert ctx["request"] is request
+    assert ctx["user"] is request.user
+    assert {"perms", "messages", "DEFAULT_MESSAGE_LEVELS"} <= set(ctx)
+    assert {"ENV", "DEBUG_FLAG", "STATIC_VERSION", "SITE_NAME", "SITE_ORIGIN"} <= set(ctx)
+    assert "DEBUG" not in ctx
+
+
+def test_settings_context_is_rebuilt_on_setting_changed():
+    site(_request())  # build the cache
+
+    with override_settings(SITE_NAME="Fork Name", STATIC_VERSION="v-test"):
+        ctx = site(_request())
+        assert ctx["SITE_NAME"] == "Fork Name"
+        assert ctx["STATIC_VERSION"] == "v-test"
+
+    assert site(_request())["SITE_NAME"] != "Fork Name"
+
+
+def test_bench_context_command_runs(capsys):
+    call_command("bench_context", "-n", "2")
+    assert "saving per render" in capsys.readouterr().out
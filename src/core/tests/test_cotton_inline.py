@@ -0,0 +1,81 @@
+# src/core/tests/test_cotton_inline.py
+#
+# Purpose: the template loader pre-renders cotton components used with literal
+# attributes only, leaves dynamic uses alone, and pages render the same either way.
+
+import re
+
+from django.template import engines
+
+from core.management.commands.bench_cotton_inline import _backend, COTTON_LOADER, INLINE_LOADER
+from core.template_loaders import inline_static_components
+
+
+def _engine():
+    return engines["django"].engine
+
+
+def _squash(html: str) -> str:
+    html = re.sub(r"(icon-[\w-]+?-)[0-9a-f]{6}\b", r"\1x", html)  # per-render icon ids
+    return re.sub(r"\s+", " ", html).strip()
+
+
+def test_literal_use_is_prerendered():
+    """
+    GIVEN a badge and a card title with literal attributes and a plain-text body
+    WHEN  the compiled source is post-processed
+    THEN  both are replaced by their HTML and no component tag is left
+    """
+    source = (
+        '{% c badge variant="outline" class="ml-2" %}New{% endc %}'
+        "{% c card/title %}Hello <b>there</b>{% endc %}"
+    )
+
+    inlined = inline_static_components(source, _engine())
+
+    assert "{% c" not in inlined
+    assert 'class="' in inlined and "ml-2" in inlined and "text-foreground" in inlined
+    assert "Hello <b>there</b>" in inlined
+
+
+def test_dynamic_and_unlisted_uses_are_left_alone():
+    """
+    GIVEN a dynamic attribute, a variable in the body and a component not allowlisted
+    WHEN  the compiled source is post-processed
+    THEN  it is unchanged
+    """
+    source = (
+        '{% c badge :variant="kind" %}New{% endc %}'
+        "{% c card/title %}{{ title }}{% endc %}"
+        '{% c button variant="outline" %}Go{% endc %}'
+    )
+
+    assert inline_static_components(source, _engine()) == source
+
+
+def test_nested_static_components_collapse():
+    """
+    GIVEN a card whose header holds only a static title
+    WHEN  the compiled source is post-processed
+    THEN  the whole card becomes plain HTML
+    """
+    source = "{% c card %}{% c card/header %}{% c card/title %}Hi{% endc %}{% endc %}{% endc %}"
+
+    inlined = inline_static_components(source, _engine())
+
+    assert "{%" not in inlined
+    assert _squash(inlined).count("<div") == 2 and "<h3" in inlined
+
+
+def test_about_page_renders_identically():
+    """
+    GIVEN about.html loaded with cotton's own loader and with the inlining loader
+    WHEN  both render
+    THEN  fewer component tags remain and the HTML is the same (up to whitespace)
+    """
+    runtime = _backend("test-runtime", COTTON_LOADER).get_template("core/pages/about.html")
+    inlined = _backend("test-inlined", INLINE_LOADER).get_template("core/pages/about.html")
+    context = {"SITE_NAME": "LangCen Base"}
+
+    assert inlined.template.source.count("{% c ") < runtime.template.source.count("{% c ")
+    assert _squash(inlined.render(context)) == _squash(runtime.render(context))
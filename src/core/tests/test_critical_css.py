@@ -0,0 +1,111 @@
+# src/core/tests/test_critical_css.py
+#
+# Purpose: build_critical_css keeps only the rules above-the-fold markup can use;
+# head.html inlines them and loads the full stylesheet without blocking; HTML pages
+# carry preload Link headers for the shared asset URLs.
+
+from django.template import engines
+from django.urls import reverse
+import pytest
+
+from core import assets
+from core.assets import asset_url
+from core.critical_css import critical_tokens, extract, selector_classes
+
+CSS = (
+    "/*! tailwindcss */@layer theme,base,utilities;"
+    "@layer base{*,:after{box-sizing:border-box}html{line-height:1.5}}"
+    "@layer utilities{.fixed{position:fixed}.table-cell{display:table-cell}"
+    ".hover\\:bg-accent{&:hover{@media (hover:hover){background:red}}}"
+    ".animate-spin{animation:spin 1s linear infinite}.a,.b{color:red}}"
+    "@media (min-width:40rem){.sm\\:flex{display:flex}.sm\\:grid{display:grid}}"
+    "@keyframes spin{to{transform:rotate(360deg)}}@keyframes ping{75%{opacity:0}}"
+    ".content-\\[\\'\\}\\'\\]{content:'}'}"
+)
+
+
+def test_extract_keeps_only_used_rules():
+    """
+    GIVEN a Tailwind-style stylesheet and a set of used class tokens
+    WHEN  critical CSS is extracted
+    THEN  preflight, used utilities (nested variants, media queries, their keyframes)
+          stay; unused rules, selectors and keyframes go
+    """
+    tokens = {"fixed", "hover:bg-accent", "sm:flex", "animate-spin", "b"}
+
+    critical = extract(CSS, tokens)
+
+    assert critical == (
+        "@layer theme,base,utilities;"
+        "@layer base{*,:after{box-sizing:border-box}html{line-height:1.5}}"
+        "@layer utilities{.fixed{position:fixed}"
+        ".hover\\:bg-accent{&:hover{@media (hover:hover){background:red}}}"
+        ".animate-spin{animation:spin 1s linear infinite}.b{color:red}}"
+        "@media (min-width:40rem){.sm\\:flex{display:flex}}"
+        "@keyframes spin{to{transform:rotate(360deg)}}"
+    )
+
+
+def test_selector_classes_unescape():
+    assert selector_classes(r".md\:flex:hover>.w-1\/2 .\32 xl\:p-4") == {
+        "md:flex",
+        "w-1/2",
+        "2xl:p-4",
+    }
+
+
+def test_tokens_cover_navbar_includes_and_icons(settings):
+    """
+    GIVEN the above-the-fold templates
+    WHEN  critical tokens are collected
+    THEN  classes from the header, navbar, included partials and icon templates appear
+    """
+    tokens = critical_tokens(engines["django"].engine, settings.BASE_DIR)
+
+    assert {"fixed", "backdrop-blur", "nav-link", "dark"} <= tokens
+
+
+def test_stylesheet_tag_inlines_critical_css(settings, tmp_path, monkeypatch):
+    """
+    GIVEN a built critical.css and CRITICAL_CSS on (or off)
+    WHEN  a page head is rendered
+    THEN  the CSS is inlined and output.css preloaded (or linked normally)
+    """
+    built = tmp_path / "critical.css"
+    built.write_text(".fixed{position:fixed}")
+    monkeypatch.setattr(assets, "find_static", lambda path: built)
+    template = engines["django"].from_string(
+        "{% load assets %}{% stylesheet 'core/css/output.css' %}"
+    )
+    href = asset_url("core/css/output.css")
+
+    settings.CRITICAL_CSS = True
+    html = template.render({})
+    assert '<style id="critical-css">.fixed{position:fixed}</style>' in html
+    assert f'<link rel="preload" as="style" href="{href}"' in html
+    assert f'<noscript><link rel="stylesheet" href="{href}"></noscript>' in html
+
+    settings.CRITICAL_CSS = False
+    assert template.render({}) == f'<link rel="stylesheet" href="{href}">'
+
+
+@pytest.mark.django_db
+def test_html_pages_send_preload_links(client, settings, admin_user):
+    """
+    GIVEN ASSET_PRELOADS
+    WHEN  a site page (but not a JSON probe or an admin page) is requested
+    THEN  a Link preload header lists the same versioned URLs the page uses
+    """
+    settings.ASSET_PRELOADS = [("core/css/output.css", "style"), ("core/js/main.js", "script")]
+
+    resp = client.get("/")
+
+    css, js = asset_url("core/css/output.css"), asset_url("core/js/main.js")
+    assert resp["Link"] == f"<{css}>; rel=preload; as=style, <{js}>; rel=preload; as=script"
+    assert js in resp.content.decode()
+    assert "Link" not in client.get("/healthz")
+
+    client.force_login(admin_user)
+    admin = client.get(reverse("admin:index"))
+    assert admin.status_code == 200
+    assert "Link" not in admin
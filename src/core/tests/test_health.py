@@ -0,0 +1,65 @@
+# src/core/tests/test_health.py
+#
+# Purpose: /healthz answers without DB/session; /readyz reports each dependency
+# check and reuses cached results between probes.
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from core import health
+
+
+@pytest.fixture(autouse=True)
+def _fresh_health_cache():
+    health.clear_cache()
+    yield
+    health.clear_cache()
+
+
+@pytest.mark.django_db
+def test_healthz_is_cheap(client):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get("/healthz")
+
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
+    assert len(ctx.captured_queries) == 0
+    assert "sessionid" not in resp.cookies
+
+
+@pytest.mark.django_db
+def test_readyz_reports_checks_and_caches_them(client):
+    resp = client.get(reverse("core:readyz"))
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["status"] == "ok"
+    assert body["checks"] == dict.fromkeys(("database", "migrations", "email", "templates"), "ok")
+
+    # second probe within the TTL reuses every cached result
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(reverse("core:readyz"))
+    assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+def test_readyz_fails_with_503_without_leaking_details(client, monkeypatch, caplog):
+    """
+    GIVEN a check failing with an error that names a host and a password
+    WHEN  /readyz is probed
+    THEN  it answers 503 with only "fail" for that check; the detail goes to the log
+    """
+
+    def broken():
+        raise RuntimeError("could not connect to db.internal as app:s3cret")
+
+    monkeypatch.setitem(health.CHECKS, "database", broken)
+
+    resp = client.get(reverse("core:readyz"))
+
+    assert resp.status_code == 503
+    assert resp.json()["checks"]["database"] == "fail"
+    assert "s3cret" not in resp.content.decode()
+    assert any(getattr(r, "error", "").endswith("app:s3cret") for r in caplog.records)
@@ -0,0 +1,108 @@
+# src/core/tests/test_logs.py
+#
+# Purpose: JSON log lines keep `extra=` fields, chatty loggers are sampled, and the
+# queue handler hands structured records to the background listener (also after
+# a fork, on a fresh queue).
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+from core import logs
+from core.logs import JsonFormatter, SampleFilter, StructuredQueueHandler
+
+
+def _record(name="users.seed.rows", level=logging.INFO, msg="row %s", args=(1,), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extras_and_traceback():
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        record = logging.LogRecord(
+            "users.email", logging.ERROR, __file__, 1, "x", (), sys.exc_info()
+        )
+    record.user_id = 7
+
+    line = json.loads(JsonFormatter().format(record))
+
+    assert line["level"] == "ERROR"
+    assert line["logger"] == "users.email"
+    assert line["user_id"] == 7
+    assert "ValueError: bad" in line["exc"]
+
+
+def test_sample_filter_keeps_one_in_n_but_all_warnings():
+    sample = SampleFilter(rates={"users.seed.rows": 10, "users": 1})
+
+    kept = [sample.filter(_record()) for _ in range(100)]
+    warning = sample.filter(_record(level=logging.WARNING))
+    other = sample.filter(_record(name="users.email"))
+
+    assert sum(kept) == 10
+    assert warning and other
+
+
+def test_queue_handler_delivers_structured_records_to_listener():
+    """
+    GIVEN a StructuredQueueHandler drained by a QueueListener
+    WHEN  a record with args, extras and exc_info is logged
+    THEN  the listener side gets an interpolated message, the extras and the traceback text
+    """
+    q = queue.SimpleQueue()
+    sink = logging.handlers.BufferingHandler(capacity=100)
+    listener = logging.handlers.QueueListener(q, sink)
+    handler = StructuredQueueHandler(q)
+    logger = logging.getLogger("core.tests.logs")
+    logger.addHandler(handler)
+    logger.propagate = False
+    listener.start()
+    try:
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("failed for %s", "alice", extra={"row": 3})
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+        logger.propagate = True
+
+    (record,) = sink.buffer
+    assert record.getMessage() == "failed for alice"
+    assert record.row == 3
+    assert "ZeroDivisionError" in record.exc_text
+    assert json.loads(JsonFormatter().format(record))["row"] == 3
+
+
+def test_forked_child_gets_a_fresh_queue():
+    """
+    GIVEN a queue handler whose inherited queue may be locked by the parent's thread
+    WHEN  the after-fork hook renews it
+    THEN  handler and listener share a new queue and records still get through
+    """
+    inherited = queue.Queue()
+    sink = logging.handlers.BufferingHandler(capacity=100)
+    handler = StructuredQueueHandler(inherited)
+    handler.listener = logging.handlers.QueueListener(inherited, sink)
+    inherited.mutex.acquire()  # as if the parent's listener held it at fork time
+    try:
+        logs._fresh_queue(handler)
+        assert handler.queue is handler.listener.queue is not inherited
+
+        handler.listener.start()
+        handler.handle(_record(msg="after fork", args=()))
+        handler.listener.stop()
+    finally:
+        inherited.mutex.release()
+
+    assert [r.getMessage() for r in sink.buffer] == ["after fork"]
+
+
+def test_settings_route_root_logger_through_queue():
+    handlers = logging.getLogger().handlers
+    assert any(isinstance(h, StructuredQueueHandler) for h in handlers)
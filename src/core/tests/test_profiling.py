@@ -0,0 +1,147 @@
+# src/core/tests/test_profiling.py
+#
+# Purpose: ?_profile=<token> profiles a request only for the staff user the token
+# was signed for; results are saved to PROFILER_DIR and listed in the admin.
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient
+from django.urls import reverse
+import pytest
+
+from core import profiling
+
+User = get_user_model()
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    settings.PROFILER_DIR = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def staff(db):
+    return User.objects.create_user(email="staff@ex.com", password="x", is_staff=True)
+
+
+@pytest.mark.django_db
+def test_untriggered_request_saves_nothing(client, staff, profile_dir):
+    """
+    GIVEN a logged-in staff user
+    WHEN  they request a page without a profiling token
+    THEN  nothing is profiled
+    """
+    client.force_login(staff)
+    resp = client.get("/")
+    assert resp.status_code == 200
+    assert "X-Profile-Id" not in resp
+    assert list(profile_dir.iterdir()) == []
+
+
+@pytest.mark.django_db
+def test_valid_token_saves_profile(client, staff, profile_dir):
+    """
+    GIVEN a staff user with a token signed for them
+    WHEN  they request a page with ?_profile=<token>
+    THEN  pstats, text, collapsed-stack and meta files are written and named in X-Profile-Id
+    """
+    client.force_login(staff)
+    resp = client.get("/", {profiling.QUERY_PARAM: profiling.make_token(staff)})
+
+    profile_id = resp["X-Profile-Id"]
+    for kind in profiling.FILE_KINDS:
+        assert (profile_dir / f"{profile_id}.{kind}").is_file()
+    (meta,) = profiling.list_profiles()
+    assert meta["path"] == "/" and meta["status"] == 200
+    assert meta["user"] == "staff@ex.com"
+
+
+@pytest.mark.django_db
+def test_token_is_bound_to_staff_user(client, staff, profile_dir):
+    """
+    GIVEN a token signed for one staff user
+    WHEN  another user (non-staff, or staff) sends it, or a forged token is sent
+    THEN  the request is served normally without profiling
+    """
+    token = profiling.make_token(staff)
+    other_staff = User.objects.create_user(email="b@ex.com", password="x", is_staff=True)
+    student = User.objects.create_user(email="s@ex.com", password="x")
+
+    for user, sent in ((student, token), (other_staff, token), (staff, token + "x")):
+        client.force_login(user)
+        resp = client.get("/", HTTP_X_PROFILE=sent)
+        assert resp.status_code == 200
+        assert "X-Profile-Id" not in resp
+    assert list(profile_dir.iterdir()) == []
+
+
+@pytest.mark.django_db
+def test_admin_lists_and_serves_profiles(client, staff, profile_dir):
+    """
+    GIVEN one saved profile
+    WHEN  staff open the admin profiles page and download the .prof file
+    THEN  the profile is listed and the download works; bad ids 404
+    """
+    client.force_login(staff)
+    profile_id = client.get("/", HTTP_X_PROFILE=profiling.make_token(staff))["X-Profile-Id"]
+
+    index = client.get(reverse("profiles:index"))
+    assert index.status_code == 200
+    assert reverse("profiles:detail", args=[profile_id]) in index.content.decode()
+    assert client.get(reverse("profiles:detail", args=[profile_id])).status_code == 200
+    download = client.get(reverse("profiles:download", args=[profile_id, "prof"]))
+    assert download.status_code == 200
+    assert client.get(reverse("profiles:download", args=[profile_id, "py"])).status_code == 404
+
+    link = client.post(reverse("profiles:index"), {"path": "about/"}).context["link"]
+    assert link.startswith(f"/about/?{profiling.QUERY_PARAM}=")
+
+
+@pytest.mark.django_db
+def test_request_while_profiler_busy_is_served_unprofiled(client, staff, profile_dir):
+    """
+    GIVEN a profile already running in this process
+    WHEN  another request carries a valid token
+    THEN  it is served normally, marked as skipped, and nothing is saved
+    """
+    client.force_login(staff)
+
+    with profiling.RequestProfile() as running:
+        assert running.active
+        resp = client.get("/", HTTP_X_PROFILE=profiling.make_token(staff))
+
+    assert resp.status_code == 200
+    assert resp["X-Profile-Skipped"] == "busy"
+    assert "X-Profile-Id" not in resp
+    assert list(profile_dir.iterdir()) == []
+
+
+@pytest.mark.django_db
+def test_link_validity_follows_token_max_age(client, staff, settings):
+    settings.PROFILER_TOKEN_MAX_AGE = 15 * 60
+    client.force_login(staff)
+
+    resp = client.post(reverse("profiles:index"), {"path": "/"})
+
+    assert resp.context["valid_for"].replace("\xa0", " ") == "15 minutes"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_view_is_profiled_under_asgi(staff, profile_dir):
+    """
+    GIVEN a staff user on the ASGI handler and an async view that never touches request.user
+    WHEN  they request it with a valid token
+    THEN  the profile is saved with their email, without sync ORM access on the event loop
+    """
+    aclient = AsyncClient()
+    aclient.force_login(staff)
+
+    resp = async_to_sync(aclient.get)(
+        reverse("core:healthz"), headers={"X-Profile": profiling.make_token(staff)}
+    )
+
+    assert resp.status_code == 200
+    meta = profiling.list_profiles()[0]
+    assert meta["id"] == resp["X-Profile-Id"]
+    assert meta["user"] == staff.email
@@ -0,0 +1,54 @@
+# src/core/tests/test_startup.py
+#
+# Purpose: startup_report measures a fresh interpreter, and the "public" worker
+# profile boots without any admin-side packages.
+
+import json
+
+from django.core.management import call_command
+
+from core.startup import package_of, parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       150 |        150 |     _io
+import time:      1200 |       1200 |   django.utils.functional
+import time:      3000 |       4200 | django.contrib.admin.sites
+import time:       500 |        500 | unfold.forms
+import time:       250 |        250 | unfold
+"""
+
+
+def test_parse_importtime_groups_by_package():
+    """
+    GIVEN `python -X importtime` output
+    WHEN  it is parsed
+    THEN  self times (ms) are summed per package, django split by subpackage
+    """
+    totals = parse_importtime(IMPORTTIME)
+    assert totals == {
+        "(stdlib)": 0.15,
+        "django.utils": 1.2,
+        "django.contrib.admin": 3.0,
+        "unfold": 0.75,
+    }
+    assert package_of("json.decoder") == "(stdlib)"
+
+
+def test_public_profile_skips_admin_packages(capsys):
+    """
+    GIVEN WORKER_PROFILE=public
+    WHEN  startup_report boots it in a fresh process
+    THEN  no admin-side module is imported and no admin app is installed
+    """
+    call_command("startup_report", "--profile", "public", "--repeat", "1", "--json")
+    report = json.loads(capsys.readouterr().out)["public"]
+
+    assert report["profile"] == "public"
+    assert report["admin_modules"] == []
+    names = {app["name"] for app in report["apps"]}
+    assert {"users", "core"} <= names
+    assert not any(
+        name.startswith(("unfold", "import_export", "django.contrib.admin")) for name in names
+    )
+    assert report["phases"]["total"] > 0
@@ -0,0 +1,82 @@
+# src/core/tests/test_warmup.py
+#
+# Purpose: warmup() compiles project templates into the cached loader, reverses
+# every named URL and reports each step without ever raising.
+
+import asyncio
+
+from django.template import engines
+import pytest
+
+from core import warmup as warmup_mod
+from core.warmup import project_template_names, warmup
+
+
+@pytest.mark.django_db
+def test_warmup_runs_every_step():
+    """
+    GIVEN a configured project
+    WHEN  warmup() runs
+    THEN  every step succeeds and reports its time and detail
+    """
+    results = warmup(keep_connections=True)  # inside the test transaction
+
+    assert list(results) == list(warmup_mod.STEPS)
+    assert all(r["ok"] for r in results.values()), results
+    count, label = results["urls"]["detail"].split(" ", 1)
+    assert label == "named urls" and int(count) > 0
+    assert all(r["ms"] >= 0 for r in results.values())
+
+
+def test_template_names_cover_pages_partials_and_components():
+    """
+    GIVEN the Django template engine
+    WHEN  project templates are listed
+    THEN  pages, icons, cotton components and app templates are included, third-party ones not
+    """
+    names = project_template_names(engines["django"].engine)
+
+    for name in (
+        "core/base.html",
+        "core/icons/menu.html",
+        "cotton/button/index.html",
+        "users/registration/login.html",
+    ):
+        assert name in names
+    assert not any(name.startswith(("admin/", "unfold/")) for name in names)
+
+
+def test_failing_step_is_reported_not_raised(monkeypatch):
+    """
+    GIVEN a warmup step that raises
+    WHEN  warmup() runs it
+    THEN  it is reported as failed and warmup returns normally
+    """
+
+    def boom():
+        raise RuntimeError("down")
+
+    monkeypatch.setitem(warmup_mod.STEPS, "database", boom)
+
+    results = warmup(["database"], keep_connections=True)
+
+    assert results["database"]["ok"] is False
+    assert results["database"]["detail"] == "RuntimeError: down"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_boot_warmup_inside_event_loop(settings):
+    """
+    GIVEN WARMUP_ON_BOOT and a running event loop (an ASGI server importing the app)
+    WHEN  warmup_on_boot() runs
+    THEN  the steps run off the loop and succeed, and nothing raises
+    """
+    settings.WARMUP_ON_BOOT = True
+
+    async def boot():
+        return warmup_mod.warmup_on_boot()
+
+    results = asyncio.run(boot())
+
+    assert list(results) == list(warmup_mod.STEPS)
+    assert all(r["ok"] for r in results.values()), results
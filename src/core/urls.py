@@ -8,4 +8,7 @@ app_name = "core"
 urlpatterns = [
     path("", views.landing_page, name="landing"),
     path("about/", views.about_page, name="about"),
+    # probes: no trailing slash so APPEND_SLASH never answers with a redirect
+    path("healthz", views.healthz, name="healthz"),
+    path("readyz", views.readyz, name="readyz"),
 ]
@@ -1,13 +1,20 @@
 # src/core/views.py
 from django.contrib import messages
-from django.shortcuts import render
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
 
+from .conditional import public_page
+from .health import run_checks
+from .shortcuts import arender
 
-def landing_page(request):
-    return render(request, "core/pages/index.html")
 
+@public_page
+async def landing_page(request):
+    return await arender(request, "core/pages/index.html")
 
-def about_page(request):
+
+@public_page
+async def about_page(request):
     messages.info(request, "Heads up: this is an informational message.")
     messages.success(request, "Nice! Your profile was saved successfully.")
     messages.warning(request, "Careful: this action might have side effects.")
@@ -28,4 +35,26 @@ def about_page(request):
         "light_mode",
     ]
 
-    return render(request, "core/pages/about.html", {"icon_list": icon_list})
+    return await arender(request, "core/pages/about.html", {"icon_list": icon_list})
+
+
+# --------------------------
+# Load-balancer probes (no templates; /healthz also skips DB and session)
+# --------------------------
+@never_cache
+async def healthz(request):
+    return JsonResponse({"status": "ok"})
+
+
+@never_cache
+def readyz(request):
+    checks = run_checks()
+    ok = all(c["ok"] for c in checks.values())
+    return JsonResponse(
+        {
+            "status": "ok" if ok else "error",
+            # details stay in the log (core.health): they can name hosts or users
+            "checks": {name: "ok" if c["ok"] else "fail" for name, c in checks.items()},
+        },
+        status=200 if ok else 503,
+    )
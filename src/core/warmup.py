@@ -0,0 +1,219 @@
+# src/core/warmup.py
+#
+# Worker warmup: do the lazy first-request work at boot instead.
+# - templates: compile every project template (pages, partials, icons, cotton
+#   components) into the cached loader.
+# - urls: reverse and resolve every named URL in WARMUP_URL_NAMESPACES.
+# - password_validators: build AUTH_PASSWORD_VALIDATORS (loads the common-passwords list).
+# - database: open (and by default close again) every DB connection.
+# - caches: connect each CACHES alias; fill the ContentType, permission and
+#   template-settings caches.
+#
+# Entry points:
+# - config/wsgi.py and config/asgi.py call warmup_on_boot() right after setup
+#   (WARMUP_ON_BOOT). With `gunicorn --preload` that runs once in the master and
+#   every forked worker inherits the warm state. An ASGI server imports the app
+#   inside its event loop, where the ORM refuses to run, so there warmup runs in a
+#   worker thread (joined before the import returns).
+# - a server hook, e.g. gunicorn.conf.py:
+#     def post_fork(server, worker):
+#         from core.warmup import warmup
+#         warmup(keep_connections=True)
+# - `python src/manage.py warmup` prints the per-step timings.
+#
+# Not done from AppConfig.ready(): other apps may not be ready yet, and Django
+# warns about database queries during app initialisation.
+
+import asyncio
+import logging
+from pathlib import Path
+import threading
+import time
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+
+log = logging.getLogger("core.warmup")
+
+WARMUP_URL_NAMESPACES = ("core", "users")
+TEMPLATE_SUFFIXES = (".html", ".txt")
+
+
+# --- Steps --------------------------------------------------------------------
+def _django_engines():
+    from django.template import engines
+    from django.template.backends.django import DjangoTemplates
+
+    return [backend.engine for backend in engines.all() if isinstance(backend, DjangoTemplates)]
+
+
+def project_templates(engine) -> dict[str, Path]:
+    """{template name: file} under the engine's DIRS and the template dirs of local apps."""
+    base = Path(settings.BASE_DIR)
+    dirs = [Path(d) for d in engine.dirs]
+    dirs += [
+        Path(app.path) / "templates"
+        for app in apps.get_app_configs()
+        if Path(app.path).is_relative_to(base)
+    ]
+    names = {}
+    for root in dirs:
+        if not root.is_dir():
+            continue
+        for path in root.rglob("*"):
+            if path.suffix in TEMPLATE_SUFFIXES and path.is_file():
+                names.setdefault(path.relative_to(root).as_posix(), path)
+    return names
+
+
+def project_template_names(engine) -> list[str]:
+    return sorted(project_templates(engine))
+
+
+def warm_templates() -> str:
+    from django.template import TemplateSyntaxError
+
+    compiled = failed = 0
+    for engine in _django_engines():
+        for name in project_template_names(engine):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as exc:
+                failed += 1
+                log.warning(
+                    "template failed to compile", extra={"template": name, "error": str(exc)}
+                )
+            else:
+                compiled += 1
+    return f"{compiled} compiled" + (f", {failed} failed" if failed else "")
+
+
+def _sample_kwargs(converters: dict) -> dict:
+    from django.urls.converters import IntConverter, UUIDConverter
+
+    kwargs = {}
+    for name, converter in converters.items():
+        if isinstance(converter, IntConverter):
+            kwargs[name] = 0
+        elif isinstance(converter, UUIDConverter):
+            kwargs[name] = uuid.UUID(int=0)
+        else:
+            kwargs[name] = "x"
+    return kwargs
+
+
+def warm_urls() -> str:
+    from django.urls import get_resolver, NoReverseMatch, resolve, reverse
+
+    resolver = get_resolver()
+    done = 0
+    for namespace in WARMUP_URL_NAMESPACES:
+        if namespace not in resolver.namespace_dict:
+            continue
+        ns_resolver = resolver.namespace_dict[namespace][1]
+        for name in [key for key in ns_resolver.reverse_dict if isinstance(key, str)]:
+            for _possibility, _pattern, _defaults, converters in ns_resolver.reverse_dict.getlist(
+                name
+            ):
+                try:
+                    url = reverse(f"{namespace}:{name}", kwargs=_sample_kwargs(converters))
+                except NoReverseMatch:
+                    continue
+                resolve(url)
+                done += 1
+                break
+    return f"{done} named urls"
+
+
+def warm_password_validators() -> str:
+    from django.contrib.auth.password_validation import get_default_password_validators
+
+    return f"{len(get_default_password_validators())} validators"
+
+
+def warm_database() -> str:
+    for alias in connections:
+        connections[alias].ensure_connection()
+    return ", ".join(connections[alias].vendor for alias in connections)
+
+
+def warm_caches() -> str:
+    from django.contrib.contenttypes.models import ContentType
+    from django.core.cache import caches
+
+    from core.context_processors import get_settings_context
+
+    for alias in settings.CACHES:
+        caches[alias].get("core:warmup")  # opens the client / connection pool
+    get_settings_context()
+    ContentType.objects.get_for_models(*apps.get_models())
+    if apps.is_installed("users"):
+        from users import permissions
+
+        permissions.all_permissions()
+    return f"{len(settings.CACHES)} cache aliases"
+
+
+STEPS = {
+    "templates": warm_templates,
+    "urls": warm_urls,
+    "password_validators": warm_password_validators,
+    "database": warm_database,
+    "caches": warm_caches,
+}
+
+
+# --- Runner -------------------------------------------------------------------
+def warmup(steps=None, *, keep_connections: bool = False) -> dict[str, dict]:
+    """
+    Run `steps` (default: all of STEPS) and return {name: {"ok", "ms", "detail"}}.
+    A failing step is logged and reported, never raised: warmup must not stop a
+    worker from booting. DB connections are closed afterwards unless
+    `keep_connections` (a pre-fork master must not hand its sockets to workers).
+    """
+    results = {}
+    started = time.perf_counter()
+    for name in steps or STEPS:
+        start = time.perf_counter()
+        try:
+            ok, detail = True, STEPS[name]()
+        except Exception as exc:
+            ok, detail = False, f"{type(exc).__name__}: {exc}"
+            log.warning("warmup step failed", extra={"step": name, "error": detail})
+        results[name] = {
+            "ok": ok,
+            "ms": round((time.perf_counter() - start) * 1000, 2),
+            "detail": detail,
+        }
+    if not keep_connections:
+        try:
+            connections.close_all()
+        except Exception as exc:
+            log.warning("warmup could not close connections", extra={"error": repr(exc)})
+
+    total_ms = round((time.perf_counter() - started) * 1000, 2)
+    log.info("warmup done", extra={"total_ms": total_ms, "steps": results})
+    return results
+
+
+def warmup_on_boot() -> dict[str, dict] | None:
+    """
+    Called by config/wsgi.py and config/asgi.py; runs only with WARMUP_ON_BOOT.
+    Inside a running event loop the steps run in a worker thread, so the ORM is
+    not called from async context.
+    """
+    if not getattr(settings, "WARMUP_ON_BOOT", False):
+        return None
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return warmup()
+
+    results = {}
+    # warmup() closes the worker thread's connections itself
+    thread = threading.Thread(target=lambda: results.update(warmup()), name="warmup", daemon=True)
+    thread.start()
+    thread.join()
+    return results
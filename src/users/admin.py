@@ -2,6 +2,7 @@
 from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.models import Permission
 from django.urls import NoReverseMatch, reverse
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
@@ -10,19 +11,24 @@ from unfold.admin import ModelAdmin
 from unfold.contrib.import_export.forms import ExportForm, ImportForm
 from unfold.forms import AdminPasswordChangeForm as UnfoldAdminPasswordChangeForm
 
-from .forms import AdminUserAddForm, AdminUserChangeForm
+from .admin_counts import BucketBooleanFilter, BucketChoicesFilter, CountBucketAdminMixin
+from .admin_forms import AdminUserAddForm, AdminUserChangeForm, PermissionMultipleChoiceField
 from .models import User
 from .resources import UserResource
+from .search import search_users
 
 
 @admin.register(User)
-class UserAdmin(ImportExportModelAdmin, BaseUserAdmin, ModelAdmin):
+class UserAdmin(CountBucketAdminMixin, ImportExportModelAdmin, BaseUserAdmin, ModelAdmin):
     """
     Custom User admin:
     - Unfold styling via ModelAdmin
     - CSV Import/Export via django-import-export (with Unfold forms)
     - Styled password change page (Unfold AdminPasswordChangeForm)
     - 'Set password' button on the change page
+    - Changelist totals and filter facet counts read from UserCountBucket
+    - Search runs against the UserSearchToken index (word-prefix matches)
+    - groups / user_permissions use paginated autocomplete widgets
     """
 
     # Unfold-styled forms for add/change
@@ -40,8 +46,27 @@ class UserAdmin(ImportExportModelAdmin, BaseUserAdmin, ModelAdmin):
     # List / search
     ordering = ("email",)
     list_display = ("email", "first_name", "last_name", "role", "is_staff", "is_active")
-    list_filter = ("role", "is_staff", "is_active")
-    search_fields = ("email", "first_name", "last_name")
+    list_filter = (
+        ("role", BucketChoicesFilter),
+        ("is_staff", BucketBooleanFilter),
+        ("is_active", BucketBooleanFilter),
+    )
+    search_fields = ("email", "first_name", "last_name")  # indexed; see get_search_results
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_users(queryset, search_term), False
+
+    # Autocomplete instead of filter_horizontal: the change page only loads the
+    # selected groups/permissions; options come from the paginated endpoint.
+    filter_horizontal = ()
+    autocomplete_fields = ("groups", "user_permissions")
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        if db_field.name == "user_permissions":
+            kwargs.setdefault("form_class", PermissionMultipleChoiceField)
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
 
     # Read-only helpers on the change form
     readonly_fields = ("date_joined", "password_link")
@@ -114,3 +139,32 @@ class UserAdmin(ImportExportModelAdmin, BaseUserAdmin, ModelAdmin):
             },
         ),
     )
+
+
+@admin.register(Permission)
+class PermissionAdmin(ModelAdmin):
+    """
+    Read-only, hidden from the admin index. Exists so the user_permissions
+    autocomplete has a searchable endpoint.
+    """
+
+    search_fields = ("name", "codename", "content_type__app_label", "content_type__model")
+    ordering = ("content_type__app_label", "content_type__model", "codename")
+    list_display = ("name", "codename", "content_type")
+    list_select_related = ("content_type",)
+
+    def get_queryset(self, request):
+        # autocomplete results are labelled with str(permission)
+        return super().get_queryset(request).select_related("content_type")
+
+    def has_module_permission(self, request):
+        return False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,141 @@
+# src/users/admin_counts.py
+#
+# Cheap counts for the User changelist.
+# - Totals and facet counts for role/is_staff/is_active filters come from the
+#   UserCountBucket table (a handful of rows) instead of COUNT(*) scans.
+# - Anything the buckets can't answer (search, other filters) falls back to the
+#   database; on PostgreSQL large results use the planner's row estimate.
+
+import json
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.main import ERROR_FLAG, IGNORED_PARAMS, PAGE_VAR, SEARCH_VAR
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .models import UserCountBucket
+
+BUCKET_FIELDS = ("role", "is_staff", "is_active")
+_TRUE = {"1", "true", "True"}
+_FALSE = {"0", "false", "False"}
+_NON_FILTER_PARAMS = {*IGNORED_PARAMS, PAGE_VAR, ERROR_FLAG}
+
+
+def bucket_constraints(params) -> dict | None:
+    """
+    Turn changelist filter params into {field: allowed values}, or None when any
+    param isn't an exact role/is_staff/is_active lookup (the buckets can't answer it).
+    `params` maps names to lists of values, like QueryDict.lists().
+    """
+    constraints = {}
+    for name, values in params.items():
+        if name in _NON_FILTER_PARAMS:
+            continue
+        field, _, lookup = name.partition("__")
+        if field not in BUCKET_FIELDS or lookup != "exact":
+            return None
+        values = values if isinstance(values, list | tuple) else [values]
+        if field == "role":
+            constraints[field] = set(values)
+        else:
+            if not set(values) <= _TRUE | _FALSE:
+                return None
+            constraints[field] = {v in _TRUE for v in values}
+    return constraints
+
+
+def count_from_buckets(buckets, constraints: dict) -> int:
+    index = {f: i for i, f in enumerate(BUCKET_FIELDS)}
+    return sum(
+        b[3] for b in buckets if all(b[index[f]] in allowed for f, allowed in constraints.items())
+    )
+
+
+def estimate_count(queryset) -> int | None:
+    """Planner row estimate for `queryset` on PostgreSQL; None elsewhere."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator whose count is, in order of preference:
+      1) `known_count` (e.g. from the count buckets),
+      2) the planner estimate, when it exceeds ADMIN_ESTIMATED_COUNT_THRESHOLD,
+      3) a real COUNT(*).
+    """
+
+    def __init__(self, *args, known_count: int | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.known_count = known_count
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            return self.known_count
+        threshold = getattr(settings, "ADMIN_ESTIMATED_COUNT_THRESHOLD", 10_000)
+        if hasattr(self.object_list, "query"):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate > threshold:
+                return estimate
+        return super().count
+
+
+class _BucketFacetsMixin:
+    """Answer facet counts from the buckets when the other active filters allow it."""
+
+    def get_facet_queryset(self, changelist):
+        if changelist.query:
+            return super().get_facet_queryset(changelist)
+        own = set(self.expected_parameters())
+        others = {k: v for k, v in changelist.get_filters_params().items() if k not in own}
+        constraints = bucket_constraints(others)
+        if constraints is None:
+            return super().get_facet_queryset(changelist)
+        buckets = UserCountBucket.objects.snapshot()
+        return {
+            key: count_from_buckets(buckets, {**constraints, self.field_path: {value}})
+            for key, value in self.facet_values()
+        }
+
+
+class BucketChoicesFilter(_BucketFacetsMixin, admin.ChoicesFieldListFilter):
+    def facet_values(self):
+        # same keys as ChoicesFieldListFilter.get_facet_counts()
+        for i, (value, _label) in enumerate(self.field.flatchoices):
+            yield f"{i}__c", value
+
+
+class BucketBooleanFilter(_BucketFacetsMixin, admin.BooleanFieldListFilter):
+    def facet_values(self):
+        yield "true__c", True
+        yield "false__c", False
+
+
+class CountBucketAdminMixin:
+    """
+    ModelAdmin mixin: no separate unfiltered count, and a paginator that takes its
+    total from the buckets when only role/is_staff/is_active filters are active.
+    """
+
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        known = None
+        if not request.GET.get(SEARCH_VAR):
+            constraints = bucket_constraints(dict(request.GET.lists()))
+            if constraints is not None:
+                known = count_from_buckets(UserCountBucket.objects.snapshot(), constraints)
+        return EstimatedCountPaginator(
+            queryset, per_page, orphans, allow_empty_first_page, known_count=known
+        )
@@ -0,0 +1,49 @@
+# src/users/admin_forms.py
+#
+# Admin-only forms (Unfold-styled). Kept apart from users/forms.py so public views
+# don't import Unfold.
+from django import forms
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from unfold.forms import (
+    UserChangeForm as UnfoldUserChangeForm,
+    UserCreationForm as UnfoldUserCreationForm,
+)
+
+User = get_user_model()
+
+
+class AdminUserAddForm(UnfoldUserCreationForm):
+    """Used by Django admin Add User page (gives Unfold-styled password1/2)."""
+
+    class Meta(UnfoldUserCreationForm.Meta):
+        model = User
+        fields = ("email",)  # password1/password2 come from parent form
+
+
+class PermissionMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """
+    Same labels as str(Permission), but the content type comes from ContentType's
+    per-process cache, so selected permissions render without a join or N+1.
+    """
+
+    def label_from_instance(self, obj):
+        return f"{ContentType.objects.get_for_id(obj.content_type_id)} | {obj.name}"
+
+
+class AdminUserChangeForm(UnfoldUserChangeForm):
+    """Used by Django admin Change User page (Unfold-styled widgets)."""
+
+    class Meta(UnfoldUserChangeForm.Meta):
+        model = User
+        fields = (
+            "email",
+            "first_name",
+            "last_name",
+            "role",
+            "is_active",
+            "is_staff",
+            "is_superuser",
+            "groups",
+            "user_permissions",
+        )
@@ -6,4 +6,6 @@ class UsersConfig(AppConfig):
     name = "users"
 
     def ready(self):
-        from . import signals  # noqa: F401 (just to register handlers)
+        from . import last_login, signals  # noqa: F401 (just to register handlers)
+
+        last_login.configure()
@@ -0,0 +1,50 @@
+# src/users/backends.py
+from django.contrib.auth.backends import ModelBackend
+
+from . import permissions, user_cache
+
+
+class CachedPermissionBackend(ModelBackend):
+    """
+    ModelBackend whose permission sets come from the shared cache (users/permissions.py)
+    instead of being queried on every request. Authentication is unchanged.
+    Still memoised per user object, so one request reads the cache at most once.
+    Without a shared cache alias (LocMem) the permission methods are ModelBackend's.
+    With AUTH_USER_CACHE, request.user itself comes from the cache (users/user_cache.py).
+    """
+
+    def get_user(self, user_id):
+        if not user_cache.enabled():
+            return super().get_user(user_id)
+        user = user_cache.get_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        if not user_cache.enabled():
+            return await super().aget_user(user_id)
+        user = await user_cache.aget_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    def get_user_permissions(self, user_obj, obj=None):
+        if not permissions.cache_is_shared():
+            return super().get_user_permissions(user_obj, obj)
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_user_perm_cache"):
+            if user_obj.is_superuser:
+                user_obj._user_perm_cache = set(permissions.all_permissions())
+            else:
+                user_obj._user_perm_cache = set(permissions.user_permissions(user_obj))
+        return user_obj._user_perm_cache
+
+    def get_group_permissions(self, user_obj, obj=None):
+        if not permissions.cache_is_shared():
+            return super().get_group_permissions(user_obj, obj)
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_group_perm_cache"):
+            if user_obj.is_superuser:
+                user_obj._group_perm_cache = set(permissions.all_permissions())
+            else:
+                user_obj._group_perm_cache = set(permissions.group_permissions(user_obj))
+        return user_obj._group_perm_cache
@@ -13,3 +13,6 @@ PWD_RESET_TPLS = {
     "email_html": "users/registration/password_reset_email.html",  # present
     "subject": "users/registration/password_reset_subject.txt",
 }
+
+# Group granted to teacher users (created by users.signals.ensure_teacher_admin_group)
+TEACHER_GROUP_NAME = "Teacher Admin"
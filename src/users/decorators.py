@@ -2,16 +2,13 @@
 from collections.abc import Iterable
 from functools import wraps
 
+from asgiref.sync import iscoroutinefunction
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import redirect
 
-ROLE_HOME = {
-    "student": "users:student_home",
-    "teacher": "users:teacher_home",
-    "admin": "users:admin_home",
-}
+from .roles import DEFAULT_ROLE_HOME as ROLE_HOME, get_role_capabilities
 
 
 def _normalize_roles(allowed_roles) -> set[str]:
@@ -23,9 +20,34 @@ def _normalize_roles(allowed_roles) -> set[str]:
     return {allowed_roles}
 
 
+def _deny(request, role):
+    """
+    Response for a logged-in user whose role is not allowed on the current view.
+    Shared by the sync and async wrappers of role_required.
+    """
+    # Not allowed → try to send them to THEIR home
+    target = ROLE_HOME.get(role)
+
+    # If we don't know their role, or no target, go to landing
+    if not target:
+        messages.error(request, "You do not have permission to view this page.")
+        return redirect("core:landing")
+
+    # Prevent redirect loops: if we're already on the target view, 403
+    current_view = getattr(request.resolver_match, "view_name", None)
+    if current_view == target:
+        # Avoid adding the message repeatedly in a loop scenario
+        raise PermissionDenied("You do not have permission to view this page.")
+
+    messages.error(request, "You do not have permission to view this page.")
+    return redirect(target)
+
+
 def role_required(allowed_roles: Iterable[str] | str):
     """
     Restrict a function view to specific role(s).
+    Works on both sync and async views; async views resolve the user via
+    request.auser() so no thread hop is needed under ASGI.
     Usage:
         @role_required("teacher")
         @role_required(["admin", "teacher"])
@@ -33,31 +55,30 @@ def role_required(allowed_roles: Iterable[str] | str):
     allowed = _normalize_roles(allowed_roles)
 
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            @login_required
+            async def async_wrapper(request, *args, **kwargs):
+                # Pin the resolved user so templates rendered by the view don't
+                # hit the sync user loader.
+                request.user = await request.auser()
+                role = get_role_capabilities(request.user).role
+                if role in allowed:
+                    return await view_func(request, *args, **kwargs)
+                return _deny(request, role)
+
+            return async_wrapper
+
         @wraps(view_func)
         @login_required
         def wrapper(request, *args, **kwargs):
-            role = getattr(request.user, "role", None)
+            role = get_role_capabilities(request.user).role
 
             # Allowed → proceed
             if role in allowed:
                 return view_func(request, *args, **kwargs)
-
-            # Not allowed → try to send them to THEIR home
-            target = ROLE_HOME.get(role)
-
-            # If we don't know their role, or no target, go to landing
-            if not target:
-                messages.error(request, "You do not have permission to view this page.")
-                return redirect("core:landing")
-
-            # Prevent redirect loops: if we're already on the target view, 403
-            current_view = getattr(request.resolver_match, "view_name", None)
-            if current_view == target:
-                # Avoid adding the message repeatedly in a loop scenario
-                raise PermissionDenied("You do not have permission to view this page.")
-
-            messages.error(request, "You do not have permission to view this page.")
-            return redirect(target)
+            return _deny(request, role)
 
         return wrapper
 
@@ -0,0 +1,86 @@
+# src/users/emails.py
+#
+# Batch renderer for the set-password / reset emails (PWD_RESET_TPLS).
+# Templates are loaded and compiled once per renderer, the site-wide context
+# (site_name, protocol, domain) is built once, and each message only pushes its
+# per-user fields (email, uid, token, reset_url, user) onto that shared context.
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.template import Context
+from django.template.loader import get_template
+
+from .constants import PWD_RESET_TPLS
+
+
+class PasswordEmailRenderer:
+    """
+    Usage:
+        renderer = PasswordEmailRenderer(domain="app.example.edu", use_https=True)
+        for link in InviteLinkBuilder(...).links_for(qs):
+            msg = renderer.message(link, from_email=...)
+
+    Not thread-safe: use one renderer per batch/thread.
+    """
+
+    def __init__(self, *, domain: str, use_https: bool, site_name: str | None = None):
+        # get_template(...).template is the compiled django.template.base.Template
+        self.subject = get_template(PWD_RESET_TPLS["subject"]).template
+        self.text = get_template(PWD_RESET_TPLS["email_txt"]).template
+        html_name = PWD_RESET_TPLS.get("email_html")
+        self.html = get_template(html_name).template if html_name else None
+
+        self.context = Context(
+            {
+                "domain": domain,
+                # PasswordResetForm.save(domain_override=...) uses the domain as site_name
+                "site_name": site_name or domain,
+                "protocol": "https" if use_https else "http",
+            },
+            autoescape=True,  # same as render_to_string()
+        )
+
+    def _per_user(self, email, uid, token, reset_url, user):
+        return {
+            "email": email,
+            "uid": uid,
+            "uidb64": uid,  # older invite templates used this name
+            "token": token,
+            "reset_url": reset_url,
+            "user": user,
+        }
+
+    def render(self, *, email, uid, token, reset_url=None, user=None):
+        """Return (subject, text_body, html_body_or_None) for one recipient."""
+        with self.context.push(self._per_user(email, uid, token, reset_url, user)):
+            # Email subject *must not* contain newlines
+            subject = "".join(self.subject.render(self.context).splitlines())
+            text = self.text.render(self.context)
+            html = self.html.render(self.context) if self.html else None
+        return subject, text, html
+
+    def render_html(self, *, email, uid, token, reset_url=None, user=None):
+        """Only the HTML body (used by send_invite_email, which has its own subject/text)."""
+        if self.html is None:
+            return None
+        with self.context.push(self._per_user(email, uid, token, reset_url, user)):
+            return self.html.render(self.context)
+
+    def message(self, link, *, from_email=None) -> EmailMultiAlternatives:
+        """Build the email for a users.invites.InviteLink."""
+        subject, text, html = self.render(
+            email=link.email,
+            uid=link.uidb64,
+            token=link.token,
+            reset_url=link.url,
+            user={"pk": link.pk, "email": link.email},
+        )
+        msg = EmailMultiAlternatives(
+            subject,
+            text,
+            from_email or getattr(settings, "DEFAULT_FROM_EMAIL", None),
+            [link.email],
+        )
+        if html is not None:
+            msg.attach_alternative(html, "text/html")
+        return msg
@@ -1,13 +1,14 @@
 # src/users/forms.py
+#
+# Public forms only; the Unfold-styled admin forms live in users/admin_forms.py so
+# site workers never import Unfold (see WORKER_PROFILE in settings).
 from django import forms
-from django.contrib.auth import get_user_model
-from django.contrib.auth.forms import UserCreationForm as DjangoUserCreationForm
-
-# Unfold-styled admin forms
-from unfold.forms import (
-    UserChangeForm as UnfoldUserChangeForm,
-    UserCreationForm as UnfoldUserCreationForm,
+from django.contrib.auth import aauthenticate, get_user_model
+from django.contrib.auth.forms import (
+    AuthenticationForm,
+    UserCreationForm as DjangoUserCreationForm,
 )
+from django.core.exceptions import ValidationError
 
 User = get_user_model()
 
@@ -23,28 +24,31 @@ class RegisterForm(DjangoUserCreationForm):
         fields = ("email",)
 
 
-# --- Admin-only forms (Unfold-styled) ---------------------------------------
-class AdminUserAddForm(UnfoldUserCreationForm):
-    """Used by Django admin Add User page (gives Unfold-styled password1/2)."""
-
-    class Meta(UnfoldUserCreationForm.Meta):
-        model = User
-        fields = ("email",)  # password1/password2 come from parent form
+# --- Async login form (used by EmailLoginView) --------------------------------
+class AsyncAuthenticationForm(AuthenticationForm):
+    """
+    AuthenticationForm whose credential check runs through aauthenticate().
+    Call `await form.ais_valid()` instead of `form.is_valid()` from async views.
+    """
 
+    def clean(self):
+        # Field-level cleaning only; credentials are checked in ais_valid().
+        return self.cleaned_data
 
-class AdminUserChangeForm(UnfoldUserChangeForm):
-    """Used by Django admin Change User page (Unfold-styled widgets)."""
+    async def ais_valid(self) -> bool:
+        if not self.is_valid():
+            return False
 
-    class Meta(UnfoldUserChangeForm.Meta):
-        model = User
-        fields = (
-            "email",
-            "first_name",
-            "last_name",
-            "role",
-            "is_active",
-            "is_staff",
-            "is_superuser",
-            "groups",
-            "user_permissions",
+        self.user_cache = await aauthenticate(
+            self.request,
+            username=self.cleaned_data["username"],
+            password=self.cleaned_data["password"],
         )
+        try:
+            if self.user_cache is None:
+                raise self.get_invalid_login_error()
+            self.confirm_login_allowed(self.user_cache)
+        except ValidationError as exc:
+            self.add_error(None, exc)
+            return False
+        return True
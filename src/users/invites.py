@@ -0,0 +1,79 @@
+# src/users/invites.py
+#
+# Reusable builder for password-set (invite/reset) links.
+# - The confirm URL is reversed once per process (per urlconf/script prefix) and
+#   then filled in with plain string formatting.
+# - Batches load users with one only() query limited to the fields the token
+#   hashes (pk, password, last_login, email), and tokens come from the public
+#   make_token().
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from django.conf import settings
+from django.urls import get_script_prefix, get_urlconf, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from .tokens import token_generator as default_token_generator
+
+CONFIRM_URL_NAME = "users:password_reset_confirm"
+
+# Placeholders must satisfy the <uidb64>/<token> str converters and survive quoting.
+_UID_MARK = "UIDB64MARK"
+_TOKEN_MARK = "TOKENMARK"
+
+
+class InviteLink(NamedTuple):
+    pk: int
+    email: str
+    uidb64: str
+    token: str
+    url: str
+
+
+@lru_cache(maxsize=8)
+def _confirm_path_template(urlconf, script_prefix) -> str:
+    marks = {"uidb64": _UID_MARK, "token": _TOKEN_MARK}
+    path = reverse(CONFIRM_URL_NAME, urlconf=urlconf, kwargs=marks)
+    path = path.replace("{", "{{").replace("}", "}}")  # literal braces survive .format()
+    return path.replace(_UID_MARK, "{uidb64}").replace(_TOKEN_MARK, "{token}")
+
+
+def confirm_path_template() -> str:
+    """'/users/reset/{uidb64}/{token}/' for the active urlconf, resolved once."""
+    return _confirm_path_template(get_urlconf() or settings.ROOT_URLCONF, get_script_prefix())
+
+
+class InviteLinkBuilder:
+    """
+    Usage:
+        builder = InviteLinkBuilder(domain="app.example.edu", use_https=True)
+        builder.link_for(user).url
+        for link in builder.links_for(User.objects.filter(role="student")):
+            ...
+    """
+
+    def __init__(self, *, domain: str, use_https: bool, token_generator=default_token_generator):
+        self.domain = domain
+        self.use_https = use_https
+        self.scheme = "https" if use_https else "http"
+        self.token_generator = token_generator
+        self._prefix = f"{self.scheme}://{domain}"
+        self._path_template = confirm_path_template()
+
+    def _link(self, pk, email, token) -> InviteLink:
+        uidb64 = urlsafe_base64_encode(force_bytes(pk))
+        path = self._path_template.format(uidb64=uidb64, token=token)
+        return InviteLink(pk, email, uidb64, token, f"{self._prefix}{path}")
+
+    def link_for(self, user) -> InviteLink:
+        """Link for a single (already loaded) user."""
+        return self._link(user.pk, user.email, self.token_generator.make_token(user))
+
+    def links_for(self, queryset, *, chunk_size: int = 2000):
+        """Yield an InviteLink per user in `queryset`, from a single query."""
+        email_field = queryset.model.get_email_field_name()
+        users = queryset.only("pk", "password", "last_login", email_field)
+        for user in users.iterator(chunk_size=chunk_size):
+            yield self.link_for(user)
@@ -0,0 +1,144 @@
+# src/users/last_login.py
+#
+# Write-behind `last_login` (LAST_LOGIN_WRITE_BEHIND).
+# - Django's update_last_login receiver saves the user row on every login. With
+#   write-behind on it is replaced by record_login(): the login time goes onto the
+#   user object, into a per-process buffer and into the shared cache. Nothing is
+#   written during the request.
+# - flush() writes the whole buffer with one UPDATE per 500 users. It runs
+#   LAST_LOGIN_FLUSH_INTERVAL seconds after the first buffered login (timer thread)
+#   and at interpreter exit. Several logins by one user in a window become one write.
+#   The UPDATE only moves last_login forward, so a late flush from another worker
+#   can't overwrite a newer login.
+# - Password-reset tokens hash last_login. users.tokens.token_generator uses
+#   effective_last_login(): the newest of the loaded value, this process's buffer and
+#   the cache. So a login invalidates old reset links at once, and links made before
+#   the flush stay valid afterwards. Across processes this relies on a shared cache
+#   (CACHES "default"). Cache entries outlive PASSWORD_RESET_TIMEOUT, so a login lost
+#   with a killed worker (never flushed) still invalidates older reset links.
+# - On the per-process LocMem cache, configure() logs a warning and keeps Django's
+#   synchronous update_last_login: an unflushed login would die with its process.
+#
+# Usage: UsersConfig.ready() calls configure(); tests may call flush() directly.
+
+import atexit
+from datetime import datetime
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.signals import setting_changed
+from django.db import connection
+from django.db.models import Case, DateTimeField, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.dispatch import receiver
+from django.utils import timezone
+
+log = logging.getLogger("users.last_login")
+
+_KEY = "users:last-login:{}"
+_DJANGO_UID = "update_last_login"  # dispatch_uid used by django.contrib.auth.apps
+FLUSH_BATCH = 500
+
+_pending: dict[int, datetime] = {}
+_lock = threading.Lock()
+_timer: threading.Timer | None = None
+
+
+def _interval() -> float:
+    return getattr(settings, "LAST_LOGIN_FLUSH_INTERVAL", 5.0)
+
+
+def record_login(sender, request, user, **kwargs):
+    """user_logged_in receiver: buffer the login time instead of saving the user."""
+    global _timer
+    now = timezone.now()
+    user.last_login = now
+    with _lock:
+        _pending[user.pk] = now
+        if _timer is None:
+            _timer = threading.Timer(_interval(), _flush_in_thread)
+            _timer.daemon = True
+            _timer.start()
+    # visible to token checks in other processes for as long as any older reset link
+    # could be used, in case this process dies before flushing
+    cache.set(_KEY.format(user.pk), now, max(settings.PASSWORD_RESET_TIMEOUT, 10 * _interval()))
+
+
+def flush() -> int:
+    """Write buffered login times, never moving one back; returns the number of users."""
+    global _timer
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    if not batch:
+        return 0
+    User = get_user_model()
+    items = list(batch.items())
+    for start in range(0, len(items), FLUSH_BATCH):
+        chunk = items[start : start + FLUSH_BATCH]
+        when = Case(
+            *(When(pk=pk, then=Value(at)) for pk, at in chunk), output_field=DateTimeField()
+        )
+        User._base_manager.filter(pk__in=[pk for pk, _at in chunk]).update(
+            last_login=Greatest(Coalesce("last_login", when), when)
+        )
+    log.debug("last_login flushed", extra={"users": len(batch)})
+    return len(batch)
+
+
+def _flush_in_thread():
+    try:
+        flush()
+    except Exception:
+        log.exception("last_login flush failed")
+    finally:
+        connection.close()  # this thread's connection
+
+
+def write_behind() -> bool:
+    """LAST_LOGIN_WRITE_BEHIND, and a cache other processes share."""
+    return getattr(settings, "LAST_LOGIN_WRITE_BEHIND", False) and not isinstance(
+        caches["default"], LocMemCache
+    )
+
+
+def effective_last_login(user) -> datetime | None:
+    """user.last_login, or a newer login that hasn't been flushed yet."""
+    if not write_behind():
+        return user.last_login
+    candidates = [user.last_login, _pending.get(user.pk), cache.get(_KEY.format(user.pk))]
+    return max((c for c in candidates if c is not None), default=None)
+
+
+def configure() -> None:
+    """Swap Django's update_last_login for record_login() according to write_behind()."""
+    if getattr(settings, "LAST_LOGIN_WRITE_BEHIND", False) and not write_behind():
+        log.warning(
+            "LAST_LOGIN_WRITE_BEHIND needs a shared CACHES['default']; "
+            "writing last_login on each login instead"
+        )
+    if write_behind():
+        user_logged_in.disconnect(dispatch_uid=_DJANGO_UID)
+        user_logged_in.connect(record_login, dispatch_uid="users_record_login")
+    else:
+        user_logged_in.disconnect(dispatch_uid="users_record_login")
+        user_logged_in.connect(update_last_login, dispatch_uid=_DJANGO_UID)
+
+
+@receiver(setting_changed)
+def _reconfigure(setting, **kwargs):
+    if setting in {"LAST_LOGIN_WRITE_BEHIND", "CACHES"}:
+        flush()
+        configure()
+
+
+atexit.register(_flush_in_thread)
@@ -0,0 +1,83 @@
+# src/users/management/commands/bench_emails.py
+#
+# Benchmark set-password email rendering (subject + text + HTML per message):
+#   per-message = render_to_string() x3 with a full context (PasswordResetForm.send_mail)
+#   renderer    = users.emails.PasswordEmailRenderer (compiled once, shared site context)
+# Both paths render the same InviteLinks (built up front by InviteLinkBuilder.links_for
+# for throwaway users, rolled back afterwards), so only the rendering is timed.
+#
+# Example:
+#   python src/manage.py bench_emails -n 2000
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.loader import render_to_string
+
+from users.constants import PWD_RESET_TPLS
+from users.emails import PasswordEmailRenderer
+from users.invites import InviteLinkBuilder
+
+
+class Command(BaseCommand):
+    help = "Compare per-message render_to_string() with the batch PasswordEmailRenderer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", "--messages", type=int, default=1000)
+        parser.add_argument("--domain", default="localhost:8000")
+
+    def handle(self, *args, **opts):
+        n = opts["messages"]
+        domain = opts["domain"]
+        links = self._links(n, domain)
+
+        def per_message():
+            for link in links:
+                context = {
+                    "email": link.email,
+                    "domain": domain,
+                    "site_name": domain,
+                    "uid": link.uidb64,
+                    "user": None,
+                    "token": link.token,
+                    "reset_url": link.url,
+                    "protocol": "https",
+                }
+                "".join(render_to_string(PWD_RESET_TPLS["subject"], context).splitlines())
+                render_to_string(PWD_RESET_TPLS["email_txt"], context)
+                render_to_string(PWD_RESET_TPLS["email_html"], context)
+
+        def batch_renderer():
+            renderer = PasswordEmailRenderer(domain=domain, use_https=True)
+            for link in links:
+                renderer.render(
+                    email=link.email, uid=link.uidb64, token=link.token, reset_url=link.url
+                )
+
+        self.stdout.write(self.style.NOTICE(f"== bench_emails: {n} messages =="))
+        per_message()  # warm template loaders outside the timed runs
+        rates = {}
+        for name, fn in (("per-message", per_message), ("renderer", batch_renderer)):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            rates[name] = n / elapsed
+            self.stdout.write(f"{name:>12}: {rates[name]:9.0f} msg/s  ({elapsed:.3f}s)")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"speed-up: {rates['renderer'] / rates['per-message']:.2f}x")
+        )
+
+    def _links(self, n: int, domain: str) -> list:
+        User = get_user_model()
+        builder = InviteLinkBuilder(domain=domain, use_https=True)
+        with transaction.atomic():
+            User.objects.bulk_create(
+                User(email=f"bench-emails-{i}@example.com", password="!") for i in range(n)
+            )
+            users = User.objects.filter(email__startswith="bench-emails-").order_by("pk")
+            links = list(builder.links_for(users))
+            transaction.set_rollback(True)
+        return links
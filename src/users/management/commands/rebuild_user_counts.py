@@ -0,0 +1,23 @@
+# src/users/management/commands/rebuild_user_counts.py
+#
+# Recount the UserCountBucket table (role/staff/active totals used by the User
+# admin changelist). Signals keep it current for normal saves/deletes; run this
+# after QuerySet.update(), bulk_create() or raw SQL against the user table.
+#
+# Examples:
+#   python src/manage.py rebuild_user_counts
+
+from django.core.management.base import BaseCommand
+
+from users.models import UserCountBucket
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-role/staff/active user counts used by the admin changelist."
+
+    def handle(self, *args, **opts):
+        buckets = UserCountBucket.objects.rebuild()
+        total = sum(row[3] for row in UserCountBucket.objects.snapshot())
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {buckets} count bucket(s) covering {total} user(s).")
+        )
@@ -0,0 +1,24 @@
+# src/users/management/commands/rebuild_user_search.py
+#
+# Rebuild the UserSearchToken index behind admin user search.
+# Signals keep it current for normal saves; run this after QuerySet.update(),
+# bulk_create() or raw SQL that changes emails or names.
+#
+# Examples:
+#   python src/manage.py rebuild_user_search
+#   python src/manage.py rebuild_user_search --chunk-size 5000
+
+from django.core.management.base import BaseCommand
+
+from users.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the user search token index (email / first name / last name)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        written = rebuild_index(chunk_size=opts["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {written} search token(s)."))
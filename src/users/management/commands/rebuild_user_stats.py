@@ -0,0 +1,28 @@
+# src/users/management/commands/rebuild_user_stats.py
+#
+# Recount the dashboard statistics tables: RoleStat (users per role / active /
+# pending invite) and SignupWeek (signups per week and role). Signals and roster
+# sync keep them current; run this after QuerySet.update(), bulk_create() or raw
+# SQL against the user table.
+#
+# Examples:
+#   python src/manage.py rebuild_user_stats
+
+from django.core.management.base import BaseCommand
+
+from users.models import RoleStat, SignupWeek
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-role and per-week user statistics shown on the dashboards."
+
+    def handle(self, *args, **opts):
+        counters = RoleStat.objects.rebuild()
+        weeks = SignupWeek.objects.rebuild()
+        total = sum(RoleStat.objects.values_list("count", flat=True))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {counters} role counter(s) and {weeks} signup-week counter(s) "
+                f"covering {total} user(s)."
+            )
+        )
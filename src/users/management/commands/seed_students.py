@@ -1,45 +1,73 @@
 # src/users/management/commands/seed_students.py
 #
-# Seed student users from a CSV, safely and predictably.
+# Seed student users from a roster file, safely and predictably.
 # - CREATE: password = CSV password > --default-password > unusable (None)
 # - UPDATE: names always update; password updates ONLY if CSV provides a password
 #           (we IGNORE --default-password during updates to avoid accidental resets)
 # - DRY RUN: prints "would create"/"would update" and, if --send-welcome, "would email"
+# - SYNC (--sync): roster reconciliation, see users/roster_sync.py. Prints the diff
+#           (new / changed / unchanged / missing / reactivate) first, then deactivates
+#           active students missing from the roster, reactivates listed ones, and runs
+#           the create/update logic for new and changed rows only. Implies --update.
 # - EMAILS: when --send-welcome (and not --dry-run), send a welcome email with:
-#           email, the temp password (if any), and a password reset link
+#           email, the temp password (if any), and a password reset link. A failed send
+#           is reported for its row and the run continues; the command then exits
+#           with an error naming the number of unsent emails.
 #
-# CSV columns supported:
+# Columns supported:
 #   email[,first_name,last_name,password]
 #
+# Input (streamed row by row, see users/roster.py):
+#   CSV, JSONL (one object per line) or XLSX (needs openpyxl); format from the file
+#   extension or --format. .gz/.bz2 are decompressed on the fly. "-" reads stdin.
+#
 # Examples:
 #   python src/manage.py seed_students data/sample_students.csv --dry-run
 #   python src/manage.py seed_students data/sample_students.csv --default-password=ChangeMe123!
 #   python src/manage.py seed_students data/update_alice.csv --update --send-welcome \
 #       --site-domain=127.0.0.1:8000
+#   python src/manage.py seed_students registry_export.csv.gz --default-password=ChangeMe123!
+#   python src/manage.py seed_students registry.xlsx --dry-run
+#   gunzip -c roster.jsonl.gz | python src/manage.py seed_students - --format=jsonl
+#   python src/manage.py seed_students roster_2025.csv.gz --sync --dry-run
 #
 # Notes:
 # - Emails are lowercased and validated; invalid or blank emails are skipped with a warning.
 # - Extra CSV columns are ignored.
 
+from contextlib import ExitStack
 import csv
+import logging
 from pathlib import Path
+import tempfile
 
 from django.contrib.auth import get_user_model
-from django.contrib.auth.tokens import default_token_generator
 from django.core.exceptions import ValidationError
 from django.core.mail import send_mail
 from django.core.management.base import BaseCommand, CommandError
 from django.core.validators import validate_email
-from django.urls import reverse
-from django.utils.encoding import force_bytes
-from django.utils.http import urlsafe_base64_encode
+
+from users.invites import InviteLinkBuilder
+from users.roster import FORMATS, open_roster, Roster, RosterError
+from users.roster_sync import apply_activation, diff_roster, digest, roster_entry
 
 User = get_user_model()
+log = logging.getLogger("users.seed")
+row_log = logging.getLogger("users.seed.rows")  # sampled, see settings.LOG_SAMPLE_RATES
+
+
+def _read_rows(rows):
+    """Roster rows, with read/parse errors reported as CommandError."""
+    try:
+        yield from rows
+    except (OSError, RosterError) as exc:
+        raise CommandError(f"Could not read CSV: {exc}") from exc
 
 
 class Command(BaseCommand):
     help = (
-        "Seed student users from a CSV.\n"
+        "Seed student users from a CSV, JSONL or XLSX roster\n"
+        "(optionally .gz/.bz2; use - to read stdin).\n"
         "Columns supported: email[,first_name,last_name,password]\n"
         "Extra CSV columns are ignored safely.\n\n"
         "Examples:\n"
@@ -49,11 +77,21 @@ class Command(BaseCommand):
         " --update\n"
     )
 
+    # call_command(..., stdin=StringIO(...)) feeds "-" in tests
+    stealth_options = ("stdin",)
+
     def add_arguments(self, parser):
         parser.add_argument(
             "csv_path",
             type=str,
-            help="Path to CSV file. Must at least include the 'email' column.",
+            help="Path to the roster (CSV/JSONL/XLSX, optionally .gz/.bz2) or '-' for stdin. "
+            "Must at least include the 'email' column.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            default=None,
+            help="Roster format (default: from the file extension/content, else csv).",
         )
         parser.add_argument(
             "--default-password",
@@ -66,6 +104,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Update first/last name and password for existing users with the same email.",
         )
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Reconcile with the roster: also deactivate active students missing from it "
+            "(implies --update). The diff is printed before anything is applied.",
+        )
         parser.add_argument(
             "--dry-run",
             action="store_true",
@@ -97,29 +141,55 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        csv_path = Path(options["csv_path"])
-        default_password: str | None = options["default_password"]
-        update: bool = options["update"]
-        dry_run: bool = options["dry_run"]
+        csv_path = options["csv_path"]
+        fmt: str | None = options["format"]
         send_welcome: bool = options["send_welcome"]
         site_domain: str | None = options["site_domain"]
         use_https: bool = options["use_https"]
-        from_email: str | None = options["from_email"]
 
-        if not csv_path.exists():
+        if csv_path != "-" and not Path(csv_path).exists():
             raise CommandError(f"CSV not found: {csv_path}")
 
         if send_welcome and not site_domain:
             raise CommandError("--site-domain is required when using --send-welcome")
 
-        # --- Pass 1: validate headers ----------------------------------------
-        try:
-            with csv_path.open(newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                headers = reader.fieldnames or []
-        except Exception as exc:
-            raise CommandError(f"Could not read CSV: {exc}") from exc
+        # one builder per run: the reset URL pattern is resolved once, not per row
+        self.link_builder = (
+            InviteLinkBuilder(domain=site_domain, use_https=use_https) if send_welcome else None
+        )
+
+        self.email_failures = 0
+
+        with ExitStack() as stack:
+            try:
+                roster = stack.enter_context(open_roster(csv_path, fmt, stdin=options.get("stdin")))
+            except (OSError, RosterError) as exc:
+                raise CommandError(f"Could not read CSV: {exc}") from exc
+            # read errors surface while rows stream; the rest (DB, mail) is not a CSV problem
+            roster = Roster(roster.headers, _read_rows(roster.rows))
+            if options["sync"]:
+                self._sync(roster, csv_path, options)
+            else:
+                self._seed(roster, csv_path, options)
+
+        if self.email_failures:
+            raise CommandError(
+                f"{self.email_failures} welcome email(s) could not be sent; "
+                "the accounts were saved (see the errors above)."
+            )
+
+    def _seed(self, roster, csv_path, options):
+        """Validate headers, then create/update one student per streamed row."""
+        default_password: str | None = options["default_password"]
+        update: bool = options["update"]
+        dry_run: bool = options["dry_run"]
+        send_welcome: bool = options["send_welcome"]
+        site_domain: str | None = options["site_domain"]
+        use_https: bool = options["use_https"]
+        from_email: str | None = options["from_email"]
+        headers = roster.headers
 
+        # --- Validate headers ------------------------------------------------
         if "email" not in headers:
             raise CommandError("CSV must include an 'email' column.")
 
@@ -147,127 +217,125 @@ class Command(BaseCommand):
         invalid = 0
         rows = 0
 
-        # --- Pass 2: process rows --------------------------------------------
-        with csv_path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                rows += 1
-
-                # --- sanitize inputs -----------------------------------------
-                raw_email = (row.get("email") or "").strip()
-                email = raw_email.lower()  # normalize and avoid case-duplicates
+        # --- Process rows (streamed) -----------------------------------------
+        for row in roster.rows:
+            rows += 1
+
+            # --- sanitize inputs -----------------------------------------
+            raw_email = (row.get("email") or "").strip()
+            email = raw_email.lower()  # normalize and avoid case-duplicates
+
+            if not email:
+                skipped += 1
+                self.stdout.write(self.style.WARNING(f"[row {rows}] missing email → skip"))
+                row_log.info("missing email", extra={"row": rows})
+                continue
+
+            try:
+                validate_email(email)
+            except ValidationError:
+                invalid += 1
+                self.stdout.write(
+                    self.style.WARNING(f"[row {rows}] invalid email '{raw_email}' → skip")
+                )
+                row_log.info("invalid email", extra={"row": rows, "email": raw_email})
+                continue
+
+            first_name = (row.get("first_name") or "").strip()
+            last_name = (row.get("last_name") or "").strip()
+
+            # CSV-provided password (may be empty)
+            csv_pwd = (row.get("password") or "").strip()
+
+            # CREATE path password choice: CSV > --default > unusable(None)
+            chosen_pwd_for_create = csv_pwd or (default_password or "")
+            password_arg = chosen_pwd_for_create or None
+
+            # --- upsert logic --------------------------------------------
+            try:
+                user = User.objects.get(email=email)
+
+                if update:
+                    changed = False
+                    pwd_changed = False
+
+                    # names update if provided and different
+                    if first_name and user.first_name != first_name:
+                        user.first_name = first_name
+                        changed = True
+                    if last_name and user.last_name != last_name:
+                        user.last_name = last_name
+                        changed = True
+
+                    # For UPDATES, only change password if CSV provides one
+                    if csv_pwd:
+                        user.set_password(csv_pwd)
+                        changed = True
+                        pwd_changed = True
+
+                    if changed:
+                        if dry_run:
+                            updated += 1
+                            self.stdout.write(
+                                self.style.SUCCESS(f"[row {rows}] would update: {email}")
+                            )
+                            if send_welcome and pwd_changed:
+                                self.stdout.write(self.style.HTTP_INFO(f"    would email: {email}"))
+                        else:
+                            user.save()
+                            updated += 1
+                            self.stdout.write(self.style.SUCCESS(f"[row {rows}] updated: {email}"))
+                            row_log.info("updated", extra={"row": rows, "email": email})
+                            if send_welcome and pwd_changed:
+                                self._send_welcome(
+                                    user=user,
+                                    email=email,
+                                    plain_password=csv_pwd,
+                                    site_domain=site_domain,
+                                    use_https=use_https,
+                                    from_email=from_email,
+                                    dry_run=False,
+                                )
+                    else:
+                        skipped += 1
+                        self.stdout.write(f"[row {rows}] no changes: {email}")
 
-                if not email:
+                else:
                     skipped += 1
-                    self.stdout.write(self.style.WARNING(f"[row {rows}] missing email → skip"))
-                    continue
+                    self.stdout.write(f"[row {rows}] exists → skip: {email}")
 
-                try:
-                    validate_email(email)
-                except ValidationError:
-                    invalid += 1
+            except User.DoesNotExist:
+                if dry_run:
+                    created += 1
                     self.stdout.write(
-                        self.style.WARNING(f"[row {rows}] invalid email '{raw_email}' → skip")
+                        self.style.SUCCESS(f"[row {rows}] would create: {email} (student)")
                     )
-                    continue
-
-                first_name = (row.get("first_name") or "").strip()
-                last_name = (row.get("last_name") or "").strip()
-
-                # CSV-provided password (may be empty)
-                csv_pwd = (row.get("password") or "").strip()
-
-                # CREATE path password choice: CSV > --default > unusable(None)
-                chosen_pwd_for_create = csv_pwd or (default_password or "")
-                password_arg = chosen_pwd_for_create or None
-
-                # --- upsert logic --------------------------------------------
-                try:
-                    user = User.objects.get(email=email)
-
-                    if update:
-                        changed = False
-                        pwd_changed = False
-
-                        # names update if provided and different
-                        if first_name and user.first_name != first_name:
-                            user.first_name = first_name
-                            changed = True
-                        if last_name and user.last_name != last_name:
-                            user.last_name = last_name
-                            changed = True
-
-                        # For UPDATES, only change password if CSV provides one
-                        if csv_pwd:
-                            user.set_password(csv_pwd)
-                            changed = True
-                            pwd_changed = True
-
-                        if changed:
-                            if dry_run:
-                                updated += 1
-                                self.stdout.write(
-                                    self.style.SUCCESS(f"[row {rows}] would update: {email}")
-                                )
-                                if send_welcome and pwd_changed:
-                                    self.stdout.write(
-                                        self.style.HTTP_INFO(f"    would email: {email}")
-                                    )
-                            else:
-                                user.save()
-                                updated += 1
-                                self.stdout.write(
-                                    self.style.SUCCESS(f"[row {rows}] updated: {email}")
-                                )
-                                if send_welcome and pwd_changed:
-                                    self._send_welcome(
-                                        user=user,
-                                        email=email,
-                                        plain_password=csv_pwd,
-                                        site_domain=site_domain,
-                                        use_https=use_https,
-                                        from_email=from_email,
-                                        dry_run=False,
-                                    )
-                        else:
-                            skipped += 1
-                            self.stdout.write(f"[row {rows}] no changes: {email}")
-
-                    else:
-                        skipped += 1
-                        self.stdout.write(f"[row {rows}] exists → skip: {email}")
-
-                except User.DoesNotExist:
-                    if dry_run:
-                        created += 1
-                        self.stdout.write(
-                            self.style.SUCCESS(f"[row {rows}] would create: {email} (student)")
-                        )
-                        if send_welcome:
-                            self.stdout.write(self.style.HTTP_INFO(f"    would email: {email}"))
-                    else:
-                        user = User.objects.create_user(
+                    if send_welcome:
+                        self.stdout.write(self.style.HTTP_INFO(f"    would email: {email}"))
+                else:
+                    user = User.objects.create_user(
+                        email=email,
+                        password=password_arg,  # manager handles hashing/unusable
+                        role=User.Roles.STUDENT,
+                        first_name=first_name,
+                        last_name=last_name,
+                        is_active=True,
+                    )
+                    created += 1
+                    self.stdout.write(
+                        self.style.SUCCESS(f"[row {rows}] created: {email} (student)")
+                    )
+                    row_log.info("created", extra={"row": rows, "email": email})
+                    if send_welcome:
+                        self._send_welcome(
+                            user=user,
                             email=email,
-                            password=password_arg,  # manager handles hashing/unusable
-                            role=User.Roles.STUDENT,
-                            first_name=first_name,
-                            last_name=last_name,
-                            is_active=True,
-                        )
-                        created += 1
-                        self.stdout.write(
-                            self.style.SUCCESS(f"[row {rows}] created: {email} (student)")
+                            plain_password=chosen_pwd_for_create or None,
+                            site_domain=site_domain,
+                            use_https=use_https,
+                            from_email=from_email,
+                            dry_run=False,
                         )
-                        if send_welcome:
-                            self._send_welcome(
-                                user=user,
-                                email=email,
-                                plain_password=chosen_pwd_for_create or None,
-                                site_domain=site_domain,
-                                use_https=use_https,
-                                from_email=from_email,
-                                dry_run=False,
-                            )
 
         # --- Summary ---------------------------------------------------------
         self.stdout.write(
@@ -276,8 +344,94 @@ class Command(BaseCommand):
                 f"skipped={skipped} invalid_email={invalid} dry_run={dry_run}"
             )
         )
+        log.info(
+            "seed_students finished",
+            extra={
+                "source": str(csv_path),
+                # nested: `created` is a reserved LogRecord attribute
+                "counts": {
+                    "rows": rows,
+                    "created": created,
+                    "updated": updated,
+                    "skipped": skipped,
+                    "invalid_email": invalid,
+                },
+                "dry_run": dry_run,
+            },
+        )
         self.stdout.write(self.style.SUCCESS("Done."))
 
+    def _sync(self, roster, csv_path, options):
+        """
+        --sync: reduce the roster to digests (rows are spooled to a temp file),
+        diff it against the user table, print the summary, then apply.
+        """
+        dry_run: bool = options["dry_run"]
+        if "email" not in roster.headers:
+            raise CommandError("CSV must include an 'email' column.")
+        columns = ["email", "first_name", "last_name"]
+        if "password" in roster.headers:
+            columns.append("password")
+
+        entries: dict[int, tuple[int, int]] = {}
+        forced: set[int] = set()
+        rows = invalid = 0
+        with tempfile.TemporaryFile("w+", encoding="utf-8", newline="") as spool:
+            writer = csv.DictWriter(spool, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for row in roster.rows:
+                rows += 1
+                email = (row.get("email") or "").strip().lower()
+                try:
+                    validate_email(email)
+                except ValidationError:
+                    invalid += 1
+                    continue
+                first_name = (row.get("first_name") or "").strip()
+                last_name = (row.get("last_name") or "").strip()
+                key = digest(email)
+                entries[key] = roster_entry(first_name, last_name)
+                if (row.get("password") or "").strip():
+                    forced.add(key)
+                writer.writerow({**row, "email": email})
+
+            diff = diff_roster(entries, forced)
+            self.stdout.write(self.style.NOTICE("== seed_students --sync diff =="))
+            self.stdout.write(
+                f"rows={rows} invalid_email={invalid} new={len(diff.new)} "
+                f"changed={len(diff.changed)} unchanged={diff.unchanged} "
+                f"missing={len(diff.missing)} reactivate={len(diff.reactivate)}"
+            )
+            for email in diff.sample_missing:
+                self.stdout.write(f"    missing: {email}")
+            if len(diff.missing) > len(diff.sample_missing):
+                self.stdout.write(f"    … and {len(diff.missing) - len(diff.sample_missing)} more")
+
+            if dry_run:
+                self.stdout.write(self.style.SUCCESS("Dry run: nothing applied."))
+                return
+
+            deactivated, reactivated = apply_activation(diff)
+            log.info(
+                "roster sync applied",
+                extra={
+                    "source": str(csv_path),
+                    "new": len(diff.new),
+                    "changed": len(diff.changed),
+                    "deactivated": deactivated,
+                    "reactivated": reactivated,
+                },
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"deactivated={deactivated} reactivated={reactivated}")
+            )
+
+            # create/update only the rows the diff flagged; unchanged rows cost no query
+            todo = diff.apply_rows
+            spool.seek(0)
+            replay = (r for r in csv.DictReader(spool) if digest(r["email"]) in todo)
+            self._seed(Roster(columns, replay), csv_path, {**options, "update": True})
+
     # --- helpers -------------------------------------------------------------
 
     def _send_welcome(
@@ -291,14 +445,10 @@ class Command(BaseCommand):
         dry_run: bool,
     ):
         """Send a welcome email with login info and a password reset link."""
-        scheme = "https" if use_https else "http"
-        uidb64 = urlsafe_base64_encode(force_bytes(user.pk))
-        token = default_token_generator.make_token(user)
-        reset_path = reverse(
-            "users:password_reset_confirm",
-            kwargs={"uidb64": uidb64, "token": token},
+        builder = getattr(self, "link_builder", None) or InviteLinkBuilder(
+            domain=site_domain, use_https=use_https
         )
-        reset_url = f"{scheme}://{site_domain}{reset_path}"
+        reset_url = builder.link_for(user).url
 
         subject = "Welcome — your account details"
         body_lines = [
@@ -319,10 +469,15 @@ class Command(BaseCommand):
             self.stdout.write(self.style.HTTP_INFO(f"[email] would send to {email}: {subject}"))
             return
 
-        send_mail(
-            subject=subject,
-            message=body,
-            from_email=from_email,
-            recipient_list=[email],
-            fail_silently=False,
-        )
+        try:
+            send_mail(
+                subject=subject,
+                message=body,
+                from_email=from_email,
+                recipient_list=[email],
+                fail_silently=False,
+            )
+        except OSError as exc:  # socket errors and smtplib.SMTPException
+            self.email_failures += 1
+            self.stderr.write(self.style.ERROR(f"[email] could not send to {email}: {exc}"))
+            log.warning("welcome email failed", extra={"email": email, "error": str(exc)})
@@ -0,0 +1,63 @@
+# src/users/management/commands/send_queued_emails.py
+#
+# Dispatcher for queued password-reset requests (users/reset_queue.py).
+# Without --loop it drains the queue once and exits (cron-friendly). With --loop it
+# drains, sleeps --interval seconds and repeats until interrupted; run it as one
+# long-lived process next to the web workers.
+#
+# Examples:
+#   python src/manage.py send_queued_emails
+#   python src/manage.py send_queued_emails --loop --interval 2 --batch-size 200
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.reset_queue import drain
+
+log = logging.getLogger("users.email")
+
+
+class Command(BaseCommand):
+    help = "Send queued password-reset emails in batches over one mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep running, draining every --interval."
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=getattr(settings, "PASSWORD_RESET_QUEUE_INTERVAL", 5.0),
+            help="Seconds between drains with --loop.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Messages per send over one connection."
+        )
+        parser.add_argument("--from-email", default=None, help="From email override")
+
+    def drain_once(self, opts) -> None:
+        handled, sent = drain(batch_size=opts["batch_size"], from_email=opts["from_email"])
+        if handled:
+            self.stdout.write(f"{handled} request(s) handled, {sent} email(s) sent")
+
+    def handle(self, *args, **opts):
+        if not opts["loop"]:
+            self.drain_once(opts)
+            self.stdout.write(self.style.SUCCESS("Queue drained."))
+            return
+
+        self.stdout.write(
+            self.style.NOTICE(f"Dispatching queued emails every {opts['interval']}s (Ctrl-C stops)")
+        )
+        try:
+            while True:
+                try:
+                    self.drain_once(opts)
+                except Exception:  # mail server down etc.: keep the dispatcher alive
+                    log.exception("email dispatch failed")
+                time.sleep(opts["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS("Stopped."))
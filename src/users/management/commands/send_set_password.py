@@ -1,40 +1,141 @@
 # src/users/management/commands/send_set_password.py
+#
+# Send set-password (invite) emails to one user or to whole selections of users.
+#
+# Selectors (combined with AND; inactive users are always excluded):
+#   email                 single user (case-insensitive), as before
+#   --role ROLE           student / teacher / admin
+#   --file PATH           one email per line, or a CSV with an 'email' column
+#   --never-logged-in     users with no last_login
+#   --since YYYY-MM-DD    users who joined on/after this date
+#
+# Examples:
+#   python src/manage.py send_set_password student_1@cam.ac.uk --domain=127.0.0.1:8000
+#   python src/manage.py send_set_password --role=student --never-logged-in --since=2025-09-01
+#   python src/manage.py send_set_password --file=data/intake.csv --dry-run
+
+import csv
+from datetime import datetime, time as dt_time
+from pathlib import Path
+import time
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
-from users.utils import send_set_password
+from users.utils import send_set_password_bulk
 
 User = get_user_model()
 
+# Keep `email__in` lists below SQLite's bound-parameter limit.
+EMAIL_CHUNK = 500
+
+
+def read_emails(path: Path) -> list[str]:
+    """One email per line, or a CSV with an 'email' header. Blank lines/#comments skipped."""
+    with path.open(newline="", encoding="utf-8-sig") as f:
+        first = f.readline()
+        f.seek(0)
+        if "," in first and "email" in [h.strip().lower() for h in first.split(",")]:
+            rows = (row.get("email") or "" for row in csv.DictReader(f))
+        else:
+            rows = (line for line in f)
+        emails = [e.strip() for e in rows]
+    return [e for e in emails if e and not e.startswith("#")]
+
 
 class Command(BaseCommand):
-    help = "Send a set-password email (via password reset flow) to a user."
+    help = (
+        "Send set-password emails (via the password reset templates) to one user, "
+        "or to every active user matching --role/--file/--never-logged-in/--since."
+    )
 
     def add_arguments(self, parser):
-        parser.add_argument("email", help="Target user email.")
+        parser.add_argument("email", nargs="?", help="Target user email (single-user mode).")
+        parser.add_argument("--role", choices=User.Roles.values, help="Only users with this role.")
+        parser.add_argument(
+            "--file", help="File of emails: one per line, or a CSV with an 'email' column."
+        )
+        parser.add_argument(
+            "--never-logged-in", action="store_true", help="Only users who never logged in."
+        )
+        parser.add_argument("--since", help="Only users who joined on/after YYYY-MM-DD.")
         parser.add_argument("--domain", default=None, help="Domain override, e.g. localhost:8000")
         parser.add_argument("--https", action="store_true", help="Use https in links")
         parser.add_argument("--from-email", default=None, help="From email override")
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Messages per send over one connection."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report matching users without sending."
+        )
+
+    def build_querysets(self, opts) -> list:
+        """The selection as one queryset, or one per EMAIL_CHUNK emails with --file."""
+        # Lower(email) is what users_user_email_lower_idx indexes
+        qs = User.objects.alias(email_lower=Lower("email")).filter(is_active=True)
+
+        if opts["email"]:
+            qs = qs.filter(email_lower=opts["email"].strip().lower())
+        if opts["role"]:
+            qs = qs.filter(role=opts["role"])
+        if opts["never_logged_in"]:
+            qs = qs.filter(last_login__isnull=True)
+        if opts["since"]:
+            day = parse_date(opts["since"])
+            if day is None:
+                raise CommandError(f"--since must be YYYY-MM-DD, got {opts['since']!r}")
+            qs = qs.filter(date_joined__gte=timezone.make_aware(datetime.combine(day, dt_time.min)))
+
+        if not opts["file"]:
+            return [qs.order_by("pk")]
+
+        path = Path(opts["file"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        emails = sorted({e.lower() for e in read_emails(path)})
+        if not emails:
+            raise CommandError(f"No emails found in {path}")
+        return [
+            qs.filter(email_lower__in=emails[i : i + EMAIL_CHUNK]).order_by("pk")
+            for i in range(0, len(emails), EMAIL_CHUNK)
+        ]
 
     def handle(self, *args, **opts):
-        email = opts["email"]
-        try:
-            user = User.objects.get(email__iexact=email, is_active=True)
-        except User.DoesNotExist:
-            raise CommandError(f"Active user with email {email!r} does not exist.")
+        if not any(opts[k] for k in ("email", "role", "file", "never_logged_in", "since")):
+            raise CommandError(
+                "Give an email or at least one of --role/--file/--never-logged-in/--since."
+            )
+
+        querysets = self.build_querysets(opts)
+        if opts["email"] and not querysets[0].exists():
+            raise CommandError(f"Active user with email {opts['email']!r} does not exist.")
 
-        domain = opts["domain"] or getattr(settings, "SITE_DOMAIN", "localhost:8000")
+        domain = opts["domain"] or getattr(settings, "SITE_DOMAIN", "") or "localhost:8000"
         use_https = opts["https"]
         from_email = opts["from_email"] or getattr(settings, "DEFAULT_FROM_EMAIL", None)
 
-        ok = send_set_password(
-            user.email, domain=domain, use_https=use_https, from_email=from_email
+        start = time.perf_counter()
+        sent = send_set_password_bulk(
+            querysets,
+            domain=domain,
+            use_https=use_https,
+            from_email=from_email,
+            batch_size=opts["batch_size"],
+            dry_run=opts["dry_run"],
         )
-        if not ok:
-            raise CommandError("Password reset form was invalid; email not sent.")
+        elapsed = time.perf_counter() - start
+        rate = sent / elapsed if elapsed else 0.0
+
+        verb = "Would send" if opts["dry_run"] else "Sent"
         self.stdout.write(
-            self.style.SUCCESS(f"Invite sent to {user.email} (domain={domain}, https={use_https})")
+            self.style.SUCCESS(
+                f"{verb} {sent} invite(s) (domain={domain}, https={use_https}) "
+                f"in {elapsed:.2f}s — {rate:.1f} msg/s"
+            )
         )
 
 
@@ -0,0 +1,37 @@
+# src/users/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject
+
+from .roles import get_role_capabilities
+
+
+class RoleCapabilitiesMiddleware:
+    """
+    Attach `request.roles`: a lazy RoleCapabilities for request.user.
+    Nothing is computed (and the user isn't loaded) unless something reads it.
+    Must come after AuthenticationMiddleware. Sync and async capable, so ASGI
+    requests don't pay a thread hop for it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self._attach(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self._attach(request)
+        return await self.get_response(request)
+
+    @staticmethod
+    def _attach(request):
+        # read request.user at access time: async views pin the resolved user first
+        request.roles = SimpleLazyObject(lambda: get_role_capabilities(request.user))
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:08
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_buckets(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    UserCountBucket = apps.get_model("users", "UserCountBucket")
+    rows = User.objects.order_by().values("role", "is_staff", "is_active").annotate(n=Count("pk"))
+    UserCountBucket.objects.bulk_create(
+        UserCountBucket(
+            role=r["role"], is_staff=r["is_staff"], is_active=r["is_active"], count=r["n"]
+        )
+        for r in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_user_email_lower_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserCountBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "role",
+                    models.CharField(
+                        choices=[
+                            ("student", "Student"),
+                            ("teacher", "Teacher"),
+                            ("admin", "Admin"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("is_staff", models.BooleanField()),
+                ("is_active", models.BooleanField()),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("role", "is_staff", "is_active"), name="users_count_bucket_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_buckets, migrations.RunPython.noop),
+    ]
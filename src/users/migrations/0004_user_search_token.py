@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:11
+
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Frozen copy of users.search as of this migration, so later changes to the
+# tokenizer don't change what this migration writes (rebuild_user_search does that).
+SEARCH_FIELDS = ("email", "first_name", "last_name")
+TOKEN_MAX_LENGTH = 64
+_SPLIT = re.compile(r"[\W_]+")
+
+
+def normalise(text):
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(*texts):
+    words = set()
+    for text in texts:
+        words.update(w[:TOKEN_MAX_LENGTH] for w in _SPLIT.split(normalise(text)) if w)
+    return words
+
+
+def populate_tokens(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    UserSearchToken = apps.get_model("users", "UserSearchToken")
+    rows = User.objects.order_by().values_list("pk", *SEARCH_FIELDS)
+    UserSearchToken.objects.bulk_create(
+        [UserSearchToken(user_id=pk, token=t) for pk, *texts in rows for t in tokenize(*texts)],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_user_count_bucket"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserSearchToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("token", models.CharField(max_length=64)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_tokens",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["token", "user"], name="users_search_token_idx")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "token"), name="users_search_token_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_user_search_token"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PasswordResetRequest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("email", models.EmailField(max_length=254)),
+                ("domain", models.CharField(max_length=255)),
+                ("use_https", models.BooleanField(default=False)),
+                ("requested_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:56
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.db import migrations, models
+from django.db.models import Case, Count, When
+from django.db.models.functions import TruncWeek
+
+
+def populate_stats(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    RoleStat = apps.get_model("users", "RoleStat")
+    SignupWeek = apps.get_model("users", "SignupWeek")
+    pending = Case(
+        When(password__startswith=UNUSABLE_PASSWORD_PREFIX, then=True),
+        default=False,
+        output_field=models.BooleanField(),
+    )
+    rows = (
+        User.objects.order_by()
+        .annotate(pending=pending)
+        .values_list("role", "is_active", "pending")
+        .annotate(n=Count("pk"))
+    )
+    RoleStat.objects.bulk_create(
+        RoleStat(role=role, is_active=active, pending_invite=pend, count=n)
+        for role, active, pend, n in rows
+    )
+    rows = (
+        User.objects.order_by()
+        .annotate(week_start=TruncWeek("date_joined", output_field=models.DateField()))
+        .values_list("week_start", "role")
+        .annotate(n=Count("pk"))
+    )
+    SignupWeek.objects.bulk_create(
+        SignupWeek(week=week, role=role, count=n) for week, role, n in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_password_reset_request"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoleStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "role",
+                    models.CharField(
+                        choices=[
+                            ("student", "Student"),
+                            ("teacher", "Teacher"),
+                            ("admin", "Admin"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("is_active", models.BooleanField()),
+                ("pending_invite", models.BooleanField()),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("role", "is_active", "pending_invite"),
+                        name="users_role_stat_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="SignupWeek",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("week", models.DateField()),
+                (
+                    "role",
+                    models.CharField(
+                        choices=[
+                            ("student", "Student"),
+                            ("teacher", "Teacher"),
+                            ("admin", "Admin"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("week", "role"), name="users_signup_week_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_role_stats"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="usersearchtoken",
+            name="users_search_token_idx",
+        ),
+        migrations.AddIndex(
+            model_name="usersearchtoken",
+            index=models.Index(
+                fields=["token"],
+                include=("user",),
+                name="users_search_token_prefix",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+    ]
@@ -1,7 +1,9 @@
 # src/users/models.py
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
 from django.contrib.auth.models import PermissionsMixin
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Lower, TruncWeek
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -82,9 +84,29 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []  # email + password only
 
+    class Meta:
+        indexes = [
+            # case-insensitive bulk lookups (e.g. send_set_password --file)
+            models.Index(Lower("email"), name="users_user_email_lower_idx"),
+        ]
+
     def __str__(self):
         return self.email
 
+    # --- Session auth hash ---------------------------------------------------
+    # Users restored by users/user_cache.py carry the hash, so verifying the session
+    # doesn't load the password column. Changing the password drops it.
+    def get_session_auth_hash(self):
+        return self.__dict__.get("_session_auth_hash") or super().get_session_auth_hash()
+
+    def set_password(self, raw_password):
+        self.__dict__.pop("_session_auth_hash", None)
+        super().set_password(raw_password)
+
+    def set_unusable_password(self):
+        self.__dict__.pop("_session_auth_hash", None)
+        super().set_unusable_password()
+
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
 
@@ -104,3 +126,223 @@ class User(AbstractBaseUser, PermissionsMixin):
     def is_admin(self) -> bool:
         # "admin" role, not to be confused with is_superuser
         return self.role == self.Roles.ADMIN
+
+
+class CounterManager(models.Manager):
+    """Manager for tables of `count` columns keyed by a unique set of fields."""
+
+    def add(self, delta: int, **lookup) -> None:
+        """Atomically add `delta` to the row matching `lookup` (created if missing)."""
+        if not delta:
+            return
+        if self.filter(**lookup).update(count=models.F("count") + delta):
+            return
+        try:
+            with transaction.atomic():
+                self.create(count=delta, **lookup)
+        except IntegrityError:  # created concurrently
+            self.filter(**lookup).update(count=models.F("count") + delta)
+
+
+class UserCountBucketManager(CounterManager):
+    def adjust(self, bucket: tuple, delta: int) -> None:
+        """Atomically add `delta` to one (role, is_staff, is_active) bucket."""
+        role, is_staff, is_active = bucket
+        self.add(delta, role=role, is_staff=is_staff, is_active=is_active)
+
+    def rebuild(self) -> int:
+        """Recount every bucket from the user table; returns the number of buckets."""
+        rows = (
+            User.objects.order_by()
+            .values("role", "is_staff", "is_active")
+            .annotate(n=models.Count("pk"))
+        )
+        buckets = [
+            self.model(
+                role=r["role"], is_staff=r["is_staff"], is_active=r["is_active"], count=r["n"]
+            )
+            for r in rows
+        ]
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(buckets)
+        return len(buckets)
+
+    def snapshot(self) -> list[tuple[str, bool, bool, int]]:
+        """All non-empty buckets as (role, is_staff, is_active, count) tuples."""
+        return list(self.filter(count__gt=0).values_list("role", "is_staff", "is_active", "count"))
+
+
+class UserCountBucket(models.Model):
+    """
+    Number of users per (role, is_staff, is_active) combination, kept in step by the
+    User save/delete signals. The admin changelist reads its totals and facet counts
+    from here instead of running COUNT(*) over the user table.
+
+    QuerySet.update()/bulk_create() bypass signals: run `rebuild_user_counts` after them.
+    """
+
+    role = models.CharField(max_length=20, choices=User.Roles.choices)
+    is_staff = models.BooleanField()
+    is_active = models.BooleanField()
+    count = models.IntegerField(default=0)
+
+    objects = UserCountBucketManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["role", "is_staff", "is_active"], name="users_count_bucket_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.role}/staff={self.is_staff}/active={self.is_active}: {self.count}"
+
+
+class RoleStatManager(CounterManager):
+    def adjust(self, key: tuple, delta: int) -> None:
+        """Add `delta` to one (role, is_active, pending_invite) counter."""
+        role, is_active, pending_invite = key
+        self.add(delta, role=role, is_active=is_active, pending_invite=pending_invite)
+
+    def count_rows(self, queryset) -> dict[tuple, int]:
+        """{(role, is_active, pending_invite): n} for a User queryset, in one GROUP BY."""
+        rows = (
+            queryset.order_by()
+            .annotate(
+                pending=models.Case(
+                    models.When(password__startswith=UNUSABLE_PASSWORD_PREFIX, then=True),
+                    default=False,
+                    output_field=models.BooleanField(),
+                )
+            )
+            .values_list("role", "is_active", "pending")
+            .annotate(n=models.Count("pk"))
+        )
+        return {(role, bool(active), bool(pending)): n for role, active, pending, n in rows}
+
+    def rebuild(self) -> int:
+        """Recount from the user table; returns the number of counters."""
+        counters = [
+            self.model(role=role, is_active=active, pending_invite=pending, count=n)
+            for (role, active, pending), n in self.count_rows(User.objects.all()).items()
+        ]
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(counters)
+        return len(counters)
+
+
+class RoleStat(models.Model):
+    """
+    Number of users per (role, is_active, pending_invite). A pending invite is an
+    account without a usable password yet. Dashboards read their headcounts here
+    (users/stats.py). Kept in step by the User signals and by roster sync's bulk
+    updates; `rebuild_user_stats` recounts after other bulk writes.
+    """
+
+    role = models.CharField(max_length=20, choices=User.Roles.choices)
+    is_active = models.BooleanField()
+    pending_invite = models.BooleanField()
+    count = models.IntegerField(default=0)
+
+    objects = RoleStatManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["role", "is_active", "pending_invite"], name="users_role_stat_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.role}/active={self.is_active}/pending={self.pending_invite}: {self.count}"
+
+
+class SignupWeekManager(CounterManager):
+    def adjust(self, key: tuple, delta: int) -> None:
+        """Add `delta` to one (week, role) counter."""
+        week, role = key
+        self.add(delta, week=week, role=role)
+
+    def rebuild(self) -> int:
+        """Recount from User.date_joined (weeks start on Monday, local time)."""
+        rows = (
+            User.objects.order_by()
+            .annotate(week_start=TruncWeek("date_joined", output_field=models.DateField()))
+            .values_list("week_start", "role")
+            .annotate(n=models.Count("pk"))
+        )
+        counters = [self.model(week=week, role=role, count=n) for week, role, n in rows]
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(counters)
+        return len(counters)
+
+
+class SignupWeek(models.Model):
+    """Users who joined in the week starting `week` (a Monday), per role. See RoleStat."""
+
+    week = models.DateField()
+    role = models.CharField(max_length=20, choices=User.Roles.choices)
+    count = models.IntegerField(default=0)
+
+    objects = SignupWeekManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["week", "role"], name="users_signup_week_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.week} {self.role}: {self.count}"
+
+
+class UserSearchToken(models.Model):
+    """
+    Normalised words from a user's email and names (see users/search.py), one row
+    each. Admin search matches word prefixes (`LIKE 'term%'`) on the token index
+    instead of `LIKE '%term%'` over the user table. Kept current by User post_save
+    signals; rebuild with `rebuild_user_search` after bulk updates.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="search_tokens")
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        indexes = [
+            # varchar_pattern_ops: PostgreSQL only uses an index for LIKE 'x%' under a
+            # non-C collation with it; other backends ignore opclasses/include
+            models.Index(
+                fields=["token"],
+                include=["user"],
+                opclasses=["varchar_pattern_ops"],
+                name="users_search_token_prefix",
+            )
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "token"], name="users_search_token_unique"),
+        ]
+
+    def __str__(self):
+        return self.token
+
+
+class PasswordResetRequest(models.Model):
+    """
+    A queued "forgot password" request (users/reset_queue.py). The reset view only
+    inserts a row; `send_queued_emails` matches it to a user, sends the email and
+    deletes the row. Rows that fail to send stay queued, with attempts and the last
+    error, until MAX_ATTEMPTS.
+    """
+
+    email = models.EmailField()
+    domain = models.CharField(max_length=255)
+    use_https = models.BooleanField(default=False)
+    requested_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.email} @ {self.requested_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,147 @@
+# src/users/permissions.py
+#
+# Cross-request permission cache used by users.backends.CachedPermissionBackend.
+# - Per group: its permission set ("app_label.codename" strings).
+# - Per user: their group ids and their direct permissions.
+# - All permissions (for superusers).
+# Entries live in the shared cache (AUTH_PERMISSION_CACHE_ALIAS) and are dropped by
+# the m2m_changed / save / delete receivers in users/signals.py. Permission rows
+# (post_migrate) bump a version that retires every entry at once.
+# Invalidation only reaches other workers through a shared backend, so on a
+# per-process cache (LocMem, Dummy) cache_is_shared() is False and the backend
+# behaves like ModelBackend.
+
+from django.conf import settings
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from .constants import TEACHER_GROUP_NAME
+
+_PREFIX = "users:perms"
+_VERSION_KEY = f"{_PREFIX}:version"
+
+
+def _cache():
+    return caches[getattr(settings, "AUTH_PERMISSION_CACHE_ALIAS", "default")]
+
+
+def cache_is_shared() -> bool:
+    """True unless the alias is a per-process backend that other workers can't see."""
+    return not isinstance(_cache(), (LocMemCache, DummyCache))
+
+
+def _timeout():
+    return getattr(settings, "AUTH_PERMISSION_CACHE_TIMEOUT", 3600)
+
+
+def _version(cache) -> int:
+    return cache.get_or_set(_VERSION_KEY, 1, None)
+
+
+def _key(version: int, kind: str, pk="") -> str:
+    return f"{_PREFIX}:v{version}:{kind}:{pk}"
+
+
+def _perm_names(queryset) -> frozenset[str]:
+    rows = queryset.values_list("content_type__app_label", "codename").order_by()
+    return frozenset(f"{ct}.{name}" for ct, name in rows)
+
+
+def _get_or_compute(cache, key, compute):
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, _timeout())
+    return value
+
+
+def all_permissions() -> frozenset[str]:
+    cache = _cache()
+    key = _key(_version(cache), "all")
+    return _get_or_compute(cache, key, lambda: _perm_names(Permission.objects.all()))
+
+
+def user_permissions(user) -> frozenset[str]:
+    cache = _cache()
+    key = _key(_version(cache), "user", user.pk)
+    return _get_or_compute(cache, key, lambda: _perm_names(user.user_permissions.all()))
+
+
+def group_permissions(user) -> frozenset[str]:
+    """Union of the cached permission sets of the user's groups."""
+    cache = _cache()
+    version = _version(cache)
+    group_ids = _get_or_compute(
+        cache,
+        _key(version, "user-groups", user.pk),
+        lambda: tuple(user.groups.values_list("pk", flat=True)),
+    )
+    if not group_ids:
+        return frozenset()
+
+    keys = {gid: _key(version, "group", gid) for gid in group_ids}
+    cached = cache.get_many(keys.values())
+    perms = set()
+    missing = {}
+    for gid, key in keys.items():
+        if key in cached:
+            perms |= cached[key]
+        else:
+            missing[key] = _perm_names(Permission.objects.filter(group__pk=gid))
+            perms |= missing[key]
+    if missing:
+        cache.set_many(missing, _timeout())
+    return frozenset(perms)
+
+
+# --- Invalidation ------------------------------------------------------------
+def _drop(kind: str, pks) -> None:
+    def drop():
+        cache = _cache()
+        version = _version(cache)
+        cache.delete_many([_key(version, kind, pk) for pk in pks])
+
+    drop()
+    # and again after commit, in case a concurrent request re-cached pre-commit data
+    transaction.on_commit(drop)
+
+
+def forget_groups(group_ids) -> None:
+    _drop("group", group_ids)
+
+
+def forget_user_groups(user_ids) -> None:
+    _drop("user-groups", user_ids)
+
+
+def forget_user_permissions(user_ids) -> None:
+    _drop("user", user_ids)
+
+
+def forget_all() -> None:
+    """Retire every cached entry (new permission rows, bulk clears)."""
+    cache = _cache()
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:  # key evicted
+        cache.set(_VERSION_KEY, 2, None)
+
+
+# --- Teacher Admin group -----------------------------------------------------
+def teacher_admin_group_id() -> int:
+    """pk of the Teacher Admin group; kept in the shared cache, else looked up each time."""
+
+    def lookup():
+        return Group.objects.get_or_create(name=TEACHER_GROUP_NAME)[0].pk
+
+    if not cache_is_shared():
+        return lookup()
+    cache = _cache()
+    return cache.get_or_set(_key(_version(cache), "teacher-group"), lookup, _timeout())
+
+
+def forget_teacher_admin_group() -> None:
+    _drop("teacher-group", [""])
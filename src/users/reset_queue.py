@@ -0,0 +1,147 @@
+# src/users/reset_queue.py
+#
+# Password-reset emails off the request path.
+# - With PASSWORD_RESET_QUEUE on, PasswordResetStartView uses QueuedPasswordResetForm:
+#   a valid POST inserts one PasswordResetRequest row (email, domain, scheme) and
+#   redirects. There is no user lookup, template rendering or SMTP, so the response takes
+#   the same time whether or not the address has an account.
+# - The dispatcher (`python src/manage.py send_queued_emails --loop`) takes queued rows in
+#   batches. It matches them to users the way PasswordResetForm.get_users does (active,
+#   usable password, case-insensitive email), with one query per batch. It renders with
+#   PasswordEmailRenderer and sends over one mail connection per drain.
+# - Repeated requests for one address within a batch get a single email. Each address
+#   is sent on its own and its rows are deleted once sent, so a refused recipient
+#   doesn't re-send the rest of the batch. A failed send leaves only its rows queued
+#   (attempts, last_error); after MAX_ATTEMPTS they are dropped and logged.
+#
+# Run one dispatcher: rows are not locked against concurrent dispatchers.
+
+from collections import defaultdict
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.forms import PasswordResetForm
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.core.mail import get_connection
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from .emails import PasswordEmailRenderer
+from .invites import InviteLinkBuilder
+from .models import PasswordResetRequest
+from .utils import get_domain_and_scheme
+
+log = logging.getLogger("users.email")
+
+MAX_ATTEMPTS = 5
+
+User = get_user_model()
+
+
+def enqueue(email: str, *, domain: str, use_https: bool) -> PasswordResetRequest:
+    return PasswordResetRequest.objects.create(email=email, domain=domain, use_https=use_https)
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """PasswordResetForm whose save() queues the request instead of sending."""
+
+    def save(self, domain_override=None, use_https=False, request=None, **kwargs):
+        # templates, token generator and from_email are the dispatcher's defaults
+        domain = domain_override or get_domain_and_scheme(request)[0]
+        enqueue(self.cleaned_data["email"], domain=domain, use_https=use_https)
+
+
+def _recipients(emails):
+    """Users a reset may go to (PasswordResetForm.get_users), for a set of lowercased emails."""
+    return (
+        User.objects.alias(email_lower=Lower("email"))
+        .filter(email_lower__in=emails, is_active=True)
+        .exclude(password__startswith=UNUSABLE_PASSWORD_PREFIX)
+        .order_by("pk")
+    )
+
+
+def _plan(rows, *, from_email=None) -> tuple[list[tuple[list[int], list]], list[int]]:
+    """
+    ([(queue row ids, messages)], unmatched row ids): one entry per distinct
+    (domain, scheme, lowercased email) that matches users, one message per user.
+    """
+    groups = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        groups[(row.domain, row.use_https)][row.email.lower()].append(row.pk)
+
+    plan, unmatched = [], []
+    for (domain, use_https), by_email in groups.items():
+        builder = InviteLinkBuilder(domain=domain, use_https=use_https)
+        renderer = PasswordEmailRenderer(domain=domain, use_https=use_https)
+        messages = defaultdict(list)
+        for link in builder.links_for(_recipients(by_email)):
+            messages[link.email.lower()].append(renderer.message(link, from_email=from_email))
+        for email, ids in by_email.items():
+            if email in messages:
+                plan.append((ids, messages[email]))
+            else:
+                unmatched += ids
+    return plan, unmatched
+
+
+def _dispatch(connection, *, batch_size: int, from_email=None) -> tuple[int, int, int]:
+    rows = list(PasswordResetRequest.objects.order_by("pk")[:batch_size])
+    if not rows:
+        return 0, 0, 0
+    plan, unmatched = _plan(rows, from_email=from_email)
+    handled = PasswordResetRequest.objects.filter(pk__in=unmatched).delete()[0]
+    sent = failed = 0
+    for ids, messages in plan:
+        try:
+            # one address at a time: a refusal must not re-queue mail already delivered
+            sent += connection.send_messages(messages) or 0
+        except Exception as exc:
+            connection.close()  # reconnect for the next message
+            failed += len(ids)
+            queued = PasswordResetRequest.objects.filter(pk__in=ids)
+            queued.update(attempts=F("attempts") + 1, last_error=f"{type(exc).__name__}: {exc}")
+            dropped, _ = queued.filter(attempts__gte=MAX_ATTEMPTS).delete()
+            log.exception("password reset email failed", extra={"requests": len(ids)})
+            if dropped:
+                log.error("password reset requests dropped", extra={"requests": dropped})
+        else:
+            handled += PasswordResetRequest.objects.filter(pk__in=ids).delete()[0]
+    log.info(
+        "password reset emails sent",
+        extra={"requests": handled, "sent": sent, "failed": failed},
+    )
+    return handled, sent, failed
+
+
+def dispatch(connection, *, batch_size: int = 100, from_email=None) -> tuple[int, int]:
+    """
+    Handle the oldest `batch_size` queued requests over `connection`, one recipient
+    at a time. Returns (requests handled, emails sent). Requests whose email failed
+    stay queued with attempts/last_error and are not counted.
+    """
+    handled, sent, _failed = _dispatch(connection, batch_size=batch_size, from_email=from_email)
+    return handled, sent
+
+
+def drain(*, batch_size: int = 100, from_email=None) -> tuple[int, int]:
+    """Dispatch batches over one connection until the queue is empty (or a send fails)."""
+    if not PasswordResetRequest.objects.exists():
+        return 0, 0  # don't connect to the mail server for nothing
+    from_email = from_email or getattr(settings, "DEFAULT_FROM_EMAIL", None)
+    handled = sent = 0
+    connection = get_connection()
+    connection.open()  # held across batches; send_messages() won't close it
+    try:
+        while True:
+            batch_handled, batch_sent, failed = _dispatch(
+                connection, batch_size=batch_size, from_email=from_email
+            )
+            handled += batch_handled
+            sent += batch_sent
+            if failed or not batch_handled:  # retry failures on the next drain, not now
+                break
+    finally:
+        connection.close()
+    return handled, sent
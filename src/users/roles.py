@@ -0,0 +1,99 @@
+# src/users/roles.py
+#
+# One immutable role-capabilities object per user instance (i.e. per request).
+# Templates, filters, role_required and the navbar read this instead of
+# re-walking getattr chains on request.user.
+
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.urls import reverse
+
+# Fallback URL names when settings.USERS_ROLE_REDIRECTS is missing/incomplete
+DEFAULT_ROLE_HOME = {
+    "admin": "users:admin_home",
+    "teacher": "users:teacher_home",
+    "student": "users:student_home",
+}
+
+_CACHE_ATTR = "_role_capabilities"
+
+
+def home_url_for_role(role: str | None) -> str:
+    """
+    Map role → dashboard URL, with sane fallbacks and support for @override_settings.
+    Priority:
+      1) settings.USERS_ROLE_REDIRECTS (if provided in runtime/tests)
+      2) sensible defaults for known roles (admin/teacher/student)
+    """
+    mapping = getattr(settings, "USERS_ROLE_REDIRECTS", {}) or {}
+    url_name = mapping.get(role) or DEFAULT_ROLE_HOME.get(role, "users:student_home")
+    return reverse(url_name)
+
+
+@dataclass(frozen=True, slots=True)
+class RoleCapabilities:
+    role: str | None = None
+    is_authenticated: bool = False
+    is_superuser: bool = False
+    is_staff: bool = False
+    home_url: str | None = None
+    nav_sections: frozenset[str] = frozenset()
+
+    @property
+    def is_admin(self) -> bool:
+        # superusers OR role == 'admin' (same rule as AdminRequiredMixin)
+        return self.is_authenticated and (self.is_superuser or self.role == "admin")
+
+    @property
+    def is_teacher(self) -> bool:
+        return self.is_authenticated and self.role == "teacher"
+
+    @property
+    def is_student(self) -> bool:
+        return self.is_authenticated and self.role == "student"
+
+
+ANONYMOUS = RoleCapabilities()
+
+
+def _build(user) -> RoleCapabilities:
+    if not getattr(user, "is_authenticated", False):
+        return ANONYMOUS
+
+    role = getattr(user, "role", None)
+    is_superuser = bool(getattr(user, "is_superuser", False))
+    is_staff = bool(getattr(user, "is_staff", False))
+
+    sections = {"dashboard"}
+    if is_staff:
+        sections.add("admin")
+    if is_superuser or role == "admin":
+        sections.add("register")
+    if role == "student":
+        sections.add("courses")
+    elif role == "teacher":
+        sections.add("availability")
+
+    return RoleCapabilities(
+        role=role,
+        is_authenticated=True,
+        is_superuser=is_superuser,
+        is_staff=is_staff,
+        home_url=home_url_for_role(role),
+        nav_sections=frozenset(sections),
+    )
+
+
+def get_role_capabilities(user) -> RoleCapabilities:
+    """
+    Return the RoleCapabilities for `user`, computed once and memoised on the instance.
+    A fresh user object (new request, or after login) gets a fresh computation.
+    """
+    if user is None:
+        return ANONYMOUS
+    caps = getattr(user, _CACHE_ATTR, None)
+    if caps is None:
+        caps = _build(user)
+        setattr(user, _CACHE_ATTR, caps)
+    return caps
@@ -0,0 +1,156 @@
+# src/users/roster.py
+#
+# Streaming roster readers for seed_students.
+# - Sources: a file path or "-" (stdin); gzip/bz2 are detected from magic bytes,
+#   so "students.csv.gz" and a piped "gunzip -c" both work.
+# - Formats: CSV, newline-delimited JSON (one object per line) and XLSX (first
+#   sheet, first row = headers; needs openpyxl).
+# - Every reader yields plain {column: str} dicts, one row at a time; nothing
+#   loads the whole file. XLSX from a non-seekable source is spooled to a temp file.
+#
+# Usage:
+#   with open_roster("students.xlsx") as roster:
+#       roster.headers          # ['email', 'first_name', ...]
+#       for row in roster.rows: # {'email': 'a@ex.com', ...}
+#           ...
+
+import bz2
+from collections.abc import Iterator
+from contextlib import contextmanager, ExitStack
+import csv
+import gzip
+import io
+import itertools
+import json
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+from typing import NamedTuple
+
+FORMATS = ("csv", "jsonl", "xlsx")
+_SUFFIX_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".xlsx": "xlsx"}
+_GZIP_MAGIC = b"\x1f\x8b"
+_BZ2_MAGIC = b"BZh"
+_ZIP_MAGIC = b"PK\x03\x04"  # XLSX is a zip archive
+
+
+class RosterError(ValueError):
+    """Unreadable roster (bad format, missing dependency, malformed line)."""
+
+
+class Roster(NamedTuple):
+    headers: list[str]
+    rows: Iterator[dict[str, str]]
+
+
+def _cell(value) -> str:
+    return "" if value is None else str(value)
+
+
+def detect_format(path: str, head: bytes = b"") -> str:
+    """Format from the file name (ignoring .gz/.bz2), then from content; CSV by default."""
+    suffixes = [s.lower() for s in Path(path).suffixes if s.lower() not in (".gz", ".bz2")]
+    if suffixes and suffixes[-1] in _SUFFIX_FORMATS:
+        return _SUFFIX_FORMATS[suffixes[-1]]
+    if head.startswith(_ZIP_MAGIC):
+        return "xlsx"
+    if head.lstrip().startswith(b"{"):
+        return "jsonl"
+    return "csv"
+
+
+def _decompress(binary, stack: ExitStack):
+    """Return (stream, compressed); the stream is a BufferedReader, so peek() works."""
+    head = binary.peek(4)[:4]
+    if head.startswith(_GZIP_MAGIC):
+        return io.BufferedReader(stack.enter_context(gzip.GzipFile(fileobj=binary))), True
+    if head.startswith(_BZ2_MAGIC):
+        return io.BufferedReader(stack.enter_context(bz2.BZ2File(binary))), True
+    return binary, False
+
+
+def _text(binary, stack: ExitStack):
+    # utf-8-sig: Excel's "CSV UTF-8" export starts with a BOM
+    text = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+    stack.callback(text.detach)  # leave the underlying stream (maybe stdin) to its owner
+    return text
+
+
+def read_csv(text) -> Roster:
+    reader = csv.DictReader(text)
+    headers = [h.strip() for h in reader.fieldnames or []]
+    reader.fieldnames = headers
+    return Roster(headers, reader)
+
+
+def read_jsonl(text) -> Roster:
+    def rows(lines):
+        for lineno, line in lines:
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise RosterError(f"line {lineno}: invalid JSON ({exc.msg})") from exc
+            if not isinstance(obj, dict):
+                raise RosterError(f"line {lineno}: expected a JSON object")
+            yield {str(k): _cell(v) for k, v in obj.items()}
+
+    stream = rows(enumerate(text, start=1))
+    first = next(stream, None)
+    if first is None:
+        return Roster([], iter(()))
+    # headers come from the first object; later rows may add or omit keys
+    return Roster(list(first), itertools.chain([first], stream))
+
+
+def read_xlsx(binary, stack: ExitStack, *, spool: bool = False) -> Roster:
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise RosterError("XLSX input needs openpyxl: pip install openpyxl") from exc
+
+    if spool or not binary.seekable():
+        # openpyxl seeks around the zip; copy pipes/decompressed data to disk first
+        tmp = stack.enter_context(tempfile.TemporaryFile())
+        shutil.copyfileobj(binary, tmp)
+        tmp.seek(0)
+        binary = tmp
+
+    workbook = load_workbook(binary, read_only=True, data_only=True)
+    stack.callback(workbook.close)
+    values = workbook.worksheets[0].iter_rows(values_only=True)
+    headers = [_cell(h).strip() for h in next(values, ())]
+
+    def rows():
+        for record in values:
+            if any(v is not None for v in record):
+                yield {h: _cell(v) for h, v in zip(headers, record, strict=False) if h}
+
+    return Roster(headers, rows())
+
+
+@contextmanager
+def open_roster(path: str, fmt: str | None = None, *, stdin=None):
+    """Open `path` ("-" for stdin) and yield a Roster; closes everything on exit."""
+    with ExitStack() as stack:
+        if path == "-":
+            source = stdin if stdin is not None else sys.stdin
+            binary = getattr(source, "buffer", None)
+            if binary is None:  # already-decoded text stream (e.g. StringIO in tests)
+                if (fmt or "csv") == "xlsx":
+                    raise RosterError("XLSX can't be read from a text stream")
+                yield (read_jsonl if fmt == "jsonl" else read_csv)(source)
+                return
+        else:
+            binary = stack.enter_context(open(path, "rb"))
+
+        binary, compressed = _decompress(binary, stack)
+        fmt = fmt or detect_format("" if path == "-" else path, binary.peek(4)[:4])
+        if fmt == "xlsx":
+            yield read_xlsx(binary, stack, spool=compressed or path == "-")
+        elif fmt == "jsonl":
+            yield read_jsonl(_text(binary, stack))
+        else:
+            yield read_csv(_text(binary, stack))
@@ -0,0 +1,131 @@
+# src/users/roster_sync.py
+#
+# Set-based roster reconciliation for `seed_students --sync`.
+# - The roster is reduced to {email digest: (first, last) digests} (64-bit ints),
+#   so a million-row roster costs tens of MB, not the rows themselves.
+# - One streamed values_list() pass over the user table classifies every row as
+#   new / changed / unchanged, and every active student as present or missing.
+# - Missing students are deactivated (and returning ones reactivated) with chunked
+#   UPDATEs; the admin count buckets and dashboard RoleStat counters are adjusted
+#   to match.
+#
+# A digest collision can only make a user look present/unchanged, never missing,
+# so it can't deactivate anyone by mistake.
+
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from . import user_cache
+from .models import RoleStat, UserCountBucket
+
+UPDATE_CHUNK = 1000
+
+
+def digest(text: str) -> int:
+    """64-bit blake2b of `text`; 0 is reserved for "not provided"."""
+    if not text:
+        return 0
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big") or 1
+
+
+def roster_entry(first_name: str, last_name: str) -> tuple[int, int]:
+    return digest(first_name), digest(last_name)
+
+
+@dataclass
+class RosterDiff:
+    new: set[int] = field(default_factory=set)  # email digests not in the DB
+    changed: set[int] = field(default_factory=set)  # names differ / password given
+    reactivate: array = field(default_factory=lambda: array("q"))  # inactive students listed
+    missing: array = field(default_factory=lambda: array("q"))  # active students not listed
+    unchanged: int = 0
+    sample_missing: list[str] = field(default_factory=list)
+    # {is_staff: n} tallies, to keep UserCountBucket in step with the bulk updates
+    missing_by_staff: Counter = field(default_factory=Counter)
+    reactivate_by_staff: Counter = field(default_factory=Counter)
+
+    @property
+    def apply_rows(self) -> set[int]:
+        """Email digests the row-by-row upsert still has to visit."""
+        return self.new | self.changed
+
+
+def diff_roster(
+    entries: dict[int, tuple[int, int]], forced: set[int], *, sample: int = 10
+) -> RosterDiff:
+    """
+    Compare roster `entries` ({email digest: roster_entry()}) with the user table.
+    A name counts as changed only when the roster provides it (blank = keep), like
+    `seed_students --update`. `forced` rows (e.g. carrying a password) always count.
+    """
+    User = get_user_model()
+    diff = RosterDiff()
+    seen = set()
+
+    rows = User.objects.order_by().values_list(
+        "pk", "email", "first_name", "last_name", "role", "is_active", "is_staff", "is_superuser"
+    )
+    for pk, email, first, last, role, is_active, is_staff, is_superuser in rows.iterator(
+        chunk_size=5000
+    ):
+        key = digest(email.lower())
+        is_student = role == User.Roles.STUDENT and not is_superuser
+        names = entries.get(key)
+        if names is None:
+            if is_student and is_active:
+                diff.missing.append(pk)
+                diff.missing_by_staff[is_staff] += 1
+                if len(diff.sample_missing) < sample:
+                    diff.sample_missing.append(email)
+            continue
+
+        seen.add(key)
+        if is_student and not is_active:
+            diff.reactivate.append(pk)
+            diff.reactivate_by_staff[is_staff] += 1
+        first_d, last_d = names
+        if (
+            key in forced
+            or (first_d and first_d != digest(first))
+            or (last_d and last_d != digest(last))
+        ):
+            diff.changed.add(key)
+        else:
+            diff.unchanged += 1
+
+    diff.new = entries.keys() - seen
+    return diff
+
+
+def _set_active(pks: array, active: bool) -> int:
+    User = get_user_model()
+    done = 0
+    for start in range(0, len(pks), UPDATE_CHUNK):
+        chunk = pks[start : start + UPDATE_CHUNK].tolist()
+        rows = User.objects.filter(pk__in=chunk, is_active=not active)
+        moved = RoleStat.objects.count_rows(rows)  # update() bypasses the stats signals
+        done += rows.update(is_active=active)
+        user_cache.forget_users(chunk)  # nor the user_cache receivers
+        for (role, _was_active, pending), n in moved.items():
+            RoleStat.objects.adjust((role, not active, pending), -n)
+            RoleStat.objects.adjust((role, active, pending), n)
+    return done
+
+
+def apply_activation(diff: RosterDiff) -> tuple[int, int]:
+    """Deactivate missing and reactivate returning students; returns (deactivated, reactivated)."""
+    student = get_user_model().Roles.STUDENT
+    with transaction.atomic():
+        deactivated = _set_active(diff.missing, False)
+        reactivated = _set_active(diff.reactivate, True)
+        # update() bypasses signals: move the admin count buckets by hand
+        for active, by_staff in ((False, diff.missing_by_staff), (True, diff.reactivate_by_staff)):
+            for is_staff, n in by_staff.items():
+                UserCountBucket.objects.adjust((student, is_staff, not active), -n)
+                UserCountBucket.objects.adjust((student, is_staff, active), n)
+    return deactivated, reactivated
@@ -0,0 +1,78 @@
+# src/users/search.py
+#
+# Indexed user search.
+# - Each user's email and names are split into normalised words (casefolded,
+#   accents stripped) and stored in UserSearchToken.
+# - A query word matches users having a token that starts with it (`token LIKE
+#   'w%'`, served by the varchar_pattern_ops index on PostgreSQL whatever the
+#   collation). Every query word must match, as with admin search_fields.
+
+import re
+import unicodedata
+
+from django.db import transaction
+
+SEARCH_FIELDS = ("email", "first_name", "last_name")
+TOKEN_MAX_LENGTH = 64
+_SPLIT = re.compile(r"[\W_]+")
+
+
+def normalise(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(*texts: str) -> set[str]:
+    """'José.Smith@Example.com' → {'jose', 'smith', 'example', 'com'}."""
+    words = set()
+    for text in texts:
+        words.update(w[:TOKEN_MAX_LENGTH] for w in _SPLIT.split(normalise(text)) if w)
+    return words
+
+
+def user_tokens(user) -> set[str]:
+    return tokenize(*(getattr(user, f) for f in SEARCH_FIELDS))
+
+
+def index_user(user) -> None:
+    """Replace the stored tokens for one (saved) user."""
+    from .models import UserSearchToken
+
+    wanted = user_tokens(user)
+    with transaction.atomic():
+        stored = set(
+            UserSearchToken.objects.filter(user_id=user.pk).values_list("token", flat=True)
+        )
+        if stale := stored - wanted:
+            UserSearchToken.objects.filter(user_id=user.pk, token__in=stale).delete()
+        UserSearchToken.objects.bulk_create(
+            [UserSearchToken(user_id=user.pk, token=t) for t in wanted - stored]
+        )
+
+
+def rebuild_index(*, chunk_size: int = 2000) -> int:
+    """Re-tokenise every user; returns the number of tokens written."""
+    from .models import User, UserSearchToken
+
+    written = 0
+    with transaction.atomic():
+        UserSearchToken.objects.all().delete()
+        batch = []
+        rows = User.objects.order_by().values_list("pk", *SEARCH_FIELDS)
+        for pk, *texts in rows.iterator(chunk_size=chunk_size):
+            batch.extend(UserSearchToken(user_id=pk, token=t) for t in tokenize(*texts))
+            if len(batch) >= chunk_size:
+                written += len(UserSearchToken.objects.bulk_create(batch))
+                batch = []
+        written += len(UserSearchToken.objects.bulk_create(batch))
+    return written
+
+
+def search_users(queryset, term: str):
+    """Narrow `queryset` to users matching every word of `term` by token prefix."""
+    from .models import UserSearchToken
+
+    for word in tokenize(term):
+        matches = UserSearchToken.objects.filter(token__startswith=word).values("user_id")
+        queryset = queryset.filter(pk__in=matches)
+    return queryset
@@ -1,15 +1,30 @@
 # src/users/signals.py
+import logging
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
 from django.db import transaction
-from django.db.models.signals import post_migrate, post_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_migrate,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 
+from . import permissions, user_cache
+from .constants import TEACHER_GROUP_NAME
+from .models import RoleStat, SignupWeek, UserCountBucket
+from .search import index_user, SEARCH_FIELDS
+from .stats import STAT_FIELDS, stat_keys
 from .utils import get_domain_and_scheme, send_invite_email
 
 User = get_user_model()
-TEACHER_GROUP_NAME = "Teacher Admin"
+log = logging.getLogger("users.signals")
 
 
 # -------------------------------
@@ -34,6 +49,234 @@ def send_invite_on_create(sender, instance, created: bool, **kwargs):
 
     # Run only after DB commit so uid/token are valid.
     transaction.on_commit(_send)
+    log.info("invite email scheduled", extra={"user_id": instance.pk})
+
+
+# -------------------------------
+# Admin count buckets
+# -------------------------------
+_BUCKET_FIELDS = ("role", "is_staff", "is_active")
+_LOADED_BUCKET = "_count_bucket"
+
+
+def _bucket(user) -> tuple:
+    return (user.role, bool(user.is_staff), bool(user.is_active))
+
+
+@receiver(post_init, sender=User)
+def remember_count_bucket(sender, instance, **kwargs):
+    # Values as loaded (post_init runs before any edits); skipped when fields are deferred.
+    if all(f in instance.__dict__ for f in _BUCKET_FIELDS):
+        setattr(instance, _LOADED_BUCKET, _bucket(instance))
+
+
+@receiver(pre_save, sender=User)
+def load_count_bucket(sender, instance, update_fields=None, **kwargs):
+    # Fallback for instances built with only()/defer(): read the stored bucket once.
+    if instance._state.adding or hasattr(instance, _LOADED_BUCKET):
+        return
+    if update_fields is not None and not set(update_fields) & set(_BUCKET_FIELDS):
+        return
+    stored = sender._base_manager.filter(pk=instance.pk).values_list(*_BUCKET_FIELDS).first()
+    if stored:
+        setattr(instance, _LOADED_BUCKET, (stored[0], bool(stored[1]), bool(stored[2])))
+
+
+@receiver(post_save, sender=User)
+def update_count_buckets(sender, instance, created: bool, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(_BUCKET_FIELDS):
+        return  # e.g. last_login updates
+    new = _bucket(instance)
+    old = None if created else getattr(instance, _LOADED_BUCKET, None)
+    if old != new:
+        if old is not None:
+            UserCountBucket.objects.adjust(old, -1)
+        UserCountBucket.objects.adjust(new, +1)
+    setattr(instance, _LOADED_BUCKET, new)
+
+
+@receiver(post_delete, sender=User)
+def drop_from_count_bucket(sender, instance, **kwargs):
+    UserCountBucket.objects.adjust(getattr(instance, _LOADED_BUCKET, _bucket(instance)), -1)
+
+
+# -------------------------------
+# Dashboard statistics (RoleStat / SignupWeek)
+# -------------------------------
+_LOADED_STATS = "_stat_keys"
+
+
+def _stat_keys(user) -> tuple:
+    return stat_keys(*(getattr(user, f) for f in STAT_FIELDS))
+
+
+@receiver(post_init, sender=User)
+def remember_stat_keys(sender, instance, **kwargs):
+    if all(f in instance.__dict__ for f in STAT_FIELDS):
+        setattr(instance, _LOADED_STATS, _stat_keys(instance))
+
+
+def _load_stored_stat_keys(sender, instance) -> None:
+    # instances built with only()/defer() (e.g. users/user_cache.py): read the row once
+    stored = sender._base_manager.filter(pk=instance.pk).values_list(*STAT_FIELDS).first()
+    if stored:
+        setattr(instance, _LOADED_STATS, stat_keys(*stored))
+
+
+@receiver(pre_save, sender=User)
+def load_stat_keys(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding or hasattr(instance, _LOADED_STATS):
+        return
+    if update_fields is not None and not set(update_fields) & set(STAT_FIELDS):
+        return
+    _load_stored_stat_keys(sender, instance)
+
+
+@receiver(post_save, sender=User)
+def update_stats(sender, instance, created: bool, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(STAT_FIELDS):
+        return  # e.g. last_login updates
+    new = _stat_keys(instance)
+    old = None if created else getattr(instance, _LOADED_STATS, None)
+    for manager, old_key, new_key in (
+        (RoleStat.objects, old and old[0], new[0]),
+        (SignupWeek.objects, old and old[1], new[1]),
+    ):
+        if old_key != new_key:
+            if old_key is not None:
+                manager.adjust(old_key, -1)
+            manager.adjust(new_key, +1)
+    setattr(instance, _LOADED_STATS, new)
+
+
+@receiver(pre_delete, sender=User)
+def load_stat_keys_before_delete(sender, instance, **kwargs):
+    if not hasattr(instance, _LOADED_STATS):
+        _load_stored_stat_keys(sender, instance)
+
+
+@receiver(post_delete, sender=User)
+def drop_from_stats(sender, instance, **kwargs):
+    keys = getattr(instance, _LOADED_STATS, None)
+    if keys is not None:
+        RoleStat.objects.adjust(keys[0], -1)
+        SignupWeek.objects.adjust(keys[1], -1)
+
+
+# -------------------------------
+# Search index
+# -------------------------------
+_LOADED_SEARCH = "_search_source"
+
+
+@receiver(post_init, sender=User)
+def remember_search_source(sender, instance, **kwargs):
+    if all(f in instance.__dict__ for f in SEARCH_FIELDS):
+        setattr(instance, _LOADED_SEARCH, tuple(instance.__dict__[f] for f in SEARCH_FIELDS))
+
+
+@receiver(post_save, sender=User)
+def update_search_index(sender, instance, created: bool, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    current = tuple(getattr(instance, f) for f in SEARCH_FIELDS)
+    if created or getattr(instance, _LOADED_SEARCH, None) != current:
+        index_user(instance)
+        setattr(instance, _LOADED_SEARCH, current)
+
+
+# -------------------------------
+# Permission cache invalidation
+# -------------------------------
+@receiver(m2m_changed, sender=Group.permissions.through)
+def forget_group_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:  # group.permissions.add/remove/clear/set
+        permissions.forget_groups([instance.pk])
+    elif pk_set:  # permission.group_set.add/remove(groups)
+        permissions.forget_groups(pk_set)
+    else:  # permission.group_set.clear(): groups unknown
+        permissions.forget_all()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def forget_group_memberships(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:  # user.groups.*
+        permissions.forget_user_groups([instance.pk])
+    elif pk_set:  # group.user_set.add/remove(users)
+        permissions.forget_user_groups(pk_set)
+    else:
+        permissions.forget_all()
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def forget_direct_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        permissions.forget_user_permissions([instance.pk])
+    elif pk_set:
+        permissions.forget_user_permissions(pk_set)
+    else:
+        permissions.forget_all()
+
+
+def _forget_user(pk) -> None:
+    permissions.forget_user_groups([pk])
+    permissions.forget_user_permissions([pk])
+
+
+# -------------------------------
+# Authenticated-user cache invalidation
+# -------------------------------
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    user_cache.forget_users([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def forget_cached_group_members(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:  # user.groups.*
+        user_cache.forget_users([instance.pk])
+    elif pk_set:  # group.user_set.add/remove(users)
+        user_cache.forget_users(pk_set)
+    else:
+        user_cache.forget_all()
+
+
+@receiver(post_save, sender=User)
+def forget_new_user_permission_cache(sender, instance, created: bool, **kwargs):
+    # a reused pk must not inherit cached memberships
+    if created:
+        _forget_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user_permission_cache(sender, instance, **kwargs):
+    _forget_user(instance.pk)
+
+
+@receiver(post_save, sender=Group)
+def forget_saved_group_cache(sender, instance, **kwargs):
+    permissions.forget_groups([instance.pk])
+
+
+@receiver(post_delete, sender=Group)
+def forget_deleted_group_cache(sender, instance, **kwargs):
+    permissions.forget_groups([instance.pk])
+    permissions.forget_teacher_admin_group()
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def forget_all_permission_caches(sender, **kwargs):
+    permissions.forget_all()
 
 
 # -------------------------------
@@ -50,6 +293,7 @@ def ensure_teacher_admin_group(sender, **kwargs):
     full_perms = getattr(settings, "TEACHER_ADMIN_FULL_PERMS", True)
 
     group, _ = Group.objects.get_or_create(name=TEACHER_GROUP_NAME)
+    permissions.forget_all()  # migrations may have added Permission rows (bulk, no signals)
     perms_qs = (
         Permission.objects.all()
         if full_perms
@@ -58,12 +302,15 @@ def ensure_teacher_admin_group(sender, **kwargs):
     group.permissions.set(perms_qs)
     group.save()
 
+    permissions.forget_teacher_admin_group()
+
     # Sync existing teachers
-    for u in User.objects.filter(role="teacher"):
+    teachers = list(User.objects.filter(role="teacher"))
+    for u in teachers:
         if not u.is_staff:
             u.is_staff = True
             u.save(update_fields=["is_staff"])
-        u.groups.add(group)
+    group.user_set.add(*teachers)  # one INSERT; already-members are skipped
 
 
 # Connect after migrations (use a stable dispatch_uid to avoid double-wiring)
@@ -0,0 +1,95 @@
+# src/users/stats.py
+#
+# Dashboard headcounts from the materialised RoleStat / SignupWeek tables.
+# - stat_keys() maps a user's stored values to their two counters: (role, is_active,
+#   pending_invite) and (week joined, role). users/signals.py moves users between
+#   counters on save/delete; roster sync moves whole chunks after its bulk UPDATEs.
+# - dashboard_stats() / adashboard_stats() read a dozen RoleStat rows plus the recent
+#   SignupWeek rows, whatever the size of the user table.
+#
+# Usage (async view):
+#   context = {"stats": await adashboard_stats(weeks=8)}
+
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.utils import timezone
+
+from .models import RoleStat, SignupWeek, User
+
+STAT_FIELDS = ("role", "is_active", "password", "date_joined")
+DASHBOARD_WEEKS = 8
+
+
+def is_pending(password: str | None) -> bool:
+    """An invited account: no usable password yet."""
+    return bool(password) and password.startswith(UNUSABLE_PASSWORD_PREFIX)
+
+
+def week_of(when: datetime) -> date:
+    """Monday of the (local) week containing `when`, as TruncWeek computes it."""
+    day = when.date() if timezone.is_naive(when) else timezone.localdate(when)
+    return day - timedelta(days=day.weekday())
+
+
+def stat_keys(role, is_active, password, date_joined) -> tuple[tuple, tuple]:
+    return (role, bool(is_active), is_pending(password)), (week_of(date_joined), role)
+
+
+# --- Dashboard ----------------------------------------------------------------
+def _weeks_since(weeks: int, today: date | None = None) -> list[date]:
+    monday = week_of(timezone.now()) if today is None else today - timedelta(today.weekday())
+    return [monday - timedelta(weeks=i) for i in reversed(range(weeks))]
+
+
+def _summarise(role_rows, week_rows, weeks: list[date]) -> dict:
+    roles = {
+        value: {"label": label, "total": 0, "active": 0, "inactive": 0, "pending": 0}
+        for value, label in User.Roles.choices
+    }
+    for role, is_active, pending, n in role_rows:
+        counts = roles.setdefault(
+            role, {"label": role, "total": 0, "active": 0, "inactive": 0, "pending": 0}
+        )
+        counts["total"] += n
+        counts["active" if is_active else "inactive"] += n
+        if pending:
+            counts["pending"] += n
+
+    signups = {week: {"week": week, "total": 0} for week in weeks}
+    for week, role, n in week_rows:
+        signups[week][role] = signups[week].get(role, 0) + n
+        signups[week]["total"] += n
+
+    return {
+        "roles": roles,
+        "total": sum(r["total"] for r in roles.values()),
+        "pending": sum(r["pending"] for r in roles.values()),
+        "signups": list(signups.values()),
+    }
+
+
+def _queries(weeks: list[date]):
+    role_rows = RoleStat.objects.filter(count__gt=0).values_list(
+        "role", "is_active", "pending_invite", "count"
+    )
+    week_rows = SignupWeek.objects.filter(
+        week__range=(weeks[0], weeks[-1]), count__gt=0
+    ).values_list("week", "role", "count")
+    return role_rows, week_rows
+
+
+def dashboard_stats(weeks: int = DASHBOARD_WEEKS, *, today: date | None = None) -> dict:
+    """
+    {"roles": {role: {label, total, active, inactive, pending}}, "total", "pending",
+     "signups": [{"week", "total", <role>: n}, ...] oldest first, `weeks` entries}
+    """
+    week_list = _weeks_since(weeks, today)
+    role_rows, week_rows = _queries(week_list)
+    return _summarise(list(role_rows), list(week_rows), week_list)
+
+
+async def adashboard_stats(weeks: int = DASHBOARD_WEEKS, *, today: date | None = None) -> dict:
+    week_list = _weeks_since(weeks, today)
+    role_rows, week_rows = _queries(week_list)
+    return _summarise([row async for row in role_rows], [row async for row in week_rows], week_list)
@@ -1,20 +1,20 @@
 from django import template
 
+from users.roles import get_role_capabilities
+
 register = template.Library()
 
 
 # --- role checks as filters ---------------------------------------------------
+# All filters read the RoleCapabilities memoised on the user, so repeated checks
+# in a template are O(1) after the first one.
 @register.filter
 def is_admin(user):
     """
     Usage: {% if request.user|is_admin %} ... {% endif %}
     Allows superusers OR role == 'admin'.
     """
-    if not getattr(user, "is_authenticated", False):
-        return False
-    if getattr(user, "is_superuser", False):
-        return True
-    return getattr(user, "role", None) == "admin"
+    return get_role_capabilities(user).is_admin
 
 
 @register.filter
@@ -22,9 +22,7 @@ def is_teacher(user):
     """
     Usage: {% if request.user|is_teacher %} ... {% endif %}
     """
-    if not getattr(user, "is_authenticated", False):
-        return False
-    return getattr(user, "role", None) == "teacher"
+    return get_role_capabilities(user).is_teacher
 
 
 @register.filter
@@ -32,9 +30,16 @@ def is_student(user):
     """
     Usage: {% if request.user|is_student %} ... {% endif %}
     """
-    if not getattr(user, "is_authenticated", False):
-        return False
-    return getattr(user, "role", None) == "student"
+    return get_role_capabilities(user).is_student
+
+
+@register.filter
+def role_capabilities(user):
+    """
+    Usage: {% with caps=request.user|role_capabilities %} {{ caps.home_url }} {% endwith %}
+    Same object as request.roles (set by RoleCapabilitiesMiddleware).
+    """
+    return get_role_capabilities(user)
 
 
 # --- additional: assignment-style tags (nice for reuse in larger templates) ----
@@ -0,0 +1,70 @@
+# src/users/tests/test_admin_autocomplete.py
+#
+# Purpose: the user change page renders groups/user_permissions as autocomplete
+# widgets (selected options only) backed by paginated admin endpoints.
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_change_page_only_loads_selected_permissions(client):
+    """
+    GIVEN a user with one direct permission
+    WHEN  an admin opens their change page
+    THEN  only that permission is rendered as an option, labelled like str(perm)
+    """
+    admin = User.objects.create_superuser(email="root@ex.com", password="x")
+    perm = Permission.objects.get(codename="view_user")
+    other = Permission.objects.get(codename="delete_group")
+    target = User.objects.create_user(email="s@ex.com", password="x")
+    target.user_permissions.add(perm)
+    client.force_login(admin)
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(reverse("admin:users_user_change", args=[target.pk]))
+
+    assert resp.status_code == 200
+    html = resp.content.decode()
+    assert "admin-autocomplete" in html
+    assert f'<option value="{perm.pk}" selected>{perm}</option>' in html
+    assert f'value="{other.pk}"' not in html
+    perm_queries = [q for q in ctx.captured_queries if 'FROM "auth_permission"' in q["sql"]]
+    assert all("WHERE" in q["sql"] for q in perm_queries)
+
+
+@pytest.mark.django_db
+def test_autocomplete_endpoints_search_and_paginate(client):
+    admin = User.objects.create_superuser(email="root@ex.com", password="x")
+    Group.objects.get_or_create(name="Teacher Admin")
+    client.force_login(admin)
+    url = reverse("admin:autocomplete")
+    params = {"app_label": "users", "model_name": "user"}
+
+    first_page = client.get(url, {**params, "field_name": "user_permissions", "term": ""})
+    search = client.get(url, {**params, "field_name": "user_permissions", "term": "view user"})
+    groups = client.get(url, {**params, "field_name": "groups", "term": "teach"})
+
+    assert first_page.status_code == 200
+    data = first_page.json()
+    assert len(data["results"]) == 20  # one page, not the whole table
+    assert data["pagination"]["more"] is True
+    assert "Users | user | Can view user" in [r["text"] for r in search.json()["results"]]
+    assert groups.json()["results"][0]["text"] == "Teacher Admin"
+
+
+@pytest.mark.django_db
+def test_permission_admin_is_hidden_and_read_only(client):
+    admin = User.objects.create_superuser(email="root@ex.com", password="x")
+    client.force_login(admin)
+
+    resp = client.get(reverse("admin:index"))
+
+    assert reverse("admin:auth_permission_changelist") not in resp.content.decode()
+    assert client.get(reverse("admin:auth_permission_add")).status_code == 403
@@ -0,0 +1,112 @@
+# src/users/tests/test_admin_counts.py
+#
+# Purpose: the UserCountBucket table follows user saves/deletes, and the User
+# changelist takes its totals and facet counts from it instead of COUNT(*).
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from users.admin_counts import bucket_constraints, count_from_buckets
+from users.models import UserCountBucket
+
+User = get_user_model()
+
+
+def _counts():
+    return {b[:3]: b[3] for b in UserCountBucket.objects.snapshot()}
+
+
+@pytest.mark.django_db
+def test_buckets_follow_create_update_delete():
+    """
+    GIVEN users created, edited (incl. via only()) and deleted
+    WHEN  reading the count buckets
+    THEN  they match the user table without a rebuild
+    """
+    s1 = User.objects.create_user(email="s1@ex.com", password="x")
+    User.objects.create_user(email="s2@ex.com", password="x")
+    t = User.objects.create_user(email="t@ex.com", password="x", role="teacher", is_staff=True)
+    assert _counts() == {("student", False, True): 2, ("teacher", True, True): 1}
+
+    s1.is_active = False
+    s1.save()
+    deferred = User.objects.only("pk").get(pk=t.pk)
+    deferred.role = "admin"
+    deferred.save(update_fields=["role"])
+    User.objects.get(email="s2@ex.com").delete()
+
+    assert _counts() == {("student", False, False): 1, ("admin", True, True): 1}
+
+
+@pytest.mark.django_db
+def test_last_login_saves_do_not_touch_buckets():
+    user = User.objects.create_user(email="s@ex.com", password="x")
+    user = User.objects.get(pk=user.pk)
+    with CaptureQueriesContext(connection) as ctx:
+        user.save(update_fields=["last_login"])
+    assert len(ctx.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_rebuild_command_recovers_from_bulk_updates():
+    User.objects.create_user(email="s@ex.com", password="x")
+    User.objects.update(is_active=False)  # bypasses signals
+    assert _counts() == {("student", False, True): 1}
+
+    out = StringIO()
+    call_command("rebuild_user_counts", stdout=out)
+    assert "1 user(s)" in out.getvalue()
+
+    assert _counts() == {("student", False, False): 1}
+
+
+def test_bucket_constraints_only_for_exact_bucket_filters():
+    assert bucket_constraints({"role__exact": ["teacher"], "o": ["1"], "p": ["2"]}) == {
+        "role": {"teacher"}
+    }
+    assert bucket_constraints({"is_staff__exact": ["0"]}) == {"is_staff": {False}}
+    assert bucket_constraints({"email__icontains": ["x"]}) is None
+    assert bucket_constraints({"is_staff__exact": ["maybe"]}) is None
+    buckets = [
+        ("student", False, True, 5),
+        ("teacher", True, True, 2),
+        ("student", False, False, 1),
+    ]
+    assert count_from_buckets(buckets, {"role": {"student"}, "is_active": {True}}) == 5
+    assert count_from_buckets(buckets, {}) == 8
+
+
+@pytest.mark.django_db
+def test_changelist_counts_come_from_buckets(client):
+    """
+    GIVEN a superuser viewing the User changelist with facets on
+    WHEN  filtering by role
+    THEN  no COUNT query hits users_user, and the facet counts are right
+    """
+    admin = User.objects.create_superuser(email="root@ex.com", password="x")
+    for i in range(3):
+        User.objects.create_user(email=f"s{i}@ex.com", password="x")
+    User.objects.create_user(email="t@ex.com", password="x", role="teacher", is_staff=True)
+    client.force_login(admin)
+
+    url = reverse("admin:users_user_changelist") + "?_facets=1&role__exact=student"
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(url)
+
+    assert resp.status_code == 200
+    assert resp.context["cl"].result_count == 3
+    counting = [
+        q["sql"]
+        for q in ctx.captured_queries
+        if "COUNT(" in q["sql"].upper() and '"users_user"' in q["sql"]
+    ]
+    assert counting == []
+    content = resp.content.decode()
+    assert "Student (3)" in content
+    assert "Teacher (1)" in content
@@ -0,0 +1,81 @@
+# src/users/tests/test_async_views.py
+#
+# Purpose: The dashboards, public pages and login view are async (ASGI-native).
+# We check they are real coroutine views and that role checks still behave,
+# both through the regular test client and Django's AsyncClient.
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient
+from django.urls import resolve, reverse
+import pytest
+
+from core import views as core_views
+from users import views as users_views
+
+User = get_user_model()
+
+
+@pytest.mark.parametrize(
+    "view",
+    [
+        users_views.student_home,
+        users_views.teacher_home,
+        users_views.admin_home,
+        core_views.landing_page,
+        core_views.about_page,
+    ],
+)
+def test_views_are_coroutines(view):
+    assert iscoroutinefunction(view)
+
+
+def test_login_view_is_async():
+    assert iscoroutinefunction(resolve(reverse("users:login")).func)
+
+
+@pytest.mark.django_db
+def test_wrong_role_is_sent_to_own_home(client):
+    """
+    GIVEN a logged-in student
+    WHEN they open the teacher dashboard
+    THEN role_required (async path) redirects them to the student dashboard.
+    """
+    student = User.objects.create_user(email="s@ex.com", password="pass1234", role="student")
+    client.force_login(student)
+
+    resp = client.get(reverse("users:teacher_home"))
+
+    assert resp.status_code == 302
+    assert resp["Location"] == reverse("users:student_home")
+
+
+@pytest.mark.django_db
+def test_anonymous_dashboard_redirects_to_login(client):
+    resp = client.get(reverse("users:student_home"))
+    assert resp.status_code == 302
+    assert "login" in resp["Location"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_client_login_then_dashboard():
+    """
+    GIVEN a teacher
+    WHEN they log in and open pages through the ASGI handler
+    THEN no sync-only ORM access happens and the dashboard renders.
+    """
+    User.objects.create_user(email="t@ex.com", password="pass1234", role="teacher")
+    aclient = AsyncClient()
+
+    resp = async_to_sync(aclient.post)(
+        reverse("users:login"), {"username": "t@ex.com", "password": "pass1234"}
+    )
+    assert resp.status_code == 302
+    assert resp["Location"] == reverse("users:teacher_home")
+
+    resp = async_to_sync(aclient.get)(reverse("users:teacher_home"))
+    assert resp.status_code == 200
+    assert b"Teacher home" in resp.content
+
+    resp = async_to_sync(aclient.get)(reverse("core:landing"))
+    assert resp.status_code == 200
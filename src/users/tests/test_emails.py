@@ -0,0 +1,56 @@
+# src/users/tests/test_emails.py
+#
+# Purpose: PasswordEmailRenderer renders the same emails as render_to_string()
+# while reusing compiled templates and the shared site context.
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.template.loader import render_to_string
+import pytest
+
+from users.constants import PWD_RESET_TPLS
+from users.emails import PasswordEmailRenderer
+from users.invites import InviteLinkBuilder
+
+User = get_user_model()
+
+
+def test_renderer_matches_render_to_string():
+    renderer = PasswordEmailRenderer(domain="app.example.edu", use_https=True)
+    context = {
+        "email": "a@ex.com",
+        "domain": "app.example.edu",
+        "site_name": "app.example.edu",
+        "uid": "MQ",
+        "token": "abc-123",
+        "protocol": "https",
+        "user": None,
+    }
+
+    subject, text, html = renderer.render(email="a@ex.com", uid="MQ", token="abc-123")
+
+    assert subject == "".join(render_to_string(PWD_RESET_TPLS["subject"], context).splitlines())
+    assert text == render_to_string(PWD_RESET_TPLS["email_txt"], context)
+    assert html == render_to_string(PWD_RESET_TPLS["email_html"], context)
+
+
+def test_renderer_uses_prebuilt_reset_url_and_isolates_recipients():
+    builder = InviteLinkBuilder(domain="localhost:8000", use_https=False)
+    renderer = PasswordEmailRenderer(domain="localhost:8000", use_https=False)
+    first = builder._link(1, "one@ex.com", "t1-aaa")
+    second = builder._link(2, "two@ex.com", "t2-bbb")
+
+    msg1 = renderer.message(first, from_email="noreply@ex.com")
+    msg2 = renderer.message(second, from_email="noreply@ex.com")
+
+    assert first.url in msg1.body
+    assert second.url in msg2.body and first.url not in msg2.body
+    assert msg2.to == ["two@ex.com"]
+    assert second.url in msg2.alternatives[0][0]
+
+
+@pytest.mark.django_db
+def test_bench_emails_command_runs(capsys):
+    call_command("bench_emails", "-n", "3")
+    assert "speed-up" in capsys.readouterr().out
+    assert not User.objects.filter(email__startswith="bench-emails-").exists()
@@ -0,0 +1,63 @@
+# src/users/tests/test_invites.py
+#
+# Purpose: InviteLinkBuilder produces the same links/tokens as the per-user
+# reverse() + make_token() path, batches come from a single query, and invite
+# emails take their domain from a shared builder.
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+import pytest
+
+from users.invites import InviteLinkBuilder
+from users.utils import send_invite_email
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_link_for_matches_reverse_and_validates():
+    user = User.objects.create_user(email="one@ex.com", password=None)
+    link = InviteLinkBuilder(domain="app.example.edu", use_https=True).link_for(user)
+
+    path = reverse(
+        "users:password_reset_confirm", kwargs={"uidb64": link.uidb64, "token": link.token}
+    )
+    assert link.url == f"https://app.example.edu{path}"
+    assert default_token_generator.check_token(user, link.token)
+
+
+@pytest.mark.django_db
+def test_links_for_uses_one_query_and_tokens_validate():
+    User.objects.create_user(email="a@ex.com", password="pass1234")
+    logged_in = User.objects.create_user(email="b@ex.com", password=None)
+    logged_in.last_login = timezone.now()
+    logged_in.save(update_fields=["last_login"])
+
+    builder = InviteLinkBuilder(domain="localhost:8000", use_https=False)
+    with CaptureQueriesContext(connection) as ctx:
+        links = list(builder.links_for(User.objects.order_by("email")))
+
+    assert len(ctx.captured_queries) == 1
+    assert [link.email for link in links] == ["a@ex.com", "b@ex.com"]
+    for link in links:
+        user = User.objects.get(pk=link.pk)
+        assert default_token_generator.check_token(user, link.token)
+        assert link.url.startswith("http://localhost:8000/users/reset/")
+
+
+@pytest.mark.django_db
+def test_invite_email_domain_follows_the_shared_builder():
+    user = User.objects.create_user(email="c@ex.com", password=None)
+    builder = InviteLinkBuilder(domain="app.example.edu", use_https=True)
+
+    send_invite_email(user, domain="localhost:8000", use_https=False, link_builder=builder)
+
+    (msg,) = mail.outbox
+    html = msg.alternatives[0][0]
+    assert "https://app.example.edu/users/reset/" in html
+    assert "localhost:8000" not in html
@@ -0,0 +1,141 @@
+# src/users/tests/test_last_login.py
+#
+# Purpose: with LAST_LOGIN_WRITE_BEHIND, logins don't write the user row; buffered
+# times are flushed in one UPDATE that never moves last_login back, and reset
+# tokens follow the effective last_login before and after the flush.
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+import pytest
+
+from users import last_login
+from users.tokens import token_generator
+
+User = get_user_model()
+
+
+@pytest.fixture
+def write_behind(settings, tmp_path):
+    settings.CACHES = {  # stands in for a shared cache; LocMem disables write-behind
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "cache"),
+        }
+    }
+    settings.LAST_LOGIN_FLUSH_INTERVAL = 60  # flushed by the tests, not the timer
+    settings.LAST_LOGIN_WRITE_BEHIND = True
+    yield
+    last_login.flush()
+
+
+def _login(client, user):
+    resp = client.post(reverse("users:login"), {"username": user.email, "password": "pass1234"})
+    assert resp.status_code == 302
+
+
+@pytest.mark.django_db
+def test_logins_are_buffered_and_flushed_in_one_update(
+    client, write_behind, django_assert_num_queries
+):
+    """
+    GIVEN write-behind and three users logging in
+    WHEN  they log in
+    THEN  last_login stays unwritten until flush(), which issues a single UPDATE
+    """
+    users = [User.objects.create_user(email=f"u{i}@ex.com", password="pass1234") for i in range(3)]
+    for user in users:
+        _login(client, user)
+        client.logout()
+
+    assert not User.objects.filter(last_login__isnull=False).exists()
+
+    with django_assert_num_queries(1):
+        assert last_login.flush() == 3
+    assert User.objects.filter(last_login__isnull=False).count() == 3
+
+
+@pytest.mark.django_db
+def test_flush_never_moves_last_login_back(client, write_behind):
+    """
+    GIVEN a buffered login, and a newer last_login already written by another worker
+    WHEN  this worker flushes
+    THEN  the newer time is kept
+    """
+    user = User.objects.create_user(email="cy@ex.com", password="pass1234")
+    _login(client, user)
+    newer = timezone.now() + timedelta(minutes=1)
+    User.objects.filter(pk=user.pk).update(last_login=newer)
+
+    assert last_login.flush() == 1
+    assert User.objects.get(pk=user.pk).last_login == newer
+
+
+@pytest.mark.django_db
+def test_reset_tokens_follow_buffered_logins(client, write_behind):
+    """
+    GIVEN a reset token made before a login, and one made after it but before the flush
+    WHEN  the login is buffered and later flushed
+    THEN  the old token is invalid straight away and the new one stays valid after flush
+    """
+    user = User.objects.create_user(email="amy@ex.com", password="pass1234")
+    before = token_generator.make_token(User.objects.get(pk=user.pk))
+
+    _login(client, user)
+    stale = User.objects.get(pk=user.pk)  # last_login still NULL in the database
+    after = token_generator.make_token(stale)
+
+    assert stale.last_login is None
+    assert not token_generator.check_token(stale, before)
+    assert token_generator.check_token(stale, after)
+
+    last_login.flush()
+    fresh = User.objects.get(pk=user.pk)
+    assert fresh.last_login is not None
+    assert token_generator.check_token(fresh, after)
+    assert not token_generator.check_token(fresh, before)
+
+
+@pytest.mark.django_db
+def test_default_mode_writes_immediately(client):
+    user = User.objects.create_user(email="bo@ex.com", password="pass1234")
+
+    _login(client, user)
+
+    assert User.objects.get(pk=user.pk).last_login is not None
+
+
+@pytest.mark.django_db
+def test_cached_login_outlives_reset_links(client, write_behind, settings, monkeypatch):
+    """
+    GIVEN write-behind
+    WHEN  a login is buffered
+    THEN  its cache entry lasts at least PASSWORD_RESET_TIMEOUT, so a worker dying
+          before the flush can't revive older reset links
+    """
+    timeouts = []
+    real_set = last_login.cache.set
+
+    def spy(key, value, timeout=None, *args):
+        if key.startswith("users:last-login:"):
+            timeouts.append(timeout)
+        return real_set(key, value, timeout, *args)
+
+    monkeypatch.setattr(last_login.cache, "set", spy)
+    user = User.objects.create_user(email="di@ex.com", password="pass1234")
+
+    _login(client, user)
+
+    assert timeouts and min(timeouts) >= settings.PASSWORD_RESET_TIMEOUT
+
+
+@pytest.mark.django_db
+def test_per_process_cache_writes_immediately(client, settings):
+    settings.LAST_LOGIN_WRITE_BEHIND = True  # default CACHES: LocMem
+    user = User.objects.create_user(email="ed@ex.com", password="pass1234")
+
+    _login(client, user)
+
+    assert User.objects.get(pk=user.pk).last_login is not None
@@ -25,7 +25,9 @@ def test_password_reset_start_renders(client):
 
 
 @pytest.mark.django_db
-@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend", PASSWORD_RESET_QUEUE=False
+)
 def test_password_reset_sends_email(client):
     """
     GIVEN a registered user
@@ -0,0 +1,128 @@
+# src/users/tests/test_permission_cache.py
+#
+# Purpose: CachedPermissionBackend serves group/user permission sets from the
+# shared cache across requests, and m2m/save/delete signals invalidate them.
+# A file-based cache stands in for Redis/Memcached; on LocMem nothing is cached.
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from users.constants import TEACHER_GROUP_NAME
+from users.permissions import teacher_admin_group_id
+
+User = get_user_model()
+
+
+def _fresh(user):
+    # a new object per "request": no per-instance _perm_cache
+    return User.objects.get(pk=user.pk)
+
+
+def _perm_queries(ctx):
+    return [
+        q["sql"]
+        for q in ctx.captured_queries
+        if '"auth_permission"' in q["sql"] or '"auth_group"' in q["sql"]
+    ]
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings, tmp_path):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "cache"),
+        }
+    }
+
+
+@pytest.fixture
+def teacher():
+    group, _ = Group.objects.get_or_create(name=TEACHER_GROUP_NAME)
+    group.permissions.set(Permission.objects.all())
+    user = User.objects.create_user(email="t@ex.com", password="x", role="teacher", is_staff=True)
+    user.groups.add(group)
+    return user
+
+
+@pytest.mark.django_db
+def test_warm_cache_admin_index_makes_no_permission_queries(client, teacher):
+    """
+    GIVEN a Teacher Admin user who already loaded one admin page
+    WHEN  they load the admin index again
+    THEN  no auth_permission / auth_group queries run
+    """
+    client.force_login(teacher)
+    assert client.get(reverse("admin:index")).status_code == 200
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(reverse("admin:index"))
+
+    assert resp.status_code == 200
+    assert _perm_queries(ctx) == []
+
+
+@pytest.mark.django_db
+def test_group_permission_changes_invalidate(teacher):
+    group = Group.objects.get(name=TEACHER_GROUP_NAME)
+    assert _fresh(teacher).has_perm("users.delete_user")
+
+    group.permissions.remove(Permission.objects.get(codename="delete_user"))
+    assert not _fresh(teacher).has_perm("users.delete_user")
+
+    # reverse side: permission.group_set.add(...)
+    Permission.objects.get(codename="delete_user").group_set.add(group)
+    assert _fresh(teacher).has_perm("users.delete_user")
+
+
+@pytest.mark.django_db
+def test_membership_and_direct_permission_changes_invalidate(teacher):
+    group = Group.objects.get(name=TEACHER_GROUP_NAME)
+    assert _fresh(teacher).has_perm("users.view_user")
+
+    group.user_set.remove(teacher)
+    assert not _fresh(teacher).has_perm("users.view_user")
+
+    teacher.user_permissions.add(Permission.objects.get(codename="view_user"))
+    assert _fresh(teacher).has_perm("users.view_user")
+    assert not _fresh(teacher).has_perm("users.change_user")
+
+
+@pytest.mark.django_db
+def test_reused_pk_does_not_inherit_cached_memberships(teacher):
+    pk = teacher.pk
+    assert _fresh(teacher).has_perm("users.view_user")
+    teacher.delete()
+
+    newcomer = User.objects.create_user(pk=pk, email="new@ex.com", password="x")
+
+    assert not _fresh(newcomer).has_perm("users.view_user")
+
+
+@pytest.mark.django_db
+def test_teacher_group_id_is_looked_up_once():
+    group_id = teacher_admin_group_id()
+    with CaptureQueriesContext(connection) as ctx:
+        assert teacher_admin_group_id() == group_id
+    assert ctx.captured_queries == []
+    assert Group.objects.get(pk=group_id).name == TEACHER_GROUP_NAME
+
+
+@pytest.mark.django_db
+def test_per_process_cache_falls_back_to_model_backend(settings, teacher):
+    """
+    GIVEN the default LocMem cache, which other workers can't see or invalidate
+    WHEN  permissions are checked on two fresh user objects
+    THEN  both query the database, as ModelBackend does
+    """
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    assert _fresh(teacher).has_perm("users.view_user")
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert _fresh(teacher).has_perm("users.view_user")
+
+    assert _perm_queries(ctx)
@@ -0,0 +1,148 @@
+# src/users/tests/test_reset_queue.py
+#
+# Purpose: with PASSWORD_RESET_QUEUE the reset view only queues the request (same
+# response for known and unknown emails), and the dispatcher sends the emails in
+# batches, once per matching user, keeping only requests whose email failed queued.
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.urls import reverse
+import pytest
+
+from users.models import PasswordResetRequest
+from users.reset_queue import dispatch, drain, MAX_ATTEMPTS
+
+User = get_user_model()
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("locmem_email"),
+]
+
+
+@pytest.fixture
+def locmem_email(settings):
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    settings.PASSWORD_RESET_QUEUE = True
+
+
+class FailingConnection:
+    def send_messages(self, messages):
+        raise ConnectionError("smtp down")
+
+    def close(self):
+        pass
+
+
+def test_reset_view_only_queues(client, django_assert_num_queries):
+    """
+    GIVEN an existing and an unknown address
+    WHEN  both request a reset
+    THEN  each POST inserts one queue row, sends nothing and redirects the same way
+    """
+    User.objects.create_user(email="known@example.com", password="pw-12345", role="student")
+    url = reverse("users:password_reset")
+
+    with django_assert_num_queries(1):
+        known = client.post(url, {"email": "known@example.com"})
+    with django_assert_num_queries(1):
+        unknown = client.post(url, {"email": "nobody@example.com"})
+
+    assert known.status_code == unknown.status_code == 302
+    assert known["Location"] == unknown["Location"] == reverse("users:password_reset_done")
+    assert mail.outbox == []
+    assert sorted(PasswordResetRequest.objects.values_list("email", flat=True)) == [
+        "known@example.com",
+        "nobody@example.com",
+    ]
+
+
+def test_drain_sends_once_per_matching_user():
+    """
+    GIVEN queued requests: a user twice (different case), an unknown address, an
+          invited user without a usable password and an inactive user
+    WHEN  the queue is drained
+    THEN  exactly one email (with a reset link) goes out and the queue is empty
+    """
+    User.objects.create_user(email="amy@example.com", password="pw-12345", role="student")
+    User.objects.create_user(email="invited@example.com", password=None, role="student")
+    User.objects.create_user(email="gone@example.com", password="pw-12345", is_active=False)
+    for email in (
+        "amy@example.com",
+        "AMY@example.com",
+        "nobody@example.com",
+        "invited@example.com",
+        "gone@example.com",
+    ):
+        PasswordResetRequest.objects.create(email=email, domain="app.example.edu")
+
+    assert drain(batch_size=2) == (5, 1)
+
+    assert [m.to for m in mail.outbox] == [["amy@example.com"]]
+    assert "http://app.example.edu/users/reset/" in mail.outbox[0].body
+    assert not PasswordResetRequest.objects.exists()
+
+
+def test_failed_send_stays_queued_until_max_attempts():
+    """
+    GIVEN a queued request for a real user and a mail connection that fails
+    WHEN  it is dispatched
+    THEN  the row stays with the error recorded, and is dropped after MAX_ATTEMPTS
+    """
+    User.objects.create_user(email="amy@example.com", password="pw-12345")
+    PasswordResetRequest.objects.create(email="amy@example.com", domain="localhost")
+
+    assert dispatch(FailingConnection()) == (0, 0)
+    row = PasswordResetRequest.objects.get()
+    assert row.attempts == 1 and "smtp down" in row.last_error
+
+    for _ in range(MAX_ATTEMPTS - 1):
+        dispatch(FailingConnection())
+    assert not PasswordResetRequest.objects.exists()
+
+
+class RefusingConnection:
+    """Sends like the SMTP backend, but refuses one address."""
+
+    def __init__(self, refused):
+        self.refused = refused
+        self.delivered = []
+
+    def send_messages(self, messages):
+        for message in messages:
+            if self.refused in message.to:
+                raise ConnectionRefusedError(f"550 {self.refused}")
+            self.delivered.append(message.to)
+        return len(messages)
+
+    def close(self):
+        pass
+
+
+def test_refused_recipient_keeps_only_its_request_queued():
+    """
+    GIVEN queued requests for three users and a server refusing the middle one
+    WHEN  the batch is dispatched, and again after the failure
+    THEN  the others get exactly one email; only the refused request stays queued
+    """
+    for email in ("a@example.com", "b@example.com", "c@example.com"):
+        User.objects.create_user(email=email, password="pw-12345")
+        PasswordResetRequest.objects.create(email=email, domain="localhost")
+    connection = RefusingConnection("b@example.com")
+
+    assert dispatch(connection) == (2, 2)
+    assert dispatch(connection) == (0, 0)
+
+    assert connection.delivered == [["a@example.com"], ["c@example.com"]]
+    row = PasswordResetRequest.objects.get()
+    assert row.email == "b@example.com" and row.attempts == 2
+
+
+def test_command_drains_queue():
+    User.objects.create_user(email="amy@example.com", password="pw-12345")
+    PasswordResetRequest.objects.create(email="amy@example.com", domain="localhost")
+
+    call_command("send_queued_emails")
+
+    assert len(mail.outbox) == 1
@@ -0,0 +1,120 @@
+# src/users/tests/test_role_stats.py
+#
+# Purpose: RoleStat / SignupWeek follow user saves, deletes and roster-sync bulk
+# updates (always equal to a rebuild), and the teacher/admin dashboards read their
+# headcounts from them instead of aggregating the user table.
+
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+import pytest
+
+from users.models import RoleStat, SignupWeek
+from users.stats import dashboard_stats, week_of
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+def _live_and_rebuilt():
+    def read():
+        return (
+            set(
+                RoleStat.objects.filter(count__gt=0).values_list(
+                    "role", "is_active", "pending_invite", "count"
+                )
+            ),
+            set(SignupWeek.objects.filter(count__gt=0).values_list("week", "role", "count")),
+        )
+
+    live = read()
+    call_command("rebuild_user_stats", stdout=StringIO())
+    return live, read()
+
+
+def test_counters_follow_saves_and_deletes():
+    """
+    GIVEN users created (invited and with passwords), edited (incl. via only()) and deleted
+    WHEN  reading the statistics tables
+    THEN  they equal a full rebuild
+    """
+    invited = User.objects.create_user(email="inv@ex.com")  # unusable password
+    User.objects.create_user(email="s@ex.com", password="pass1234")
+    teacher = User.objects.create_user(email="t@ex.com", password="pass1234", role="teacher")
+    stats = dashboard_stats()
+    assert stats["roles"]["student"] == {
+        "label": "Student",
+        "total": 2,
+        "active": 2,
+        "inactive": 0,
+        "pending": 1,
+    }
+
+    invited.set_password("now-set-1234")  # invite accepted
+    invited.save()
+    deferred = User.objects.only("pk").get(pk=teacher.pk)
+    deferred.is_active = False
+    deferred.save(update_fields=["is_active"])
+    old = User.objects.create_user(email="old@ex.com", password="x")
+    old.date_joined = timezone.now() - timedelta(weeks=3)
+    old.save()
+    User.objects.get(email="s@ex.com").delete()
+
+    live, rebuilt = _live_and_rebuilt()
+    assert live == rebuilt
+    assert dashboard_stats()["pending"] == 0
+
+
+def test_roster_sync_bulk_updates_keep_counters(tmp_path):
+    User.objects.create_user(email="stay@ex.com")
+    User.objects.create_user(email="gone@ex.com", password="pass1234")
+    roster = tmp_path / "roster.csv"
+    roster.write_text("email,first_name,last_name\nstay@ex.com,,\n")
+
+    call_command("seed_students", str(roster), "--sync", stdout=StringIO())
+
+    live, rebuilt = _live_and_rebuilt()
+    assert live == rebuilt
+    assert dashboard_stats()["roles"]["student"]["inactive"] == 1
+
+
+def test_signups_are_grouped_by_week():
+    today = date(2026, 10, 21)  # a Wednesday
+    assert week_of(timezone.make_aware(datetime(2026, 10, 21, 12))) == date(2026, 10, 19)
+    SignupWeek.objects.adjust((date(2026, 10, 19), "student"), 3)
+    SignupWeek.objects.adjust((date(2026, 10, 5), "teacher"), 1)
+    SignupWeek.objects.adjust((date(2026, 1, 5), "student"), 9)  # outside the window
+
+    signups = dashboard_stats(weeks=4, today=today)["signups"]
+
+    assert [s["week"] for s in signups] == [
+        date(2026, 9, 28) + timedelta(weeks=i) for i in range(4)
+    ]
+    assert [s["total"] for s in signups] == [0, 1, 0, 3]
+    assert signups[-1]["student"] == 3
+
+
+def test_admin_dashboard_reads_counters_only(client):
+    """
+    GIVEN an admin and some students
+    WHEN  the admin dashboard renders
+    THEN  it shows the headcounts without aggregating the user table
+    """
+    admin = User.objects.create_user(email="a@ex.com", password="pass1234", role="admin")
+    for i in range(3):
+        User.objects.create_user(email=f"s{i}@ex.com")
+    client.force_login(admin)
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(reverse("users:admin_home"))
+
+    assert resp.status_code == 200
+    assert b"3 pending invites" in resp.content
+    assert not [q for q in ctx.captured_queries if "COUNT(" in q["sql"].upper()]
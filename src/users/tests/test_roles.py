@@ -0,0 +1,66 @@
+# src/users/tests/test_roles.py
+#
+# Purpose: RoleCapabilities is computed once per user object and drives the
+# role filters, role_required and the navbar.
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.urls import reverse
+import pytest
+
+from users.roles import ANONYMOUS, get_role_capabilities
+from users.templatetags.user_roles import is_admin, is_student, is_teacher
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "role,home,sections",
+    [
+        ("student", "users:student_home", {"dashboard", "courses"}),
+        ("teacher", "users:teacher_home", {"dashboard", "availability", "admin"}),
+        ("admin", "users:admin_home", {"dashboard", "register", "admin"}),
+    ],
+)
+def test_capabilities_per_role(role, home, sections):
+    user = User.objects.create_user(
+        email=f"{role}@ex.com", password="x", role=role, is_staff=role != "student"
+    )
+
+    caps = get_role_capabilities(user)
+
+    assert caps.role == role
+    assert caps.home_url == reverse(home)
+    assert caps.nav_sections == frozenset(sections)
+    # memoised: the same object comes back for the same user instance
+    assert get_role_capabilities(user) is caps
+
+
+@pytest.mark.django_db
+def test_superuser_counts_as_admin_in_filters():
+    su = User.objects.create_superuser(email="su@ex.com", password="x", role="teacher")
+    assert is_admin(su) is True
+    assert is_teacher(su) is True
+    assert is_student(su) is False
+
+
+def test_anonymous_has_no_capabilities():
+    assert get_role_capabilities(AnonymousUser()) is ANONYMOUS
+    assert is_admin(AnonymousUser()) is False
+    assert get_role_capabilities(None).home_url is None
+
+
+@pytest.mark.django_db
+def test_navbar_dashboard_link_uses_role_home(client):
+    teacher = User.objects.create_user(
+        email="t@ex.com", password="x", role="teacher", is_staff=True
+    )
+    client.force_login(teacher)
+
+    resp = client.get(reverse("core:about"))
+
+    assert resp.status_code == 200
+    assert f'href="{reverse("users:teacher_home")}"'.encode() in resp.content
+    assert b'href="/admin/"' in resp.content
+    assert reverse("users:register").encode() not in resp.content
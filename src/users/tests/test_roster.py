@@ -0,0 +1,110 @@
+# src/users/tests/test_roster.py
+#
+# Purpose: the roster readers (users/roster.py) yield the same row dicts for
+# CSV, gzip/bz2 CSV, JSONL, XLSX and stdin, and seed_students accepts them all.
+
+import bz2
+import gzip
+from io import StringIO
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+import pytest
+
+from users.roster import open_roster, RosterError
+
+User = get_user_model()
+
+CSV_TEXT = "email,first_name,last_name\nA@Ex.com,Ann,Lee\nb@ex.com,Bob,\n"
+EXPECTED = [
+    {"email": "A@Ex.com", "first_name": "Ann", "last_name": "Lee"},
+    {"email": "b@ex.com", "first_name": "Bob", "last_name": ""},
+]
+
+
+def _rows(path, fmt=None):
+    with open_roster(str(path), fmt) as roster:
+        return roster.headers, list(roster.rows)
+
+
+@pytest.mark.parametrize(
+    "name,writer",
+    [
+        ("plain.csv", lambda p: p.write_text(CSV_TEXT, encoding="utf-8")),
+        ("bom.csv", lambda p: p.write_text(CSV_TEXT, encoding="utf-8-sig")),
+        ("reg.csv.gz", lambda p: p.write_bytes(gzip.compress(CSV_TEXT.encode()))),
+        ("reg.csv.bz2", lambda p: p.write_bytes(bz2.compress(CSV_TEXT.encode()))),
+        ("no_suffix", lambda p: p.write_bytes(gzip.compress(CSV_TEXT.encode()))),
+    ],
+)
+def test_csv_variants_yield_same_rows(tmp_path, name, writer):
+    path = tmp_path / name
+    writer(path)
+    headers, rows = _rows(path)
+    assert headers == ["email", "first_name", "last_name"]
+    assert rows == EXPECTED
+
+
+def test_jsonl_rows_are_stringified_and_blank_lines_skipped(tmp_path):
+    path = tmp_path / "roster.jsonl.gz"
+    lines = [json.dumps(r) for r in EXPECTED] + ["", json.dumps({"email": "c@ex.com", "n": 3})]
+    path.write_bytes(gzip.compress("\n".join(lines).encode()))
+
+    headers, rows = _rows(path)
+
+    assert headers == ["email", "first_name", "last_name"]
+    assert rows[:2] == EXPECTED
+    assert rows[2] == {"email": "c@ex.com", "n": "3"}
+
+
+def test_jsonl_reports_bad_line(tmp_path):
+    path = tmp_path / "bad.jsonl"
+    path.write_text('{"email": "a@ex.com"}\nnot json\n')
+    with pytest.raises(RosterError, match="line 2"):
+        _rows(path)
+
+
+def test_xlsx_streams_first_sheet(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = tmp_path / "registry.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["email", "first_name", "last_name"])
+    ws.append(["A@Ex.com", "Ann", "Lee"])
+    ws.append([None, None, None])
+    ws.append(["b@ex.com", "Bob", None])
+    wb.save(path)
+
+    assert _rows(path) == (["email", "first_name", "last_name"], EXPECTED)
+
+
+@pytest.mark.django_db
+def test_seed_students_reads_gzip_and_stdin(tmp_path):
+    """
+    GIVEN a gzipped CSV export and a JSONL roster on stdin
+    WHEN  seed_students runs on each
+    THEN  students are created from both, emails lowercased as before
+    """
+    gz = tmp_path / "registry.csv.gz"
+    gz.write_bytes(gzip.compress(CSV_TEXT.encode()))
+    call_command("seed_students", str(gz), "--default-password=ChangeMe123!", stdout=StringIO())
+
+    stdin = StringIO(json.dumps({"email": "c@ex.com", "first_name": "Cy"}) + "\n")
+    call_command("seed_students", "-", "--format=jsonl", stdin=stdin, stdout=StringIO())
+
+    assert sorted(User.objects.values_list("email", flat=True)) == [
+        "a@ex.com",
+        "b@ex.com",
+        "c@ex.com",
+    ]
+    assert User.objects.get(email="c@ex.com").first_name == "Cy"
+
+
+@pytest.mark.django_db
+def test_seed_students_turns_reader_errors_into_command_errors(tmp_path):
+    path = tmp_path / "bad.jsonl"
+    path.write_text('{"email": "a@ex.com"}\n[1, 2]\n')
+    with pytest.raises(CommandError, match="line 2"):
+        call_command("seed_students", str(path), stdout=StringIO())
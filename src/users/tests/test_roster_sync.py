@@ -0,0 +1,75 @@
+# src/users/tests/test_roster_sync.py
+#
+# Purpose: `seed_students --sync` prints a new/changed/missing diff before applying,
+# then deactivates missing students in bulk and upserts only new/changed rows.
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+import pytest
+
+from users.models import UserCountBucket
+
+User = get_user_model()
+
+ROSTER = (
+    "email,first_name,last_name\n"
+    "same@ex.com,Sam,Same\n"
+    "RENAMED@ex.com,New,Name\n"
+    "back@ex.com,,\n"
+    "fresh@ex.com,Fresh,Face\n"
+    "not-an-email,,\n"
+)
+
+
+@pytest.fixture
+def roster_db(tmp_path):
+    mk = User.objects.create_user
+    mk(email="same@ex.com", first_name="Sam", last_name="Same")
+    mk(email="renamed@ex.com", first_name="Old", last_name="Name")
+    mk(email="gone@ex.com")
+    mk(email="back@ex.com", first_name="Back", is_active=False)
+    mk(email="teacher@ex.com", role="teacher", is_staff=True)  # never deactivated
+    path = tmp_path / "roster.csv"
+    path.write_text(ROSTER)
+    return path
+
+
+def _active():
+    return dict(User.objects.values_list("email", "is_active"))
+
+
+@pytest.mark.django_db
+def test_sync_dry_run_prints_diff_and_changes_nothing(roster_db):
+    before = _active()
+    out = StringIO()
+
+    call_command("seed_students", str(roster_db), "--sync", "--dry-run", stdout=out)
+
+    text = out.getvalue()
+    assert "rows=5 invalid_email=1 new=1 changed=1 unchanged=2 missing=1 reactivate=1" in text
+    assert "missing: gone@ex.com" in text
+    assert _active() == before
+
+
+@pytest.mark.django_db
+def test_sync_applies_deactivation_reactivation_and_upserts(roster_db):
+    call_command("seed_students", str(roster_db), "--sync", stdout=StringIO())
+
+    assert _active() == {
+        "same@ex.com": True,
+        "renamed@ex.com": True,
+        "gone@ex.com": False,
+        "back@ex.com": True,
+        "teacher@ex.com": True,
+        "fresh@ex.com": True,
+    }
+    assert User.objects.get(email="renamed@ex.com").first_name == "New"
+    # blank roster names keep the stored ones
+    assert User.objects.get(email="back@ex.com").first_name == "Back"
+
+    # bulk updates kept the admin count buckets right
+    live = {b[:3]: b[3] for b in UserCountBucket.objects.snapshot()}
+    UserCountBucket.objects.rebuild()
+    assert live == {b[:3]: b[3] for b in UserCountBucket.objects.snapshot()}
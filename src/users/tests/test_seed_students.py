@@ -6,6 +6,7 @@
 #     1) --dry-run: previews but does NOT write to the DB
 #     2) normal run with --default-password: creates students and sets usable passwords
 #     3) --update: updates names and passwords for existing emails
+#     4) errors: unreadable rosters and failed welcome emails are reported apart
 #
 # Notes:
 #   - We use the repo's sample CSV at: data/sample_students.csv (checked into git for dev)
@@ -13,10 +14,11 @@
 
 import csv
 from pathlib import Path
+import smtplib
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.management import call_command
+from django.core.management import call_command, CommandError
 import pytest
 
 User = get_user_model()
@@ -136,3 +138,28 @@ def test_seed_students_update_changes_names_and_password(tmp_path):
     assert u.first_name == "NewFirst"
     assert u.last_name == "NewLast"
     assert u.check_password("NewPass!2")
+
+
+@pytest.mark.django_db
+def test_seed_students_reports_bad_roster_and_failed_emails_apart(tmp_path, monkeypatch):
+    """
+    GIVEN a roster with a broken JSONL line, and a mail server that refuses a send
+    WHEN  seed_students reads the first and sends welcome emails for the second
+    THEN  the first fails as unreadable; the second creates the user and reports the
+          unsent email instead of blaming the CSV
+    """
+    broken = tmp_path / "broken.jsonl"
+    broken.write_text('{"email": "ok@example.com"}\n{not json\n', encoding="utf-8")
+    with pytest.raises(CommandError, match="Could not read CSV: line 2"):
+        call_command("seed_students", str(broken), "--dry-run")
+
+    def refuse(*args, **kwargs):
+        raise smtplib.SMTPRecipientsRefused({"new@example.com": (550, b"no")})
+
+    monkeypatch.setattr("users.management.commands.seed_students.send_mail", refuse)
+    roster = tmp_path / "new.csv"
+    roster.write_text("email\nnew@example.com\n", encoding="utf-8")
+    with pytest.raises(CommandError, match="1 welcome email"):
+        call_command("seed_students", str(roster), "--send-welcome", "--site-domain=ex.com")
+
+    assert User.objects.filter(email="new@example.com").exists()
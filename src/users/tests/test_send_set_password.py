@@ -0,0 +1,74 @@
+# src/users/tests/test_send_set_password.py
+#
+# Purpose: `send_set_password` in single-user and bulk (selector) modes.
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from django.utils import timezone
+import pytest
+
+User = get_user_model()
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("_users"),
+]
+
+
+@pytest.fixture
+def _users():
+    # password=usable so the post_save invite signal stays quiet
+    User.objects.create_user(email="s1@ex.com", password="x", role="student")
+    User.objects.create_user(email="S2@ex.com", password="x", role="student")
+    t = User.objects.create_user(email="t1@ex.com", password="x", role="teacher")
+    t.last_login = timezone.now()
+    t.save(update_fields=["last_login"])
+    User.objects.create_user(email="gone@ex.com", password="x", role="student", is_active=False)
+
+
+def _recipients():
+    return sorted(m.to[0] for m in mail.outbox)
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+def test_single_email_mode_still_works():
+    call_command("send_set_password", "S1@EX.com", "--domain=127.0.0.1:8000")
+    assert _recipients() == ["s1@ex.com"]
+    assert "/users/reset/" in mail.outbox[0].body
+
+
+def test_single_email_unknown_user_errors():
+    with pytest.raises(CommandError):
+        call_command("send_set_password", "nobody@ex.com")
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+def test_role_selector_skips_inactive():
+    call_command("send_set_password", "--role=student")
+    assert _recipients() == ["S2@ex.com", "s1@ex.com"]
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+def test_file_and_never_logged_in_selectors(tmp_path):
+    roster = tmp_path / "roster.csv"
+    roster.write_text("email,name\ns2@ex.com,Two\nt1@ex.com,Teach\nmissing@ex.com,X\n")
+
+    call_command("send_set_password", f"--file={roster}", "--never-logged-in")
+
+    # t1 has logged in; missing@ does not exist; s2 matched case-insensitively
+    assert _recipients() == ["S2@ex.com"]
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+def test_dry_run_sends_nothing(capsys):
+    call_command("send_set_password", "--role=student", "--dry-run")
+    assert mail.outbox == []
+    assert "Would send 2 invite(s)" in capsys.readouterr().out
+
+
+def test_requires_a_selector():
+    with pytest.raises(CommandError):
+        call_command("send_set_password")
@@ -0,0 +1,139 @@
+# src/users/tests/test_user_cache.py
+#
+# Purpose: authenticated requests build request.user from the cached snapshot
+# (no users_user query); saves, deletes, password and group changes drop it, and
+# session-hash verification still logs out users whose password changed. Runs on a
+# file-based cache standing in for a shared one; LocMem turns the cache off.
+
+from array import array
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from users import user_cache
+from users.roster_sync import apply_activation, RosterDiff
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings, tmp_path):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "cache"),
+        }
+    }
+
+
+def _user_queries(queries) -> list[str]:
+    return [q["sql"] for q in queries if 'FROM "users_user"' in q["sql"]]
+
+
+def _student(client):
+    user = User.objects.create_user(email="stu@ex.com", password="pass1234", role="student")
+    client.force_login(user)
+    return user
+
+
+def test_dashboard_skips_user_query_once_cached(client):
+    """
+    GIVEN a logged-in student
+    WHEN  the dashboard is requested twice
+    THEN  only the first request selects the user row
+    """
+    _student(client)
+    url = reverse("users:student_home")
+
+    with CaptureQueriesContext(connection) as first:
+        assert client.get(url).status_code == 200
+    with CaptureQueriesContext(connection) as second:
+        assert client.get(url).status_code == 200
+
+    assert _user_queries(first.captured_queries)
+    assert _user_queries(second.captured_queries) == []
+
+
+def test_restored_user_matches_and_defers_the_rest():
+    user = User.objects.create_user(email="a@ex.com", password="pass1234", first_name="Amy")
+
+    restored = user_cache.restore(user_cache.snapshot(user))
+
+    assert (restored.pk, restored.email, restored.first_name) == (user.pk, user.email, "Amy")
+    assert restored.get_session_auth_hash() == user.get_session_auth_hash()
+    assert {"password", "last_login", "date_joined"} <= restored.get_deferred_fields()
+
+
+def test_role_change_is_seen_on_next_request(client):
+    """
+    GIVEN a cached student
+    WHEN  their role is changed and saved
+    THEN  the next request sees the new role (student dashboard no longer allowed)
+    """
+    user = _student(client)
+    url = reverse("users:student_home")
+    assert client.get(url).status_code == 200
+
+    user.role = User.Roles.TEACHER
+    user.save()
+
+    assert client.get(url).status_code != 200
+
+
+def test_password_change_still_ends_other_sessions(client):
+    """
+    GIVEN a cached, logged-in user
+    WHEN  their password is changed elsewhere
+    THEN  the session hash no longer matches and the request is anonymous
+    """
+    user = _student(client)
+    client.get(reverse("users:student_home"))
+
+    other = User.objects.get(pk=user.pk)
+    other.set_password("new-pass-5678")
+    other.save()
+
+    resp = client.get(reverse("users:student_home"))
+    assert resp.wsgi_request.user.is_anonymous
+
+
+def test_group_changes_drop_the_snapshot(client):
+    user = _student(client)
+    client.get(reverse("users:student_home"))
+    key = user_cache._key(cache.get(user_cache._VERSION_KEY), user.pk)
+    assert cache.get(key) is not None
+
+    Group.objects.create(name="Readers").user_set.add(user)
+
+    assert cache.get(key) is None
+
+
+def test_roster_deactivation_drops_the_snapshot(client):
+    """
+    GIVEN a cached, logged-in student
+    WHEN  roster sync deactivates them with a bulk UPDATE
+    THEN  the next request is anonymous
+    """
+    user = _student(client)
+    client.get(reverse("users:student_home"))
+
+    apply_activation(
+        RosterDiff(missing=array("q", [user.pk]), missing_by_staff=Counter({False: 1}))
+    )
+
+    resp = client.get(reverse("users:student_home"))
+    assert resp.wsgi_request.user.is_anonymous
+
+
+def test_per_process_cache_disables_the_snapshot(settings):
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    assert settings.AUTH_USER_CACHE
+    assert not user_cache.enabled()
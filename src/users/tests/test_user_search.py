@@ -0,0 +1,104 @@
+# src/users/tests/test_user_search.py
+#
+# Purpose: user search goes through the UserSearchToken index (prefix matches on
+# normalised words), stays in sync on save, and backs the admin search box.
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from users.models import UserSearchToken
+from users.search import search_users, tokenize
+
+User = get_user_model()
+
+
+def _emails(term):
+    return sorted(search_users(User.objects.all(), term).values_list("email", flat=True))
+
+
+def test_tokenize_normalises_case_accents_and_punctuation():
+    assert tokenize("José.Smith@Example.com", "Ångström") == {
+        "jose",
+        "smith",
+        "example",
+        "com",
+        "angstrom",
+    }
+
+
+@pytest.mark.django_db
+def test_search_matches_word_prefixes_across_fields():
+    """
+    GIVEN students with names and emails
+    WHEN  searching by name/email prefixes
+    THEN  every query word must match some field, ignoring case and accents
+    """
+    User.objects.create_user(email="jsmith@uni.ac.uk", first_name="José", last_name="Smith")
+    User.objects.create_user(email="ann@uni.ac.uk", first_name="Ann", last_name="Smithers")
+    User.objects.create_user(email="bob@other.org", first_name="Bob", last_name="Jones")
+
+    assert _emails("smi") == ["ann@uni.ac.uk", "jsmith@uni.ac.uk"]
+    assert _emails("jose SMITH") == ["jsmith@uni.ac.uk"]
+    assert _emails("other.org") == ["bob@other.org"]
+    assert _emails("mith") == []  # prefixes only, not substrings
+
+
+@pytest.mark.django_db
+def test_search_terms_longer_than_stored_tokens():
+    """
+    GIVEN a short surname and a word longer than the token column
+    WHEN  searching with a term that extends past the stored token
+    THEN  the short token does not match, the over-long word matches its truncated token
+    """
+    User.objects.create_user(email="s@ex.com", last_name="Smith")
+    User.objects.create_user(email="l@ex.com", last_name="x" * 70)
+
+    assert _emails("smithson") == []
+    assert _emails("smith") == ["s@ex.com"]
+    assert _emails("x" * 70) == ["l@ex.com"]
+
+
+@pytest.mark.django_db
+def test_index_follows_renames_and_deletes():
+    user = User.objects.create_user(email="a@ex.com", first_name="Alice")
+    user.first_name = "Alicia"
+    user.save(update_fields=["first_name"])
+    assert _emails("alicia") == ["a@ex.com"]
+    assert "alice" not in set(UserSearchToken.objects.values_list("token", flat=True))
+
+    user.delete()
+    assert not UserSearchToken.objects.exists()
+
+
+@pytest.mark.django_db
+def test_rebuild_command_reindexes_bulk_updates():
+    User.objects.create_user(email="a@ex.com", first_name="Alice")
+    User.objects.update(first_name="Zed")  # bypasses signals
+
+    out = StringIO()
+    call_command("rebuild_user_search", stdout=out)
+
+    assert _emails("zed") == ["a@ex.com"]
+    assert _emails("alice") == []
+    assert "search token" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_admin_search_uses_token_index(client):
+    admin = User.objects.create_superuser(email="root@ex.com", password="x")
+    User.objects.create_user(email="s@ex.com", first_name="Priya", last_name="Patel")
+    client.force_login(admin)
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(reverse("admin:users_user_changelist"), {"q": "pri pat"})
+
+    assert resp.status_code == 200
+    assert [u.email for u in resp.context["cl"].result_list] == ["s@ex.com"]
+    # only anchored prefix patterns ('pri%'), never a '%term%' scan of the user table
+    assert not any("LIKE '%" in q["sql"] for q in ctx.captured_queries)
@@ -0,0 +1,23 @@
+# src/users/tokens.py
+#
+# Password-reset token generator used by the reset views, invite links and
+# set-password emails. Identical to Django's default, except that the hashed
+# last_login includes a login still buffered by write-behind (users/last_login.py).
+
+import copy
+
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+
+from .last_login import effective_last_login
+
+
+class LastLoginAwareTokenGenerator(PasswordResetTokenGenerator):
+    def _make_hash_value(self, user, timestamp):
+        last_login = effective_last_login(user)
+        if last_login != user.last_login:
+            user = copy.copy(user)  # don't touch the caller's object
+            user.last_login = last_login
+        return super()._make_hash_value(user, timestamp)
+
+
+token_generator = LastLoginAwareTokenGenerator()
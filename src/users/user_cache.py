@@ -0,0 +1,117 @@
+# src/users/user_cache.py
+#
+# Cross-request cache of the authenticated user, used by
+# users.backends.CachedPermissionBackend.get_user()/aget_user() (AUTH_USER_CACHE).
+# - Each entry is a compact tuple: the SNAPSHOT_FIELDS values plus the session auth
+#   hash (an HMAC of the password hash, not the hash itself).
+# - restore() rebuilds a User through Model.from_db(). Other columns (password,
+#   last_login, date_joined) are deferred and load on first access. The stored hash
+#   lets the session check skip the password column (User.get_session_auth_hash).
+# - Entries share the permission cache alias and are dropped by the User
+#   save/delete and group-membership receivers in users/signals.py. They also expire
+#   after AUTH_USER_CACHE_TIMEOUT, which covers raw SQL (bulk QuerySet.update()s
+#   call forget_users() themselves).
+# - Off unless that alias is shared (permissions.cache_is_shared()): on a per-process
+#   cache a change made in one worker would leave stale snapshots, session hash
+#   included, in the others.
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import router, transaction
+
+from . import permissions
+
+SNAPSHOT_FIELDS = (
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "role",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+)
+
+_PREFIX = "users:user"
+_VERSION_KEY = f"{_PREFIX}:version"
+
+
+def _cache():
+    return caches[getattr(settings, "AUTH_PERMISSION_CACHE_ALIAS", "default")]
+
+
+def _timeout():
+    return getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 300)
+
+
+def enabled() -> bool:
+    return getattr(settings, "AUTH_USER_CACHE", True) and permissions.cache_is_shared()
+
+
+def _key(version: int, pk) -> str:
+    return f"{_PREFIX}:v{version}:{pk}"
+
+
+def snapshot(user) -> tuple:
+    return (*(getattr(user, f) for f in SNAPSHOT_FIELDS), user.get_session_auth_hash())
+
+
+def restore(values: tuple):
+    User = get_user_model()
+    *fields, session_hash = values
+    user = User.from_db(router.db_for_read(User), SNAPSHOT_FIELDS, fields)
+    user._session_auth_hash = session_hash
+    return user
+
+
+# --- Loading ------------------------------------------------------------------
+def get_user(pk):
+    """The user with `pk` from the cache, or from the database (then cached); None if gone."""
+    User = get_user_model()
+    cache = _cache()
+    key = _key(cache.get_or_set(_VERSION_KEY, 1, None), pk)
+    values = cache.get(key)
+    if values is not None:
+        return restore(values)
+    try:
+        user = User._default_manager.get(pk=pk)
+    except User.DoesNotExist:
+        return None
+    cache.set(key, snapshot(user), _timeout())
+    return user
+
+
+async def aget_user(pk):
+    User = get_user_model()
+    cache = _cache()
+    key = _key(await cache.aget_or_set(_VERSION_KEY, 1, None), pk)
+    values = await cache.aget(key)
+    if values is not None:
+        return restore(values)
+    try:
+        user = await User._default_manager.aget(pk=pk)
+    except User.DoesNotExist:
+        return None
+    await cache.aset(key, snapshot(user), _timeout())
+    return user
+
+
+# --- Invalidation ------------------------------------------------------------
+def forget_users(pks) -> None:
+    def drop():
+        cache = _cache()
+        version = cache.get_or_set(_VERSION_KEY, 1, None)
+        cache.delete_many([_key(version, pk) for pk in pks])
+
+    drop()
+    # and again after commit, in case a concurrent request re-cached pre-commit data
+    transaction.on_commit(drop)
+
+
+def forget_all() -> None:
+    cache = _cache()
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:  # key evicted
+        cache.set(_VERSION_KEY, 2, None)
@@ -1,14 +1,18 @@
 # users/utils.py
+from itertools import chain
+import logging
+
 from django.conf import settings
-from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.urls import reverse
-from django.utils.encoding import force_bytes
-from django.utils.http import urlsafe_base64_encode
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import QuerySet
 
 from .constants import PWD_RESET_TPLS
+from .emails import PasswordEmailRenderer
 from .forms_invite import InvitePasswordResetForm
+from .invites import InviteLinkBuilder
+from .tokens import token_generator
+
+log = logging.getLogger("users.email")
 
 
 def send_set_password(email, *, domain="localhost:8000", use_https=False, from_email=None):
@@ -21,12 +25,61 @@ def send_set_password(email, *, domain="localhost:8000", use_https=False, from_e
             email_template_name=PWD_RESET_TPLS["email_txt"],
             subject_template_name=PWD_RESET_TPLS["subject"],
             html_email_template_name=PWD_RESET_TPLS.get("email_html"),
+            token_generator=token_generator,
         )
         # Return True only if at least one user matched
         return True
     return False
 
 
+def send_set_password_bulk(
+    querysets, *, domain, use_https=False, from_email=None, batch_size=100, dry_run=False
+):
+    """
+    Bulk version of send_set_password() for a queryset of users (or an iterable of
+    querysets, e.g. chunks of a long email list).
+
+    - Users are read with one query (via InviteLinkBuilder.links_for), loading only
+      the fields the token needs.
+    - Messages are rendered by users.emails.PasswordEmailRenderer (same PWD_RESET_TPLS
+      templates and context keys as the password reset form; `user` is a dict with
+      pk/email only).
+    - Delivery reuses one mail connection, sending `batch_size` messages at a time.
+
+    Returns the number of messages sent (or that would be sent, with dry_run).
+    """
+    if isinstance(querysets, QuerySet):
+        querysets = [querysets]
+    builder = InviteLinkBuilder(domain=domain, use_https=use_https)
+    renderer = PasswordEmailRenderer(domain=domain, use_https=use_https)
+    links = chain.from_iterable(builder.links_for(qs) for qs in querysets)
+    from_email = from_email or getattr(settings, "DEFAULT_FROM_EMAIL", None)
+
+    sent = 0
+    batch = []
+    connection = None if dry_run else get_connection()
+
+    def flush():
+        nonlocal sent
+        if batch:
+            sent += len(batch) if dry_run else (connection.send_messages(batch) or 0)
+            batch.clear()
+
+    try:
+        if connection is not None:
+            connection.open()
+        for link in links:
+            batch.append(renderer.message(link, from_email=from_email))
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    finally:
+        if connection is not None:
+            connection.close()
+    log.info("set-password emails sent", extra={"sent": sent, "dry_run": dry_run})
+    return sent
+
+
 def get_domain_and_scheme(request=None):
     """
     Returns (domain, use_https).
@@ -43,36 +96,31 @@ def get_domain_and_scheme(request=None):
     return domain, False
 
 
-def send_invite_email(user, *, domain: str, use_https: bool):
+def send_invite_email(user, *, domain: str, use_https: bool, link_builder=None, renderer=None):
     """
     Build a password-set (reset) link for the user and send an invite email.
     Uses your existing HTML template; falls back to plain text body.
+    When inviting many users, pass a shared `link_builder` (users.invites.InviteLinkBuilder)
+    and `renderer` (users.emails.PasswordEmailRenderer). A passed builder's domain and
+    scheme win over `domain`/`use_https`, so the email text matches the link.
     """
-    uidb64 = urlsafe_base64_encode(force_bytes(user.pk))
-    token = default_token_generator.make_token(user)
-
-    path = reverse("users:password_reset_confirm", kwargs={"uidb64": uidb64, "token": token})
-    scheme = "https" if use_https else "http"
-    reset_url = f"{scheme}://{domain}{path}"
-
-    context = {
-        "user": user,
-        "reset_url": reset_url,
-        "site_name": getattr(settings, "SITE_NAME", "LangCen Base"),
-        "domain": domain,
-        "protocol": scheme,
-        "uidb64": uidb64,
-        "uid": uidb64,
-        "token": token,
-    }
+    if link_builder is not None:
+        domain, use_https = link_builder.domain, link_builder.use_https
+    builder = link_builder or InviteLinkBuilder(domain=domain, use_https=use_https)
+    site_name = getattr(settings, "SITE_NAME", "LangCen Base")
+    renderer = renderer or PasswordEmailRenderer(
+        domain=domain, use_https=use_https, site_name=site_name
+    )
+    link = builder.link_for(user)
+    reset_url = link.url
 
     subject = "Set your password"
     # Plain-text fallback (kept short)
-    text_body = (
-        f"You’ve been invited to join {context['site_name']}.\nSet your password: {reset_url}\n"
-    )
+    text_body = f"You’ve been invited to join {site_name}.\nSet your password: {reset_url}\n"
 
-    html_body = render_to_string("users/registration/password_reset_email.html", context)
+    html_body = renderer.render_html(
+        email=user.email, uid=link.uidb64, token=link.token, reset_url=reset_url, user=user
+    )
 
     msg = EmailMultiAlternatives(
         subject=subject,
@@ -80,5 +128,11 @@ def send_invite_email(user, *, domain: str, use_https: bool):
         from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com"),
         to=[user.email],
     )
-    msg.attach_alternative(html_body, "text/html")
-    msg.send()
+    if html_body is not None:
+        msg.attach_alternative(html_body, "text/html")
+    try:
+        msg.send()
+    except Exception:
+        log.exception("invite email failed", extra={"user_id": user.pk})
+        raise
+    log.info("invite email sent", extra={"user_id": user.pk})
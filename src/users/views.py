@@ -3,7 +3,7 @@
 # Django imports
 from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth import get_user_model
+from django.contrib.auth import alogin, get_user_model
 from django.contrib.auth.models import AbstractBaseUser
 from django.contrib.auth.views import (
     LoginView,
@@ -14,56 +14,79 @@ from django.contrib.auth.views import (
     PasswordResetView,
 )
 from django.db import transaction
-from django.shortcuts import redirect, render
-from django.urls import reverse, reverse_lazy
+from django.http import HttpResponseRedirect
+from django.shortcuts import redirect
+from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_protect
+from django.views.decorators.debug import sensitive_post_parameters
 from django.views.generic import CreateView
 
+# Project imports
+from core.shortcuts import arender
+
 # Local imports
 from .constants import PWD_RESET_TPLS  # ← centralised template names
 from .decorators import role_required
-from .forms import RegisterForm
+from .forms import AsyncAuthenticationForm, RegisterForm
 from .mixins import AdminRequiredMixin
+from .permissions import teacher_admin_group_id
+from .reset_queue import QueuedPasswordResetForm
+from .roles import home_url_for_role
+from .stats import adashboard_stats
+from .tokens import token_generator
 
 User = get_user_model()
 
 
 def _redirect_for_role(user: AbstractBaseUser) -> str:
-    """
-    Map user.role → URL name, with sane fallbacks and support for @override_settings.
-    Priority:
-      1) settings.USERS_ROLE_REDIRECTS (if provided in runtime/tests)
-      2) sensible defaults for known roles (admin/teacher/student)
-    """
-    role = getattr(user, "role", None)
-
-    # 1) Honor dynamic settings (override_settings in tests will work here)
-    mapping = getattr(settings, "USERS_ROLE_REDIRECTS", {}) or {}
-    url_name = mapping.get(role)
-    if url_name:
-        return reverse(url_name)
-
-    # 2) Sane defaults if the mapping is missing/incomplete
-    try:
-        # Use your project enum if present
-        teacher_val = getattr(User.Roles, "TEACHER", "teacher")
-        admin_val = getattr(User.Roles, "ADMIN", "admin")
-    except Exception:
-        teacher_val, admin_val = "teacher", "admin"
-
-    if role == admin_val:
-        return reverse("users:admin_home")
-    if role == teacher_val:
-        return reverse("users:teacher_home")
-
-    # default (student or unknown)
-    return reverse("users:student_home")
+    """Map user.role → dashboard URL (see users.roles.home_url_for_role)."""
+    return home_url_for_role(getattr(user, "role", None))
 
 
 # --------------------------
 # Auth: login / logout
 # --------------------------
 class EmailLoginView(LoginView):
+    """
+    Async login: credentials are checked with aauthenticate() and the session is
+    written with alogin(), so an ASGI worker serves slow clients without a thread each.
+    """
+
     template_name = "users/registration/login.html"
+    form_class = AsyncAuthenticationForm
+
+    # LoginView decorates a sync dispatch(); re-apply the same decorators to an
+    # async one so the whole view runs on the event loop.
+    @method_decorator(sensitive_post_parameters())
+    @method_decorator(csrf_protect)
+    @method_decorator(never_cache)
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if self.redirect_authenticated_user and request.user.is_authenticated:
+            redirect_to = self.get_success_url()
+            if redirect_to == request.path:
+                raise ValueError(
+                    "Redirection loop for authenticated user detected. Check that "
+                    "your LOGIN_REDIRECT_URL doesn't point to a login page."
+                )
+            return HttpResponseRedirect(redirect_to)
+        # Skip LoginView.dispatch (sync-decorated); View.dispatch returns our coroutine.
+        return await super(LoginView, self).dispatch(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        form = self.get_form()
+        if await form.ais_valid():
+            await alogin(request, form.get_user())
+            return HttpResponseRedirect(self.get_success_url())
+        return self.form_invalid(form)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.post(request, *args, **kwargs)
 
     def get_success_url(self):
         return _redirect_for_role(self.request.user)
@@ -101,10 +124,7 @@ class RegisterView(AdminRequiredMixin, CreateView):
 
         # add group only after save
         if user.role == User.Roles.TEACHER:
-            from django.contrib.auth.models import Group
-
-            teacher_group, _ = Group.objects.get_or_create(name="Teacher Admin")
-            user.groups.add(teacher_group)
+            user.groups.add(teacher_admin_group_id())  # group pk comes from the shared cache
 
         messages.success(
             self.request,
@@ -124,6 +144,14 @@ class PasswordResetStartView(PasswordResetView):
     subject_template_name = PWD_RESET_TPLS["subject"]
     html_email_template_name = PWD_RESET_TPLS.get("email_html")
     success_url = reverse_lazy("users:password_reset_done")
+    token_generator = token_generator
+
+    def get_form_class(self):
+        # PASSWORD_RESET_QUEUE: only queue the request (users/reset_queue.py), so the
+        # response never waits on SMTP or depends on whether the address exists
+        if getattr(settings, "PASSWORD_RESET_QUEUE", False):
+            return QueuedPasswordResetForm
+        return super().get_form_class()
 
 
 class PasswordResetDoneView(PasswordResetDoneView):
@@ -133,6 +161,7 @@ class PasswordResetDoneView(PasswordResetDoneView):
 class PasswordResetConfirmView(PasswordResetConfirmView):
     template_name = PWD_RESET_TPLS["confirm"]
     success_url = reverse_lazy("users:password_reset_complete")
+    token_generator = token_generator
 
 
 class PasswordResetCompleteView(PasswordResetCompleteView):
@@ -145,15 +174,16 @@ class PasswordResetCompleteView(PasswordResetCompleteView):
 
 
 @role_required(["student"])
-def student_home(request):
-    return render(request, "users/student_home.html")
+async def student_home(request):
+    return await arender(request, "users/student_home.html")
 
 
+# Headcounts come from the materialised RoleStat/SignupWeek tables (users/stats.py).
 @role_required(["teacher"])
-def teacher_home(request):
-    return render(request, "users/teacher_home.html")
+async def teacher_home(request):
+    return await arender(request, "users/teacher_home.html", {"stats": await adashboard_stats()})
 
 
 @role_required(["admin"])
-def admin_home(request):
-    return render(request, "users/admin_home.html")
+async def admin_home(request):
+    return await arender(request, "users/admin_home.html", {"stats": await adashboard_stats()})